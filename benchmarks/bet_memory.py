@@ -0,0 +1,89 @@
+"""Compares the memory held per open bet by Bet and Accumulator instances, by dict-backed copies of them
+as they were before Bet had __slots__, and by a BetStore.
+
+Run from the repository root with: python -m benchmarks.bet_memory [count]
+"""
+
+import sys
+import tracemalloc
+from decimal import Decimal
+from functools import reduce
+from operator import mul
+
+from pybet import Odds
+from pybet.bets import Accumulator, Bet, BetStore
+
+
+def bytes_per_bet(build, count):
+    tracemalloc.start()
+    held = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size / count
+
+
+class DictBet:
+    """Bet's instance state as it was before Bet had __slots__, held in an instance dict"""
+
+    def __init__(
+        self, stake, odds, win_condition, end_condition=lambda: True, *, bog=False
+    ):
+        self.stake = Decimal(stake)
+        self.odds = odds
+        self.win_condition = win_condition
+        self.end_condition = end_condition
+        self.bog = bog
+        self._voided = False
+
+
+class DictAccumulator(DictBet):
+    """Accumulator's instance state as it was before Bet had __slots__, held in an instance dict"""
+
+    def __init__(self, stake, bet_list, *, bog=False):
+        odds = reduce(mul, [Odds(bet[0]) for bet in bet_list], 1)
+        win_condition = lambda: all(bet[1]() for bet in bet_list)
+        end_condition = lambda: all(
+            bet[2]() if len(bet) == 3 and bet[2] else True for bet in bet_list
+        )
+        super().__init__(stake, Odds(odds), win_condition, end_condition, bog=bog)
+
+
+def dict_bets(count):
+    odds = Odds(3)
+    return [DictBet(Decimal("2.50"), odds, lambda: True) for _ in range(count)]
+
+
+def dict_accumulators(count):
+    legs = [(Odds(2), lambda: True), (Odds(3), lambda: True), (Odds(5), lambda: True)]
+    return [DictAccumulator(Decimal("2.50"), legs) for _ in range(count)]
+
+
+def bets(count):
+    odds = Odds(3)
+    return [Bet(Decimal("2.50"), odds, lambda: True) for _ in range(count)]
+
+
+def accumulators(count):
+    legs = [(Odds(2), lambda: True), (Odds(3), lambda: True), (Odds(5), lambda: True)]
+    return [Accumulator(Decimal("2.50"), legs) for _ in range(count)]
+
+
+def store(count):
+    bet_store = BetStore()
+    odds = Odds(3)
+    for _ in range(count):
+        bet_store.append(Decimal("2.50"), odds)
+    return bet_store
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, build in [
+        ("Bet (dict)", dict_bets),
+        ("Bet", bets),
+        ("Accumulator (dict)", dict_accumulators),
+        ("Accumulator", accumulators),
+        ("BetStore", store),
+    ]:
+        print(f"{name:<20} {bytes_per_bet(build, count):8.1f} bytes per bet")
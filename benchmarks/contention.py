@@ -0,0 +1,109 @@
+"""Compares the throughput of a MarketStore with that of the same markets behind one lock, as threads are added.
+
+Each thread mixes single price updates, batched updates and percentage or derive reads on random events.
+
+Run from the repository root with: python -m benchmarks.contention [--markets 2000] [--seconds 1] [--threads 1 2 4 8]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from pybet import Market, Odds
+from pybet.prices import MarketStore
+
+RUNNERS = 8
+
+
+class SingleLockStore:
+    """The markets behind one lock, as the baseline for the striped store"""
+
+    def __init__(self, markets):
+        self._lock = threading.Lock()
+        self._markets = {event: Market(market) for event, market in markets.items()}
+
+    def __getitem__(self, event):
+        with self._lock:
+            return Market(self._markets[event])
+
+    def set_price(self, event, runner, odds):
+        with self._lock:
+            self._markets[event][runner] = odds
+
+    def batch(self, updates):
+        with self._lock:
+            for event, runner, odds in updates:
+                self._markets[event][runner] = odds
+
+    def percentage(self, event):
+        return self[event].percentage
+
+    def derive(self, event, places):
+        return self[event].derive(places)
+
+
+def markets(count, seed=0):
+    rng = random.Random(seed)
+    return {
+        event: Market(
+            {runner: Odds(round(rng.uniform(1.5, 30), 2)) for runner in range(RUNNERS)}
+        )
+        for event in range(count)
+    }
+
+
+def worker(store, count, deadline, seed, operations):
+    rng = random.Random(seed)
+    prices = [Odds(round(rng.uniform(1.5, 30), 2)) for _ in range(100)]
+    done = 0
+    while time.perf_counter() < deadline:
+        choice = rng.random()
+        event = rng.randrange(count)
+        if choice < 0.6:
+            store.set_price(event, rng.randrange(RUNNERS), rng.choice(prices))
+        elif choice < 0.8:
+            store.batch(
+                (rng.randrange(count), rng.randrange(RUNNERS), rng.choice(prices))
+                for _ in range(10)
+            )
+        elif choice < 0.98:
+            store.percentage(event)
+        else:
+            store.derive(event, 2)
+        done += 1
+    operations.append(done)
+
+
+def throughput(store, count, threads, seconds):
+    operations: list[int] = []
+    deadline = time.perf_counter() + seconds
+    pool = [
+        threading.Thread(target=worker, args=(store, count, deadline, i, operations))
+        for i in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return sum(operations) / seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--markets", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=1)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'threads':>8} {'one lock':>14} {'MarketStore':>14}")
+    initial = markets(args.markets)
+    for threads in args.threads:
+        single = throughput(
+            SingleLockStore(initial), args.markets, threads, args.seconds
+        )
+        striped = throughput(MarketStore(initial), args.markets, threads, args.seconds)
+        print(f"{threads:>8} {single:>10,.0f}/s {striped:>10,.0f}/s")
@@ -0,0 +1,46 @@
+"""Measures how many historical orders per minute an Exchange replays, from a synthetic stream of placements
+around a drifting price and cancellations of earlier orders.
+
+Run from the repository root with: python -m benchmarks.exchange [orders] [runners]
+"""
+
+import random
+import sys
+import time
+
+from pybet.exchange import TICKS, Exchange, Side
+
+
+def instructions(count, runners, seed=0):
+    rng = random.Random(seed)
+    mids = [rng.randrange(50, 250) for _ in range(runners)]
+    placed = []
+    stream = []
+    for order_id in range(1, count + 1):
+        if placed and rng.random() < 0.3:
+            stream.append(("cancel", placed[rng.randrange(len(placed))], None))
+            continue
+
+        runner = rng.randrange(runners)
+        mids[runner] = min(max(mids[runner] + rng.choice((-1, 0, 0, 1)), 5), 340)
+        side = Side.BACK if rng.random() < 0.5 else Side.LAY
+        spread = rng.randint(-2, 6)
+        tick = mids[runner] + spread if side == Side.BACK else mids[runner] - spread
+        odds = TICKS[min(max(tick, 0), len(TICKS) - 1)]
+        stream.append(("place", order_id, runner, side, odds, rng.randint(2, 200)))
+        placed.append(order_id)
+    return stream
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    runners = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    stream = instructions(count, runners)
+    exchange = Exchange(range(runners))
+
+    start = time.perf_counter()
+    fills = exchange.replay(stream)
+    seconds = time.perf_counter() - start
+
+    print(f"{count:,} orders, {len(fills):,} fills in {seconds:.2f}s")
+    print(f"{count / seconds * 60:,.0f} orders per minute")
@@ -0,0 +1,201 @@
+"""Times and measures peak memory of pybet's hot paths across field sizes, place counts,
+accumulator lengths and batch sizes, saving results as JSON and comparing them against a baseline.
+
+Run from the repository root with:
+
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 10
+
+Comparing exits with status 1 if any benchmark is slower, or allocates more at peak, than the baseline
+by more than the threshold percentage.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from decimal import Decimal
+from itertools import product
+
+from pybet import Market, Odds
+from pybet.bets import Accumulator, Bet
+from pybet.staking import kelly
+
+FIELD_SIZES = (2, 5, 10, 20, 40)
+PLACES = (2, 3)
+LEG_COUNTS = (2, 4, 8)
+BATCH_SIZES = (100, 1000)
+
+BENCHMARKS: dict[str, tuple[Callable[..., Callable[[], object] | None], dict]] = {}
+
+
+def benchmark(name, **params):
+    """Registers a benchmark run for every combination of the given parameter values.
+    The decorated function takes one value of each parameter and returns the callable to measure."""
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, params)
+        return setup
+
+    return register
+
+
+def market(runners, seed=0):
+    rng = random.Random(seed)
+    return Market(
+        {f"runner {i}": Odds(round(rng.uniform(1.5, 50), 2)) for i in range(runners)}
+    )
+
+
+def odds_batch(size, seed=0):
+    rng = random.Random(seed)
+    return [Odds(round(rng.uniform(1.1, 100), 2)) for _ in range(size)]
+
+
+@benchmark("Market.derive", runners=FIELD_SIZES, places=PLACES)
+def derive(runners, places):
+    if not 1 < places < runners or (runners, places) == (40, 3):
+        return None
+    win_market = market(runners)
+    return lambda: win_market.derive(places)
+
+
+@benchmark("Market.apply_margin", runners=FIELD_SIZES)
+def apply_margin(runners):
+    win_market = market(runners)
+    return lambda: win_market.apply_margin(Decimal(10))
+
+
+@benchmark("Odds.to_fractional", batch=BATCH_SIZES)
+def to_fractional(batch):
+    odds = odds_batch(batch)
+    return lambda: [o.to_fractional() for o in odds]
+
+
+@benchmark("Odds.fractional", batch=BATCH_SIZES)
+def fractional(batch):
+    rng = random.Random(0)
+    strings = [f"{rng.randint(1, 100)}/{rng.randint(1, 10)}" for _ in range(batch)]
+    return lambda: [Odds.fractional(s) for s in strings]
+
+
+@benchmark("Bet.settle", batch=BATCH_SIZES)
+def settle(batch):
+    bets = [
+        Bet(Decimal("2.50"), o, lambda i=i: i % 3 == 0)
+        for i, o in enumerate(odds_batch(batch))
+    ]
+    return lambda: [bet.settle(rf=10) for bet in bets]
+
+
+@benchmark("Accumulator", legs=LEG_COUNTS, batch=BATCH_SIZES)
+def accumulator(legs, batch):
+    selections = [(o, lambda: True, None) for o in odds_batch(legs)]
+    return lambda: [Accumulator(Decimal("2.50"), selections) for _ in range(batch)]
+
+
+@benchmark("kelly", batch=BATCH_SIZES)
+def kelly_batch(batch):
+    true_odds, market_odds = odds_batch(batch, 1), odds_batch(batch, 2)
+    return lambda: [kelly(t, m, Decimal(1000)) for t, m in zip(true_odds, market_odds)]
+
+
+def cases(pattern=""):
+    """Yields the name and callable of every benchmark whose name contains the pattern"""
+    for name, (setup, params) in BENCHMARKS.items():
+        for values in product(*params.values()):
+            arguments = dict(zip(params, values))
+            label = f"{name}[{','.join(f'{k}={v}' for k, v in arguments.items())}]"
+            if pattern in label and (run := setup(**arguments)) is not None:
+                yield label, run
+
+
+def measure(run, repeat):
+    """Returns the fastest time per call in seconds and the peak bytes allocated by one call"""
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat, number)) / number
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak}
+
+
+def compare(results, baseline, threshold):
+    """Yields a line for each benchmark in both results, and whether it regressed beyond the threshold"""
+    limit = 1 + threshold / 100
+    for label, current in results.items():
+        if (previous := baseline.get(label)) is None:
+            continue
+        time_ratio = current["seconds"] / previous["seconds"]
+        memory_ratio = current["peak_bytes"] / max(previous["peak_bytes"], 1)
+        regressed = time_ratio > limit or memory_ratio > limit
+        flag = "REGRESSION" if regressed else ""
+        yield (
+            f"{label:<48} time x{time_ratio:5.2f}  memory x{memory_ratio:5.2f}  {flag}",
+            regressed,
+        )
+
+
+def run(arguments=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks containing this text"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timing repeats, the fastest is kept"
+    )
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument(
+        "--compare", help="compare results with this baseline JSON file"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=10, help="regression threshold percentage"
+    )
+    args = parser.parse_args(arguments)
+
+    results = {}
+    for label, case in cases(args.filter):
+        results[label] = measure(case, args.repeat)
+        print(
+            f"{label:<48} {results[label]['seconds'] * 1e6:12.2f} us"
+            f" {results[label]['peak_bytes']:12,d} bytes"
+        )
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = 0
+        for line, regressed in compare(results, baseline, args.threshold):
+            print(line)
+            regressions += regressed
+        if regressions:
+            print(
+                f"{regressions} benchmark(s) regressed by more than {args.threshold}%"
+            )
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,4 +1,11 @@
+import os
+
 from .market import Market
 from .odds import Odds
 
 __all__ = ["Market", "Odds"]
+
+if os.environ.get("PYBET_INSTRUMENT") == "1":
+    from .instrumentation import enable
+
+    enable()
@@ -0,0 +1,12 @@
+from .engine import Backtest, BacktestResult, SimulationReport
+from .history import Race, read_races
+from .strategy import Strategy
+
+__all__ = [
+    "Backtest",
+    "BacktestResult",
+    "Race",
+    "SimulationReport",
+    "Strategy",
+    "read_races",
+]
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from math import inf, log
+from statistics import median, quantiles
+from typing import NamedTuple
+
+from .history import Race
+from .strategy import Strategy
+
+_CHUNK = 64
+
+
+class BacktestResult(NamedTuple):
+    """The outcome of a strategy over one sequence of races
+
+    Attributes:
+        final_bank: The bank after the last race, or when ruined.
+        growth_rate: The mean log growth of the bank per race.
+        max_drawdown: The largest fall in the bank from a previous peak, as a proportion of that peak.
+        ruined: Whether the bank fell to the ruin level.
+        path: The bank after each race, for the historical sequence only.
+    """
+
+    final_bank: Decimal
+    growth_rate: float
+    max_drawdown: float
+    ruined: bool
+    path: array | None = None
+
+
+class SimulationReport:
+    """The outcomes of a strategy over many resampled sequences of races
+
+    Example:
+        >>> report = backtest.simulate(10_000, seed=1)
+        >>> report.ruin_probability
+        0.0123
+        >>> report.drawdown_at_risk(0.95)
+        0.41
+    """
+
+    def __init__(self, results: Sequence[tuple[float, float, float, bool]]) -> None:
+        """Initialises a report from the final bank, growth rate, maximum drawdown and ruin of each simulation
+
+        :param results: The outcome of each simulation
+        :type results: Sequence[tuple[float, float, float, bool]]
+        :raises ValueError: If there are no results
+        """
+        if not results:
+            raise ValueError("Report must have at least one simulation")
+
+        self.final_banks = array("d", (r[0] for r in results))
+        self.growth_rates = array("d", (r[1] for r in results))
+        self.max_drawdowns = array("d", (r[2] for r in results))
+        self._ruined = sum(r[3] for r in results)
+
+    def __len__(self) -> int:
+        return len(self.final_banks)
+
+    # Properties
+
+    @property
+    def ruin_probability(self) -> float:
+        """The proportion of simulations in which the bank fell to the ruin level
+
+        :return: The probability of ruin
+        :rtype: float
+        """
+
+        return self._ruined / len(self)
+
+    @property
+    def growth_rate(self) -> float:
+        """The median log growth of the bank per race
+
+        :return: The median growth rate
+        :rtype: float
+        """
+
+        return median(self.growth_rates)
+
+    @property
+    def max_drawdown(self) -> float:
+        """The median of the largest drawdown in each simulation
+
+        :return: The median maximum drawdown
+        :rtype: float
+        """
+
+        return median(self.max_drawdowns)
+
+    # Instance methods
+
+    def drawdown_at_risk(self, level: float = 0.95) -> float:
+        """Returns the maximum drawdown that will not be exceeded at the given confidence level
+
+        :param level: The confidence level, defaults to 0.95
+        :type level: float, optional
+        :raises ValueError: If the level is not between 0 and 1
+        :return: The maximum drawdown at the confidence level
+        :rtype: float
+        """
+        if not 0 < level < 1:
+            raise ValueError("Level must be between 0 and 1")
+
+        if len(self) == 1:
+            return self.max_drawdowns[0]
+
+        cuts = quantiles(self.max_drawdowns, n=1000, method="inclusive")
+        return cuts[min(max(round(level * 1000), 1), 999) - 1]
+
+
+class _Columns(NamedTuple):
+    offsets: array
+    amounts: array
+    returns: array
+    bank: float
+    proportional: bool
+    max_stake: float
+    ruin: float
+
+
+class Backtest:
+    """A backtest of a staking strategy over a history of races.
+
+    Races are read once, and the strategy's stake and the net return per unit staked of every bet are
+    held in typed arrays, so that replaying the history, or resampled sequences of it, only updates the bank.
+    Stakes in a race are placed together from the bank before it, scaled down if they exceed the bank, and
+    betting stops if the bank falls to the ruin level. Monte Carlo simulations run across a process pool.
+
+    Example:
+        >>> backtest = Backtest(read_races('races.csv'), Strategy.kelly(fraction=0.5), bank=1000)
+        >>> backtest.run().final_bank
+        Decimal('1834.21')
+        >>> backtest.simulate(10_000, seed=1).ruin_probability
+        0.0
+    """
+
+    def __init__(
+        self,
+        races: Iterable[Race],
+        strategy: Strategy,
+        *,
+        bank: Decimal | float = 1000,
+        ruin: Decimal | float = 0,
+    ) -> None:
+        """Initialises a backtest, reading every race
+
+        :param races: The historical races, in the order run
+        :type races: Iterable[Race]
+        :param strategy: The staking strategy, whose commission is applied to winnings
+        :type strategy: Strategy
+        :param bank: The starting bank, defaults to 1000
+        :type bank: Decimal, optional
+        :param ruin: The bank at or below which betting stops, defaults to 0
+        :type ruin: Decimal, optional
+        :raises ValueError: If the bank is not greater than 0 or the ruin level is not below it
+        """
+        if not 0 <= ruin < bank:
+            raise ValueError("Bank must be greater than 0 and the ruin level")
+
+        self.bank = bank
+        self.strategy = strategy
+        self.ruin = ruin
+        retained = 1 - float(strategy.percentage_commission) / 100
+
+        offsets = array("q", [0])
+        amounts = array("d")
+        returns = array("d")
+        for race in races:
+            stakes = strategy.stakes(race.true_market, race.market)
+            for runner, amount in stakes.items():
+                if amount > 0:
+                    amounts.append(float(amount))
+                    returns.append(
+                        (float(race.market[runner]) - 1) * retained
+                        if runner in race.winners
+                        else -1.0
+                    )
+            offsets.append(len(amounts))
+
+        self._columns = _Columns(
+            offsets,
+            amounts,
+            returns,
+            float(bank),
+            strategy.proportional,
+            inf if strategy.max_stake is None else float(strategy.max_stake),
+            float(ruin),
+        )
+
+    def __len__(self) -> int:
+        return len(self._columns.offsets) - 1
+
+    # Properties
+
+    @property
+    def bets(self) -> int:
+        """The number of bets the strategy places over the history
+
+        :return: The number of bets
+        :rtype: int
+        """
+
+        return len(self._columns.amounts)
+
+    # Instance methods
+
+    def run(self) -> BacktestResult:
+        """Replays the strategy over the races in their historical order
+
+        :return: The outcome, including the bank after each race
+        :rtype: BacktestResult
+        """
+        path = array("d")
+        final, growth, drawdown, ruined = _replay(self._columns, range(len(self)), path)
+
+        return BacktestResult(_money(final), growth, drawdown, ruined, path)
+
+    def simulate(
+        self,
+        simulations: int = 1000,
+        *,
+        processes: int | None = None,
+        seed: int | None = None,
+    ) -> SimulationReport:
+        """Replays the strategy over sequences of races resampled with replacement from the history,
+        spreading the simulations across a pool of processes
+
+        :param simulations: The number of sequences to simulate, defaults to 1000
+        :type simulations: int, optional
+        :param processes: The number of processes, or 1 to simulate in this process, defaults to the CPU count
+        :type processes: int, optional
+        :param seed: A seed for resampling, giving the same report for any number of processes, defaults to None
+        :type seed: int, optional
+        :raises ValueError: If there are fewer than 1 simulations or no races
+        :return: The outcomes of the simulations
+        :rtype: SimulationReport
+        """
+        if simulations < 1:
+            raise ValueError("Simulations must be at least 1")
+
+        if not len(self):
+            raise ValueError("Backtest has no races")
+
+        rng = random.Random(seed)
+        tasks = [
+            (rng.getrandbits(64), min(_CHUNK, simulations - start))
+            for start in range(0, simulations, _CHUNK)
+        ]
+
+        if processes == 1:
+            chunks = [_simulate(self._columns, *task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(
+                processes, initializer=_initialise, initargs=(self._columns,)
+            ) as pool:
+                chunks = list(pool.map(_simulate_in_worker, *zip(*tasks)))
+
+        return SimulationReport([result for chunk in chunks for result in chunk])
+
+
+_worker_columns: _Columns | None = None
+
+
+def _initialise(columns: _Columns) -> None:
+    global _worker_columns
+    _worker_columns = columns
+
+
+def _simulate_in_worker(
+    seed: int, count: int
+) -> list[tuple[float, float, float, bool]]:
+    assert _worker_columns is not None
+    return _simulate(_worker_columns, seed, count)
+
+
+def _simulate(
+    columns: _Columns, seed: int, count: int
+) -> list[tuple[float, float, float, bool]]:
+    rng = random.Random(seed)
+    races = range(len(columns.offsets) - 1)
+    return [_replay(columns, rng.choices(races, k=len(races))) for _ in range(count)]
+
+
+def _replay(
+    columns: _Columns, order: Iterable[int], path: array | None = None
+) -> tuple[float, float, float, bool]:
+    """Returns the final bank, growth rate, maximum drawdown and ruin of the strategy over races in the given order"""
+    offsets, amounts, returns, start, proportional, cap, ruin = columns
+    bank = peak = start
+    drawdown = 0.0
+    ruined = False
+    races = 0
+    for race in order:
+        races += 1
+        scale = bank if proportional else 1.0
+        staked = profit = 0.0
+        for i in range(offsets[race], offsets[race + 1]):
+            stake = min(amounts[i] * scale, cap)
+            staked += stake
+            profit += stake * returns[i]
+        if staked > bank:
+            profit *= bank / staked
+        bank += profit
+
+        if path is not None:
+            path.append(bank)
+        if bank > peak:
+            peak = bank
+        elif (peak - bank) / peak > drawdown:
+            drawdown = (peak - bank) / peak
+        if bank <= ruin:
+            ruined = True
+            break
+
+    if not races:
+        return bank, 0.0, drawdown, ruined
+
+    growth = log(bank / start) / races if bank > 0 else -inf
+    return bank, growth, drawdown, ruined
+
+
+def _money(value: float) -> Decimal:
+    return round(Decimal(value), 2)
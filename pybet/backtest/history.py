@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Hashable, Iterator
+from itertools import groupby
+from operator import itemgetter
+from os import PathLike
+from typing import NamedTuple
+
+from ..market import Market
+from ..odds import Odds
+
+
+class Race(NamedTuple):
+    """A historical race with the prices available, the true prices and the winners"""
+
+    event: Hashable
+    market: Market
+    true_market: Market
+    winners: frozenset
+
+
+def read_races(path: str | PathLike) -> Iterator[Race]:
+    """Streams historical races from a CSV file with a header row and the columns event, runner, odds,
+    true_odds and won, where won is 1 for a winner and 0 otherwise. Rows for the same race must be consecutive.
+
+    :param path: The path of the CSV file
+    :type path: str | PathLike
+    :raises ValueError: If a row is missing a column
+    :return: An iterator of races, read one at a time
+    :rtype: Iterator[Race]
+
+    :Example:
+        >>> next(read_races('races.csv'))
+        Race(event='2:30 Ascot', market={'Frankel': Odds(2.0), ...}, ...)
+    """
+    with open(path, newline="") as file:
+        for event, rows in groupby(csv.DictReader(file), key=itemgetter("event")):
+            market, true_market, winners = Market(), Market(), set()
+            for row in rows:
+                if None in row.values():
+                    raise ValueError(f"Incomplete row for event {event}")
+
+                runner = row["runner"]
+                market[runner] = Odds(row["odds"])
+                true_market[runner] = Odds(row["true_odds"])
+                if int(row["won"]):
+                    winners.add(runner)
+
+            yield Race(event, market, true_market, frozenset(winners))
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Mapping
+from decimal import Decimal
+
+from ..market import Market
+from ..staking import kelly_array, simultaneous_kelly
+
+Stakes = Callable[[Market, Market], Mapping[Hashable, Decimal | float]]
+
+_UNIT_BANK = Decimal(1_000_000)
+
+
+class Strategy:
+    """A staking strategy to backtest, giving the stake on each runner in a race from its true market
+    and available market, either as a proportion of the current bank or as a fixed amount.
+
+    Example:
+        >>> Strategy.level(10)
+        >>> Strategy.kelly(fraction=0.5, max_stake=50)
+        >>> Strategy(lambda true_market, market: {runner: 0.01 for runner in market.favourites})
+    """
+
+    __slots__ = ("max_stake", "percentage_commission", "proportional", "stakes")
+
+    def __init__(
+        self,
+        stakes: Stakes,
+        *,
+        proportional: bool = True,
+        max_stake: Decimal | float | None = None,
+        percentage_commission: Decimal | float = 0,
+    ) -> None:
+        """Initialises a strategy
+
+        :param stakes: A function of a race's true market and available market giving the stake on each runner
+        :type stakes: Callable[[Market, Market], Mapping[Hashable, Decimal]]
+        :param proportional: Whether stakes are proportions of the bank rather than amounts, defaults to True
+        :type proportional: bool, optional
+        :param max_stake: The largest stake to place on any runner, defaults to None
+        :type max_stake: Decimal, optional
+        :param percentage_commission: The percentage commission applied to winnings, defaults to 0
+        :type percentage_commission: Decimal, optional
+        :raises ValueError: If the maximum stake is not greater than 0
+        :raises ValueError: If commission is not between 0 and 100
+        """
+        if max_stake is not None and max_stake <= 0:
+            raise ValueError("Maximum stake must be greater than 0")
+
+        if not 0 <= percentage_commission <= 100:
+            raise ValueError("Commission must be between 0 and 100")
+
+        self.stakes = stakes
+        self.proportional = proportional
+        self.max_stake = max_stake
+        self.percentage_commission = percentage_commission
+
+    @classmethod
+    def level(
+        cls, amount: Decimal | float, *, percentage_commission: Decimal | float = 0
+    ) -> Strategy:
+        """Creates a strategy staking a fixed amount on every runner whose true odds are shorter than its odds
+        after commission
+
+        :param amount: The stake on each runner
+        :type amount: Decimal
+        :param percentage_commission: The percentage commission applied to winnings, defaults to 0
+        :type percentage_commission: Decimal, optional
+        :raises ValueError: If the amount is not greater than 0
+        :return: A level stakes strategy
+        :rtype: Strategy
+        """
+        if amount <= 0:
+            raise ValueError("Amount must be greater than 0")
+
+        retained = 1 - Decimal(percentage_commission) / 100
+
+        def stakes(true_market: Market, market: Market) -> dict[Hashable, Decimal]:
+            return {
+                runner: Decimal(amount)
+                for runner, odds in market.items()
+                if odds is not None
+                and true_market.get(runner) is not None
+                and true_market[runner] < 1 + (odds - 1) * retained
+            }
+
+        return cls(
+            stakes, proportional=False, percentage_commission=percentage_commission
+        )
+
+    @classmethod
+    def kelly(
+        cls,
+        *,
+        fraction: Decimal | float = 1,
+        max_stake: Decimal | float | None = None,
+        percentage_commission: Decimal | float = 0,
+    ) -> Strategy:
+        """Creates a strategy staking each runner independently by the Kelly criterion, see kelly_array
+
+        :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+        :type fraction: Decimal, optional
+        :param max_stake: The largest stake to place on any runner, defaults to None
+        :type max_stake: Decimal, optional
+        :param percentage_commission: The percentage commission applied to winnings, defaults to 0
+        :type percentage_commission: Decimal, optional
+        :return: A Kelly strategy
+        :rtype: Strategy
+        """
+
+        def stakes(true_market: Market, market: Market) -> dict[Hashable, Decimal]:
+            runners = [
+                runner
+                for runner, odds in market.items()
+                if odds is not None and true_market.get(runner) is not None
+            ]
+            amounts = kelly_array(
+                [true_market[runner] for runner in runners],
+                [market[runner] for runner in runners],
+                _UNIT_BANK,
+                percentage_commission,
+                fraction=fraction,
+            )
+            return {
+                runner: amount / _UNIT_BANK for runner, amount in zip(runners, amounts)
+            }
+
+        return cls(
+            stakes, max_stake=max_stake, percentage_commission=percentage_commission
+        )
+
+    @classmethod
+    def simultaneous_kelly(
+        cls,
+        *,
+        fraction: Decimal | float = 1,
+        max_stake: Decimal | float | None = None,
+        percentage_commission: Decimal | float = 0,
+    ) -> Strategy:
+        """Creates a strategy staking the runners in each race together by the Kelly criterion,
+        see simultaneous_kelly
+
+        :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+        :type fraction: Decimal, optional
+        :param max_stake: The largest stake to place on any runner, defaults to None
+        :type max_stake: Decimal, optional
+        :param percentage_commission: The percentage commission applied to winnings, defaults to 0
+        :type percentage_commission: Decimal, optional
+        :return: A simultaneous Kelly strategy
+        :rtype: Strategy
+        """
+
+        def stakes(true_market: Market, market: Market) -> dict[Hashable, Decimal]:
+            amounts = simultaneous_kelly(
+                true_market,
+                market,
+                _UNIT_BANK,
+                Decimal(percentage_commission),
+                fraction=Decimal(fraction),
+            )
+            return {runner: amount / _UNIT_BANK for runner, amount in amounts.items()}
+
+        return cls(
+            stakes, max_stake=max_stake, percentage_commission=percentage_commission
+        )
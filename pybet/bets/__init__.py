@@ -3,11 +3,38 @@ from peak_utility.number import Numbertext  # type: ignore
 from .accumulator import Accumulator
 from .bet import Bet
 from .double import Double
+from .each_way import EachWay, EachWayAccumulator, PlaceTerms, settle_each_way
+from .settlement import (
+    MemorySink,
+    ResultEvent,
+    SettlementPipeline,
+    SettlementRecord,
+    SettlementSink,
+)
+from .store import BetStore, BetView
 from .treble import Treble
 
-__all__ = ["Accumulator", "Bet", "Double", "Treble"]
+__all__ = [
+    "Accumulator",
+    "Bet",
+    "BetStore",
+    "BetView",
+    "Double",
+    "EachWay",
+    "EachWayAccumulator",
+    "MemorySink",
+    "PlaceTerms",
+    "ResultEvent",
+    "SettlementPipeline",
+    "SettlementRecord",
+    "SettlementSink",
+    "Treble",
+    "settle_each_way",
+]
 
 for i in range(4, 21):
     name = f"{Numbertext(i).__str__().title()}Fold"
-    globals()[name] = type(name, (Accumulator,), {"_selection_count_requirement": i})
+    globals()[name] = type(
+        name, (Accumulator,), {"__slots__": (), "_selection_count_requirement": i}
+    )
     __all__ += name
@@ -9,6 +9,8 @@ from .bet import Bet
 
 
 class Accumulator(Bet):
+    __slots__ = ()
+
     _selection_count_requirement: int | None = None
 
     def __new__(
@@ -22,6 +22,15 @@ class Bet:
         >>> bet = Bet(2.00, Odds(21), bradford_win_league, season_over)
     """
 
+    __slots__ = (
+        "_voided",
+        "bog",
+        "end_condition",
+        "odds",
+        "stake",
+        "win_condition",
+    )
+
     class Status(Enum):
         """An enum to represent the status of a bet."""
 
@@ -29,6 +38,7 @@ class Bet:
         WON = 1
         LOST = 2
         VOID = 3
+        PLACED = 4
 
         def __str__(self):
             return self.name
@@ -98,26 +108,12 @@ class Bet:
         if not self.end_condition():
             raise ValueError("Bet is still open")
 
-        if not sp:
-            if self.odds == "SP":
-                raise ValueError("Starting price not set")
-            if self.bog:
-                raise ValueError("Cannot calculate best odds without starting price")
+        settlement_odds = self._settlement_odds(sp)
 
         if not self.win_condition():
             return Decimal(0)
 
-        settlement_odds = (
-            max([sp, self.odds])
-            if self.bog and isinstance(self.odds, Odds) and sp
-            else sp or self.odds
-        )
-        assert isinstance(settlement_odds, Odds)
-
-        reducer = Decimal(1 - rf / 100)
-        returns = self.stake * Odds(settlement_odds.to_one() * reducer + 1)
-
-        return Decimal(round(returns, 2))
+        return _returns(self.stake, settlement_odds, rf)
 
     @property
     def status(self) -> Status:
@@ -143,9 +139,45 @@ class Bet:
 
         return Bet.Status.OPEN
 
+    def _settlement_odds(self, sp: Odds | None) -> Odds:
+        """Returns the odds the bet is settled at, taking account of SP and BOG
+
+        :param sp: The starting price, if known
+        :type sp: Odds | None
+        :raises ValueError: If the starting price is needed but not given
+        :return: The odds to settle the bet at
+        :rtype: Odds
+        """
+
+        return _settlement_odds(self.odds, sp, bog=self.bog)
+
     def void(self) -> None:
         """Voids the bet.
 
         :return: None
         """
         self._voided = True
+
+
+def _settlement_odds(odds: Odds | Literal["SP"], sp: Odds | None, *, bog: bool) -> Odds:
+    """Returns the odds a bet at the given odds is settled at, taking account of SP and BOG"""
+    if not sp:
+        if odds == "SP":
+            raise ValueError("Starting price not set")
+        if bog:
+            raise ValueError("Cannot calculate best odds without starting price")
+
+    settlement_odds = (
+        max([sp, odds]) if bog and isinstance(odds, Odds) and sp else sp or odds
+    )
+    assert isinstance(settlement_odds, Odds)
+
+    return settlement_odds
+
+
+def _returns(stake: Decimal, odds: Odds, rf: int | Decimal) -> Decimal:
+    """Returns the returns of a stake at the given odds after any reduction factor, to 2 decimal places"""
+    reducer = Decimal(1 - rf / 100)
+    returns = stake * Odds(odds.to_one() * reducer + 1)
+
+    return Decimal(round(returns, 2))
@@ -2,4 +2,5 @@ from .accumulator import Accumulator
 
 
 class Double(Accumulator):
+    __slots__ = ()
     _selection_count_requirement = 2
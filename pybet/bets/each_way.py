@@ -0,0 +1,414 @@
+from collections.abc import Sequence
+from decimal import Decimal
+from fractions import Fraction
+from functools import reduce
+from operator import mul
+from typing import Callable, Literal, TypeVar
+
+from pybet import Odds
+
+from .bet import Bet, _returns, _settlement_odds
+
+T = TypeVar("T")
+
+
+class PlaceTerms:
+    """A class to represent the place terms of an each-way bet.
+
+    Attributes:
+        fraction: The fraction of the win odds paid for a place.
+        places: The number of places paid.
+
+    Example:
+        >>> terms = PlaceTerms("1/5", 3)
+    """
+
+    __slots__ = ("fraction", "places")
+
+    def __init__(self, fraction: Fraction | str, places: int) -> None:
+        """Initialises place terms with a fraction and a number of places
+
+        :param fraction: The fraction of the win odds paid for a place, e.g. '1/4'
+        :type fraction: Fraction | str
+        :param places: The number of places paid
+        :type places: int
+        :raises ValueError: If the fraction is not > 0 and <= 1
+        :raises ValueError: If the number of places is less than 1
+        :return: Place terms
+        :rtype: PlaceTerms
+        """
+        fraction = Fraction(fraction)
+        if not 0 < fraction <= 1:
+            raise ValueError("Place fraction must be > 0 and <= 1")
+
+        if places < 1:
+            raise ValueError("Places paid must be at least 1")
+
+        self.fraction = fraction
+        self.places = places
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.fraction}', {self.places})"
+
+    def apply(self, odds: Odds) -> Odds:
+        """Returns the place odds for the given win odds
+
+        :param odds: The win odds
+        :type odds: Odds
+        :return: The place odds
+        :rtype: Odds
+
+        :Example:
+            >>> PlaceTerms("1/4", 3).apply(Odds(9))
+            Odds('3.00')
+        """
+
+        return Odds(
+            odds.to_one() * self.fraction.numerator / self.fraction.denominator + 1
+        )
+
+
+class EachWay(Bet):
+    """A class to represent an each-way bet, i.e. a win bet and a place bet of the same stake on the same selection.
+
+     Attributes:
+        stake: The stake of each part of the bet, so the total stake is twice this.
+        odds: The win odds of the bet.
+        terms: The place terms of the bet.
+        win_condition: The callback that will determine whether the selection has won.
+        place_condition: The callback that will determine whether the selection has placed.
+        end_condition: The callback that will determine whether the bet can be settled.
+
+    Example:
+        >>> race = {'position': 2, 'finished': True}
+        >>> won = lambda: race['position'] == 1
+        >>> placed = lambda: race['position'] <= 3
+        >>> bet = EachWay(5.00, Odds(9), won, placed, terms=PlaceTerms('1/4', 3))
+    """
+
+    __slots__ = ("place_condition", "terms")
+
+    def __init__(
+        self,
+        stake: float | Decimal | str,
+        odds: Odds | Literal["SP"],
+        win_condition: Callable[..., bool],
+        place_condition: Callable[..., bool],
+        end_condition: Callable[..., bool] = lambda: True,
+        *,
+        terms: PlaceTerms,
+        bog: bool = False,
+    ) -> None:
+        """Initialises an each-way bet with win, place and end conditions.
+
+        :param stake: The stake of each part of the bet
+        :type stake: Decimal
+        :param odds: The win odds of the bet
+        :type odds: Odds
+        :param win_condition: A callback that will determine whether the selection has won
+        :type win_condition: Callable[..., bool]
+        :param place_condition: A callback that will determine whether the selection has placed
+        :type place_condition: Callable[..., bool]
+        :param end_condition: A callback that will determine whether the bet can be settled
+        :type end_condition: Callable[..., bool]
+        :param terms: The place terms of the bet
+        :type terms: PlaceTerms
+        :param bog: Whether the bet is best odds guaranteed
+        :type bog: bool
+        :return: An each-way bet
+        :rtype: EachWay
+        """
+        super().__init__(stake, odds, win_condition, end_condition, bog=bog)
+        self.place_condition = place_condition
+        self.terms = terms
+
+    @property
+    def total_stake(self) -> Decimal:
+        """Returns the total stake of the bet, i.e. the stake of both parts
+
+        :return: The total stake
+        :rtype: Decimal
+        """
+
+        return self.stake * 2
+
+    def settle(self, *, sp: Odds | None = None, rf: int | Decimal = 0) -> Decimal:
+        """Returns the returns of both parts of the bet. Rule 4 reductions and BOG are applied to each part.
+
+        :return: The returns of the bet to 2 decimal places
+        :rtype: Decimal
+        :raises ValueError: If the bet is still open
+
+        :Example:
+            >>> bet = EachWay(5.00, Odds(9), won, placed, terms=PlaceTerms('1/4', 3))
+            >>> bet.settle()
+            Decimal('15.00')
+        """
+
+        if self._voided:
+            return self.total_stake
+
+        win_returns = super().settle(sp=sp, rf=rf)
+
+        if not (self.win_condition() or self.place_condition()):
+            return win_returns
+
+        return win_returns + _returns(self.stake, self._place_odds(sp), rf)
+
+    @property
+    def status(self) -> Bet.Status:
+        """Returns the status of the bet, which will be PLACED if the selection placed without winning.
+
+        :return: The status of the bet
+        :rtype: Status
+        """
+        status = super().status
+
+        if status == Bet.Status.LOST and self.place_condition():
+            return Bet.Status.PLACED
+
+        return status
+
+    def _place_odds(self, sp: Odds | None) -> Odds:
+        """Returns the odds the place part of the bet is settled at
+
+        :param sp: The starting price, if known
+        :type sp: Odds | None
+        :return: The place odds
+        :rtype: Odds
+        """
+
+        return self.terms.apply(self._settlement_odds(sp))
+
+
+class EachWayAccumulator(EachWay):
+    """A class to represent an each-way accumulator, where the win part rolls up the win odds of every leg
+    and the place part rolls up the place odds of every leg under its own place terms.
+
+    A leg at SP is settled at its starting price, as for EachWay, and the bet's odds are then SP.
+
+    Attributes:
+        legs: The win odds, or SP, and place terms of each leg.
+        place_odds: The place odds of the bet at the legs' prices, or None if any leg is at SP.
+
+    Example:
+        >>> ew_double = EachWayAccumulator(
+        ...     1.00,
+        ...     [(Odds(5), PlaceTerms('1/4', 3), won_1, placed_1), (Odds(9), PlaceTerms('1/5', 4), won_2, placed_2)],
+        ... )
+    """
+
+    __slots__ = ("legs", "place_odds")
+
+    def __init__(
+        self,
+        stake: float | Decimal | str,
+        bet_list: list[
+            tuple[Odds | str, PlaceTerms, Callable[..., bool], Callable[..., bool]]
+            | tuple[
+                Odds | str,
+                PlaceTerms,
+                Callable[..., bool],
+                Callable[..., bool],
+                Callable[..., bool] | None,
+            ]
+        ],
+        *,
+        bog: bool = False,
+    ) -> None:
+        self.legs: list[tuple[Odds | Literal["SP"], PlaceTerms]] = [
+            ("SP" if bet[0] == "SP" else Odds(bet[0]), bet[1]) for bet in bet_list
+        ]
+        prices = [price for price, _ in self.legs if isinstance(price, Odds)]
+        odds: Odds | Literal["SP"] = "SP"
+        self.place_odds: Odds | None = None
+        if len(prices) == len(self.legs):
+            odds = Odds(reduce(mul, prices, 1))
+            self.place_odds = Odds(
+                reduce(mul, [t.apply(p) for p, (_, t) in zip(prices, self.legs)], 1)
+            )
+        win_condition = lambda: all(bet[2]() for bet in bet_list)
+        place_condition = lambda: all(bet[2]() or bet[3]() for bet in bet_list)
+        end_condition = lambda: all(
+            bet[4]() if len(bet) == 5 and bet[4] else True for bet in bet_list
+        )
+
+        Bet.__init__(self, stake, odds, win_condition, end_condition, bog=bog)
+        self.place_condition = place_condition
+
+    @property
+    def terms(self) -> list[PlaceTerms]:  # type: ignore
+        """Returns the place terms of each leg
+
+        :return: The place terms of each leg
+        :rtype: list[PlaceTerms]
+        """
+
+        return [terms for _, terms in self.legs]
+
+    def settle(
+        self,
+        *,
+        sp: Odds | Sequence[Odds | None] | None = None,
+        rf: int | Decimal = 0,
+    ) -> Decimal:
+        """Returns the returns of both parts of the bet, settling each leg at its starting price as for EachWay,
+        so that with BOG each leg of both parts is settled at the longer of its price and starting price
+
+        :param sp: The starting price of each leg, or of the only leg, defaults to None
+        :type sp: Sequence[Odds | None], optional
+        :param rf: The reduction factor, defaults to 0
+        :type rf: int | Decimal, optional
+        :raises ValueError: If the bet is still open, or a needed starting price is missing
+        :raises ValueError: If a single starting price is given for more than one leg
+        :return: The returns of the bet to 2 decimal places
+        :rtype: Decimal
+
+        :Example:
+            >>> ew_double = EachWayAccumulator(1.00, [(Odds(5), quarter, won, placed), (Odds(9), fifth, won, placed)], bog=True)
+            >>> ew_double.settle(sp=[Odds(6), Odds(8)])
+            Decimal('59.85')
+        """
+
+        if self._voided:
+            return self.total_stake
+
+        if not 0 <= rf < 100:
+            raise ValueError("Reduction factor must be >= 0 and < 100")
+
+        if not self.end_condition():
+            raise ValueError("Bet is still open")
+
+        sps = self._leg_sps(sp)
+        odds = [
+            _settlement_odds(price, leg_sp, bog=self.bog)
+            for (price, _), leg_sp in zip(self.legs, sps)
+        ]
+
+        returns = Decimal(0)
+        if self.win_condition():
+            returns += _returns(self.stake, Odds(reduce(mul, odds, 1)), rf)
+        if self.win_condition() or self.place_condition():
+            place_odds = reduce(
+                mul, [terms.apply(o) for o, (_, terms) in zip(odds, self.legs)], 1
+            )
+            returns += _returns(self.stake, Odds(place_odds), rf)
+
+        return returns
+
+    def _leg_sps(
+        self, sp: Odds | Sequence[Odds | None] | None
+    ) -> Sequence[Odds | None]:
+        """Returns the starting price of each leg"""
+        if sp is None or isinstance(sp, Decimal):
+            if sp is not None and len(self.legs) > 1:
+                raise ValueError("Starting prices must be given for each leg")
+            return [sp] * len(self.legs)
+
+        if len(sp) != len(self.legs):
+            raise ValueError("Starting prices must be given for each leg")
+
+        return sp
+
+
+def settle_each_way(
+    stakes: Sequence[float | Decimal | str],
+    odds: Sequence[Odds | Literal["SP"]],
+    positions: Sequence[int | None],
+    terms: PlaceTerms | Sequence[PlaceTerms],
+    *,
+    sps: Sequence[Odds | None] | None = None,
+    rf: int | Decimal | Sequence[int | Decimal] = 0,
+    bog: bool | Sequence[bool] = False,
+) -> list[Decimal]:
+    """Settles a batch of each-way bets, e.g. a whole race's each-way book, in one call.
+    Returns match those of settling each bet as an EachWay individually.
+
+    :param stakes: The stake of each part of each bet
+    :type stakes: Sequence[Decimal]
+    :param odds: The win odds of each bet
+    :type odds: Sequence[Odds]
+    :param positions: The finishing position of each selection, 0 if unplaced or None if void
+    :type positions: Sequence[int | None]
+    :param terms: The place terms for all bets, or for each bet
+    :type terms: PlaceTerms | Sequence[PlaceTerms]
+    :param sps: The starting price of each selection, used as for Bet.settle, defaults to None
+    :type sps: Sequence[Odds | None], optional
+    :param rf: The reduction factor for all bets, or for each bet, defaults to 0
+    :type rf: int | Decimal | Sequence[int | Decimal], optional
+    :param bog: Whether all bets, or each bet, are best odds guaranteed, defaults to False
+    :type bog: bool | Sequence[bool], optional
+    :raises ValueError: If the sequences are not all the same length
+    :raises ValueError: If a reduction factor is invalid or a price is missing
+    :return: The returns of each bet to 2 decimal places
+    :rtype: list[Decimal]
+
+    :Example:
+        >>> settle_each_way([5, 5, 5], [Odds(3), Odds(9), Odds(21)], [1, 3, 0], PlaceTerms('1/4', 3))
+        [Decimal('15.00'), Decimal('15.00'), Decimal('0.00')]
+    """
+    count = len(stakes)
+    if not len(odds) == len(positions) == count:
+        raise ValueError("Stakes, odds and positions must be the same length")
+
+    terms_list = _broadcast(terms, count, PlaceTerms)
+    rf_list = _broadcast(rf, count, (int, Decimal))
+    bog_list = _broadcast(bog, count, bool)
+    sp_list = list(sps) if sps is not None else [None] * count
+    if len(sp_list) != count:
+        raise ValueError("Starting prices must be the same length as stakes")
+
+    reducers: dict[int | Decimal, Decimal] = {}
+    returns = []
+    for stake, price, position, term, reduction, best, sp in zip(
+        stakes, odds, positions, terms_list, rf_list, bog_list, sp_list
+    ):
+        unit = Decimal(stake)
+        if position is None:
+            returns.append(unit * 2)
+            continue
+
+        if reduction not in reducers:
+            reducers[reduction] = _reducer(reduction)
+
+        to_one = _settlement_odds(price, sp, bog=best).to_one()
+        returns.append(
+            _each_way_returns(unit, to_one, position, term, reducers[reduction])
+        )
+
+    return returns
+
+
+def _reducer(rf: int | Decimal) -> Decimal:
+    """Returns the multiplier applied to winnings for a given reduction factor"""
+    if not 0 <= rf < 100:
+        raise ValueError("Reduction factor must be >= 0 and < 100")
+
+    return Decimal(1 - rf / 100)
+
+
+def _each_way_returns(
+    stake: Decimal, to_one: Decimal, position: int, terms: PlaceTerms, reducer: Decimal
+) -> Decimal:
+    """Returns the combined returns of the win and place parts for a finishing position"""
+    if not 1 <= position <= terms.places:
+        return Decimal(0)
+
+    place_to_one = to_one * terms.fraction.numerator / terms.fraction.denominator
+    returns = round(stake * (place_to_one * reducer + 1), 2)
+    if position == 1:
+        returns += round(stake * (to_one * reducer + 1), 2)
+
+    return Decimal(returns)
+
+
+def _broadcast(value: T | Sequence[T], count: int, kind: type | tuple) -> list[T]:
+    """Returns a list of the value repeated count times, or the value itself if already a sequence"""
+    if isinstance(value, kind):
+        return [value] * count  # type: ignore
+
+    values = list(value)  # type: ignore
+    if len(values) != count:
+        raise ValueError("Per-bet arguments must be the same length as stakes")
+
+    return values
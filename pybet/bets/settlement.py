@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, Hashable, Iterable
+from decimal import Decimal
+from enum import Enum
+from typing import NamedTuple, Protocol
+
+from pybet import Odds
+
+from .bet import Bet
+
+_Job = tuple[Bet, Hashable, Hashable, Odds | None, Decimal]
+
+
+class ResultEvent:
+    """A class to represent an event affecting the settlement of bets, e.g. a starting price,
+    a Rule 4 deduction, a void or non-runner, or a result.
+
+    Example:
+        >>> ResultEvent.price('2:30 Ascot', 'Frankel', Odds(3))
+        >>> ResultEvent.deduction('2:30 Ascot', 10)
+        >>> ResultEvent.void('2:30 Ascot', 'Shergar')
+        >>> ResultEvent.result('2:30 Ascot')
+    """
+
+    __slots__ = ("event", "kind", "rf", "runner", "sp")
+
+    class Kind(Enum):
+        """An enum to represent the kind of a result event."""
+
+        PRICE = 0
+        DEDUCTION = 1
+        VOID = 2
+        RESULT = 3
+
+        def __str__(self):
+            return self.name
+
+    def __init__(
+        self,
+        kind: Kind,
+        event: Hashable,
+        runner: Hashable | None = None,
+        *,
+        sp: Odds | None = None,
+        rf: int | Decimal = 0,
+    ) -> None:
+        """Initialises a result event
+
+        :param kind: The kind of event
+        :type kind: ResultEvent.Kind
+        :param event: The event, e.g. race, the result relates to
+        :type event: Hashable
+        :param runner: The runner the result relates to, if any
+        :type runner: Hashable, optional
+        :param sp: The starting price of the runner, for price events
+        :type sp: Odds, optional
+        :param rf: The reduction factor, for deduction events
+        :type rf: int | Decimal, optional
+        """
+        self.kind = kind
+        self.event = event
+        self.runner = runner
+        self.sp = sp
+        self.rf = rf
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.kind}, {self.event!r}, {self.runner!r})"
+        )
+
+    @classmethod
+    def price(cls, event: Hashable, runner: Hashable, sp: Odds) -> ResultEvent:
+        """Creates an event giving the starting price of a runner
+
+        :return: A price event
+        :rtype: ResultEvent
+        """
+
+        return cls(cls.Kind.PRICE, event, runner, sp=sp)
+
+    @classmethod
+    def deduction(cls, event: Hashable, rf: int | Decimal) -> ResultEvent:
+        """Creates an event giving a Rule 4 deduction for an event
+
+        :return: A deduction event
+        :rtype: ResultEvent
+        """
+
+        return cls(cls.Kind.DEDUCTION, event, rf=rf)
+
+    @classmethod
+    def void(cls, event: Hashable, runner: Hashable | None = None) -> ResultEvent:
+        """Creates an event voiding bets on a runner, e.g. a non-runner, or on the whole event if no runner is given
+
+        :return: A void event
+        :rtype: ResultEvent
+        """
+
+        return cls(cls.Kind.VOID, event, runner)
+
+    @classmethod
+    def result(cls, event: Hashable) -> ResultEvent:
+        """Creates an event signalling that an event is over and its bets can be settled
+
+        :return: A result event
+        :rtype: ResultEvent
+        """
+
+        return cls(cls.Kind.RESULT, event)
+
+
+class SettlementRecord(NamedTuple):
+    """The settlement of a bet as emitted by a SettlementPipeline"""
+
+    bet: Bet
+    event: Hashable
+    runner: Hashable
+    status: Bet.Status
+    returns: Decimal
+
+
+class SettlementSink(Protocol):
+    """A destination for settlement records, e.g. a database or message queue"""
+
+    async def write(self, record: SettlementRecord) -> None: ...
+
+
+class MemorySink:
+    """An in-memory settlement sink, e.g. for testing
+
+    Attributes:
+        records: The settlement records written to the sink, in the order written.
+    """
+
+    def __init__(self) -> None:
+        self.records: list[SettlementRecord] = []
+
+    async def write(self, record: SettlementRecord) -> None:
+        self.records.append(record)
+
+
+class SettlementPipeline:
+    """A pipeline that settles registered bets as result events arrive, writing settlement records
+    to a sink concurrently with bounded parallelism.
+
+    Starting prices and Rule 4 deductions are held until the event's result arrives, at which point every
+    bet on the event is settled with its runner's starting price and the event's total deduction.
+    Bets that cannot be settled when their event's result arrives, e.g. multiples with legs yet to run
+    or SP bets without a starting price, remain registered along with the event's prices and deductions,
+    which are discarded once the event has no bets left. They are checked again when their runner's
+    starting price arrives, or when any other event they were registered as depending on is resulted
+    or voided. Any other error settling a bet stops the pipeline.
+
+    Example:
+        >>> sink = MemorySink()
+        >>> pipeline = SettlementPipeline(sink, concurrency=16)
+        >>> pipeline.register(bet, '2:30 Ascot', 'Frankel')
+        >>> pipeline.register(double, '2:30 Ascot', 'Frankel', depends=['3:05 York'])
+        >>> await pipeline.run(events)
+    """
+
+    def __init__(
+        self, sink: SettlementSink, *, concurrency: int = 8, queue_size: int = 1000
+    ) -> None:
+        """Initialises a settlement pipeline
+
+        :param sink: The sink to write settlement records to
+        :type sink: SettlementSink
+        :param concurrency: The maximum number of settlements in progress at once, defaults to 8
+        :type concurrency: int, optional
+        :param queue_size: The maximum number of settlements waiting, beyond which events are not consumed, defaults to 1000
+        :type queue_size: int, optional
+        :raises ValueError: If concurrency or queue size is less than 1
+        """
+        if concurrency < 1 or queue_size < 1:
+            raise ValueError("Concurrency and queue size must be at least 1")
+
+        self.sink = sink
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self._bets: dict[Hashable, dict[Hashable, list[Bet]]] = {}
+        self._sps: dict[Hashable, dict[Hashable, Odds]] = {}
+        self._deductions: dict[Hashable, Decimal] = {}
+        self._dependents: dict[Hashable, set[Hashable]] = {}
+        self._finished: set[Hashable] = set()
+
+    @property
+    def open_bets(self) -> int:
+        """The number of registered bets awaiting settlement
+
+        :return: The number of open bets
+        :rtype: int
+        """
+
+        return sum(
+            len(bets) for runners in self._bets.values() for bets in runners.values()
+        )
+
+    def register(
+        self,
+        bet: Bet,
+        event: Hashable,
+        runner: Hashable,
+        *,
+        depends: Iterable[Hashable] = (),
+    ) -> None:
+        """Registers a bet to be settled when its event's result arrives
+
+        :param bet: The bet to settle
+        :type bet: Bet
+        :param event: The event the bet is on, whose starting prices and deductions it is settled with
+        :type event: Hashable
+        :param runner: The runner the bet is on
+        :type runner: Hashable
+        :param depends: Any other events the bet depends on, e.g. the events of a multiple's other legs
+        :type depends: Iterable[Hashable], optional
+        """
+
+        self._bets.setdefault(event, {}).setdefault(runner, []).append(bet)
+        for other in depends:
+            self._dependents.setdefault(other, set()).add(event)
+
+    async def run(self, events: AsyncIterable[ResultEvent]) -> None:
+        """Consumes result events, settling affected bets, until the events are exhausted
+        and all settlements have been written
+
+        :param events: The result events
+        :type events: AsyncIterable[ResultEvent]
+        :raises ValueError: If a bet cannot be settled, e.g. the event's deductions total 100 or more
+        :raises Exception: Any exception raised by the sink
+        """
+        queue: asyncio.Queue[_Job] = asyncio.Queue(self.queue_size)
+        errors: list[BaseException] = []
+        workers = [
+            asyncio.create_task(self._work(queue, errors))
+            for _ in range(self.concurrency)
+        ]
+
+        try:
+            async for result in events:
+                if errors:
+                    break
+                for job in self._jobs(result):
+                    await queue.put(job)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+
+    def _jobs(self, result: ResultEvent) -> list[_Job]:
+        event = result.event
+        if result.kind == ResultEvent.Kind.PRICE:
+            assert result.sp is not None
+            self._sps.setdefault(event, {})[result.runner] = result.sp
+            if event not in self._finished:
+                return []
+            return self._settle(event, [result.runner])
+
+        if result.kind == ResultEvent.Kind.DEDUCTION:
+            rf = self._deductions.get(event, Decimal(0)) + Decimal(result.rf)
+            self._deductions[event] = rf
+            return []
+
+        void = result.kind == ResultEvent.Kind.VOID
+        over = not void or result.runner is None
+        if over:
+            self._finished.add(event)
+            jobs = self._settle(event, list(self._bets.get(event, {})), void=void)
+        else:
+            jobs = self._settle(event, [result.runner], void=True)
+
+        dependents = self._dependents.pop if over else self._dependents.get
+        for dependent in dependents(event, set()) - {event}:
+            if dependent in self._finished:
+                jobs += self._settle(dependent, list(self._bets[dependent]))
+
+        return jobs
+
+    def _settle(
+        self, event: Hashable, affected: list[Hashable], *, void: bool = False
+    ) -> list[_Job]:
+        """Takes the bets on the given runners of an event that can now be settled, leaving the rest registered"""
+        runners = self._bets.get(event, {})
+        rf = self._deductions.get(event, Decimal(0))
+        sps = self._sps.get(event, {})
+        jobs = []
+        for runner in affected:
+            waiting = []
+            for bet in runners.pop(runner, []):
+                if void:
+                    bet.void()
+                if _settleable(bet, sps.get(runner)):
+                    jobs.append((bet, event, runner, sps.get(runner), rf))
+                else:
+                    waiting.append(bet)
+            if waiting:
+                runners[runner] = waiting
+
+        if not runners:
+            self._bets.pop(event, None)
+            if event in self._finished:
+                self._finished.discard(event)
+                self._sps.pop(event, None)
+                self._deductions.pop(event, None)
+
+        return jobs
+
+    async def _work(
+        self,
+        queue: asyncio.Queue[_Job],
+        errors: list[BaseException],
+    ) -> None:
+        while True:
+            bet, event, runner, sp, rf = await queue.get()
+            try:
+                returns = bet.settle(sp=sp, rf=rf)
+                await self.sink.write(
+                    SettlementRecord(bet, event, runner, bet.status, returns)
+                )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                queue.task_done()
+
+
+def _settleable(bet: Bet, sp: Odds | None) -> bool:
+    """Whether a bet can be settled yet, i.e. it is void, or its outcome is known and it has any starting price it needs"""
+    if bet.status == Bet.Status.VOID:
+        return True
+
+    return bet.status != Bet.Status.OPEN and bool(
+        sp or (bet.odds != "SP" and not bet.bog)
+    )
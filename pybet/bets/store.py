@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from decimal import Decimal
+from math import isnan, nan
+from typing import Literal
+
+from pybet import Odds
+
+from .bet import Bet, _returns, _settlement_odds
+from .each_way import EachWay
+
+
+class BetStore:
+    """A compact store for large numbers of open single bets, holding stakes, odds, flags and status
+    in typed arrays rather than as Bet instances, with Bet-like views onto each row.
+
+    Stakes are held in whole pence and odds as floats, with SP held as NaN. As there are no callbacks,
+    the outcome of each bet is recorded with resolve rather than determined by win and end conditions.
+
+    Example:
+        >>> store = BetStore()
+        >>> bet = store.append(2.00, Odds(21))
+        >>> bet.resolve(won=True)
+        >>> bet.settle()
+        Decimal('42.00')
+    """
+
+    __slots__ = ("_bog", "_odds", "_stakes", "_status")
+
+    def __init__(self) -> None:
+        self._stakes = array("q")
+        self._odds = array("d")
+        self._bog = array("b")
+        self._status = array("b")
+
+    def __len__(self) -> int:
+        return len(self._stakes)
+
+    def __getitem__(self, index: int) -> BetView:
+        if not -len(self) <= index < len(self):
+            raise IndexError("Bet index out of range")
+
+        return BetView(self, index % len(self))
+
+    def __iter__(self) -> Iterator[BetView]:
+        return (BetView(self, index) for index in range(len(self)))
+
+    # Properties
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the arrays holding the bets
+
+        :return: The size of the store's arrays in bytes
+        :rtype: int
+        """
+
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._stakes, self._odds, self._bog, self._status)
+        )
+
+    # Instance methods
+
+    def append(
+        self,
+        stake: float | Decimal | str,
+        odds: Odds | Literal["SP"],
+        *,
+        bog: bool = False,
+    ) -> BetView:
+        """Adds a bet to the store
+
+        :param stake: The stake of the bet, in pounds, which must be a whole number of pence
+        :type stake: Decimal
+        :param odds: The odds of the bet
+        :type odds: Odds
+        :param bog: Whether the bet is best odds guaranteed
+        :type bog: bool
+        :raises ValueError: If the odds are not an instance of Odds or 'SP'
+        :raises ValueError: If the stake is not a whole number of pence
+        :return: A view of the stored bet
+        :rtype: BetView
+        """
+        if not isinstance(odds, Odds) and odds != "SP":
+            raise ValueError("Odds must be an instance of Odds or 'SP'")
+
+        pence = Decimal(stake) * 100
+        if pence != pence.to_integral_value():
+            raise ValueError("Stake must be a whole number of pence")
+
+        self._stakes.append(int(pence))
+        self._odds.append(nan if odds == "SP" else float(odds))
+        self._bog.append(bog)
+        self._status.append(Bet.Status.OPEN.value)
+
+        return BetView(self, len(self) - 1)
+
+    def add(self, bet: Bet) -> BetView:
+        """Adds a copy of an existing single bet to the store, keeping it void if it has been voided
+
+        :param bet: The bet to add
+        :type bet: Bet
+        :raises ValueError: If the bet is an each-way bet
+        :return: A view of the stored bet
+        :rtype: BetView
+        """
+        if isinstance(bet, EachWay):
+            raise ValueError("Each-way bets are not supported")
+
+        view = self.append(bet.stake, bet.odds, bog=bet.bog)
+        if bet.status == Bet.Status.VOID:
+            view.void()
+
+        return view
+
+
+class BetView:
+    """A lightweight, Bet-like view of a single row in a BetStore"""
+
+    __slots__ = ("_index", "_store")
+
+    def __init__(self, store: BetStore, index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._index})"
+
+    # Properties
+
+    @property
+    def stake(self) -> Decimal:
+        """The stake of the bet
+
+        :return: The stake
+        :rtype: Decimal
+        """
+
+        return Decimal(self._store._stakes[self._index]).scaleb(-2)
+
+    @property
+    def odds(self) -> Odds | Literal["SP"]:
+        """The odds of the bet
+
+        :return: The odds, or 'SP'
+        :rtype: Odds | Literal['SP']
+        """
+        odds = self._store._odds[self._index]
+
+        return "SP" if isnan(odds) else Odds(repr(odds))
+
+    @property
+    def bog(self) -> bool:
+        """Whether the bet is best odds guaranteed
+
+        :return: True if the bet is BOG
+        :rtype: bool
+        """
+
+        return bool(self._store._bog[self._index])
+
+    @property
+    def status(self) -> Bet.Status:
+        """The status of the bet
+
+        :return: The status of the bet
+        :rtype: Bet.Status
+        """
+
+        return Bet.Status(self._store._status[self._index])
+
+    # Instance methods
+
+    def resolve(self, *, won: bool) -> None:
+        """Records the outcome of the bet so that it can be settled
+
+        :param won: Whether the bet has won
+        :type won: bool
+        :raises ValueError: If the bet has been voided
+        """
+        if self.status == Bet.Status.VOID:
+            raise ValueError("Cannot resolve a voided bet")
+
+        status = Bet.Status.WON if won else Bet.Status.LOST
+        self._store._status[self._index] = status.value
+
+    def settle(self, *, sp: Odds | None = None, rf: int | Decimal = 0) -> Decimal:
+        """Returns the returns of the bet, as for Bet.settle
+
+        :return: The returns of the bet to 2 decimal places
+        :rtype: Decimal
+        :raises ValueError: If the bet is still open
+        """
+        status = self.status
+        if status == Bet.Status.VOID:
+            return self.stake
+
+        if not 0 <= rf < 100:
+            raise ValueError("Reduction factor must be >= 0 and < 100")
+
+        if status == Bet.Status.OPEN:
+            raise ValueError("Bet is still open")
+
+        settlement_odds = _settlement_odds(self.odds, sp, bog=self.bog)
+
+        if status != Bet.Status.WON:
+            return Decimal(0)
+
+        return _returns(self.stake, settlement_odds, rf)
+
+    def void(self) -> None:
+        """Voids the bet.
+
+        :return: None
+        """
+        self._store._status[self._index] = Bet.Status.VOID.value
@@ -2,4 +2,5 @@ from .accumulator import Accumulator
 
 
 class Treble(Accumulator):
+    __slots__ = ()
     _selection_count_requirement = 3
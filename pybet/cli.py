@@ -0,0 +1,337 @@
+"""The pybet command line, streaming CSV or JSON lines price dumps from a file or stdin to a file or stdout.
+
+Examples:
+    pybet convert prices.csv --from fractional --to decimal
+    pybet market prices.jsonl --race race --runner horse --places 3 --jobs 4 -o places.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from decimal import Decimal
+from functools import partial
+from itertools import groupby, islice
+from operator import itemgetter
+from time import perf_counter
+from typing import IO, Any, NamedTuple
+
+from .market import Market
+from .odds import FractionalOddsSets, FractionalSet, Odds
+
+Row = dict[str, Any]
+FORMATS = ("decimal", "fractional", "moneyline", "probability", "percentage")
+
+
+class _Options(NamedTuple):
+    column: str
+    source: str
+    target: str
+    into: str
+    race: str
+    runner: str
+    margin: Decimal | None
+    places: int | None
+
+
+_fractional_set = FractionalSet(FractionalOddsSets.STANDARD)
+
+
+def parse_odds(value: str, source: str) -> Odds:
+    """Parses odds in the given format
+
+    :param value: The odds as text, e.g. '9/4'
+    :type value: str
+    :param source: The format, one of decimal, fractional, moneyline, probability or percentage
+    :type source: str
+    :raises ValueError: If the odds are not valid in the format
+    :return: The odds
+    :rtype: Odds
+    """
+    try:
+        if source == "fractional":
+            return Odds.fractional(value)
+        if source == "moneyline":
+            return Odds.moneyline(value)
+        if source == "probability":
+            return Odds.probability(Decimal(value))
+        if source == "percentage":
+            return Odds.percentage(Decimal(value))
+        return Odds(value)
+    except (ArithmeticError, ValueError) as error:
+        raise ValueError(f"invalid {source} odds {value!r}") from error
+
+
+def format_odds(odds: Odds, target: str) -> str:
+    """Formats odds in the given format, using the standard fractional set for fractional odds
+
+    :param odds: The odds
+    :type odds: Odds
+    :param target: The format, one of decimal, fractional, moneyline, probability or percentage
+    :type target: str
+    :return: The odds as text
+    :rtype: str
+    """
+    if target == "fractional":
+        return _fractional_set.nearest(odds)
+    if target == "moneyline":
+        return odds.to_moneyline()
+    if target == "probability":
+        return f"{odds.to_probability():.6f}"
+    if target == "percentage":
+        return f"{odds.to_percentage():.4f}"
+    return str(odds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Runs the pybet command line
+
+    :param argv: The arguments, defaults to those the program was run with
+    :type argv: list[str], optional
+    :return: The exit status
+    :rtype: int
+    """
+    args = _parser().parse_args(argv)
+    options = _Options(
+        args.column,
+        args.source,
+        args.target,
+        args.into or (args.column if args.command == "convert" else "price"),
+        getattr(args, "race", ""),
+        getattr(args, "runner", ""),
+        getattr(args, "margin", None),
+        getattr(args, "places", None),
+    )
+    text_format = args.format or (
+        "jsonl" if str(args.input).endswith((".jsonl", ".json")) else "csv"
+    )
+
+    start = perf_counter()
+    source = sys.stdin if args.input == "-" else open(args.input, newline="")  # noqa: SIM115
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="")  # noqa: SIM115
+    try:
+        required = [args.column]
+        if args.command == "market":
+            required += [args.race, args.runner]
+        rows = _require(_read(source, text_format), required)
+        if args.command == "convert":
+            chunks: Iterator[list[Row]] = _chunks(rows, args.chunk_size)
+            work: Callable[[list[Any]], list[Row]] = partial(_convert, options)
+        else:
+            races = (list(race) for _, race in groupby(rows, key=itemgetter(args.race)))
+            chunks = _chunks(races, max(1, args.chunk_size // 10))
+            work = partial(_markets, options)
+
+        count = _write(target, text_format, _map(work, chunks, args.jobs))
+    except KeyError as error:
+        print(f"pybet: error: missing column {error}", file=sys.stderr)
+        return 1
+    except ValueError as error:
+        print(f"pybet: error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    seconds = perf_counter() - start
+    print(
+        f"pybet: {count:,} rows in {seconds:.2f}s ({count / max(seconds, 1e-9):,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pybet", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser(
+        "convert", help="convert an odds column between formats"
+    )
+    market = commands.add_parser(
+        "market",
+        help="group rows into a market per race and output its percentage or adjusted prices",
+    )
+    for command in (convert, market):
+        command.add_argument(
+            "input", nargs="?", default="-", help="input file, defaults to stdin"
+        )
+        command.add_argument(
+            "-o", "--output", default="-", help="output file, defaults to stdout"
+        )
+        command.add_argument(
+            "--format",
+            choices=("csv", "jsonl"),
+            help="input and output format, defaults to csv unless the input is .jsonl",
+        )
+        command.add_argument(
+            "--column", default="odds", help="the odds column, defaults to odds"
+        )
+        command.add_argument(
+            "--from",
+            dest="source",
+            choices=FORMATS,
+            default="decimal",
+            help="the format of the odds column",
+        )
+        command.add_argument(
+            "--to",
+            dest="target",
+            choices=FORMATS,
+            default="decimal",
+            help="the format of output odds",
+        )
+        command.add_argument(
+            "--into",
+            help="the output column, defaults to the odds column for convert and price for market",
+        )
+        command.add_argument(
+            "--jobs", type=int, default=1, help="worker processes, defaults to 1"
+        )
+        command.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="rows per unit of work, defaults to 10,000",
+        )
+
+    market.add_argument(
+        "--race",
+        default="race",
+        help="the race column, defaults to race, with each race's rows consecutive",
+    )
+    market.add_argument(
+        "--runner", default="runner", help="the runner column, defaults to runner"
+    )
+    adjustment = market.add_mutually_exclusive_group()
+    adjustment.add_argument(
+        "--margin", type=Decimal, help="output prices with this margin applied"
+    )
+    adjustment.add_argument(
+        "--places", type=int, help="output prices derived for this many places"
+    )
+
+    return parser
+
+
+def _read(source: IO[str], text_format: str) -> Iterator[Row]:
+    if text_format == "csv":
+        yield from csv.DictReader(source)
+    else:
+        yield from (json.loads(line) for line in source if line.strip())
+
+
+def _require(rows: Iterator[Row], columns: list[str]) -> Iterator[Row]:
+    """Checks the first row, i.e. the header of CSV input, has the columns needed before passing on the rows"""
+    first = next(rows, None)
+    if first is None:
+        return
+
+    if missing := [column for column in columns if column not in first]:
+        raise ValueError(f"missing column {', '.join(map(repr, missing))}")
+
+    yield first
+    yield from rows
+
+
+def _write(target: IO[str], text_format: str, chunks: Iterable[list[Row]]) -> int:
+    count = 0
+    writer = None
+    for chunk in chunks:
+        if text_format == "jsonl":
+            target.writelines(json.dumps(row) + "\n" for row in chunk)
+        else:
+            if writer is None and chunk:
+                writer = csv.DictWriter(target, fieldnames=list(chunk[0]))
+                writer.writeheader()
+            if writer is not None:
+                writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _map(
+    work: Callable[[list[Any]], list[Row]], chunks: Iterator[list[Any]], jobs: int
+) -> Iterator[list[Row]]:
+    """Applies work to each chunk in order, across processes if jobs > 1, with at most two chunks per process in flight"""
+    if jobs <= 1:
+        yield from map(work, chunks)
+        return
+
+    with ProcessPoolExecutor(jobs) as pool:
+        pending: deque[Future[list[Row]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(work, chunk))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _convert(options: _Options, rows: list[Row]) -> list[Row]:
+    """Converts the odds in each row, giving every row the output column so CSV output has the same columns"""
+    for row in rows:
+        if value := row.get(options.column):
+            row[options.into] = format_odds(
+                parse_odds(str(value), options.source), options.target
+            )
+        else:
+            row.setdefault(options.into, "")
+    return rows
+
+
+def _markets(options: _Options, races: list[list[Row]]) -> list[Row]:
+    output = []
+    for rows in races:
+        try:
+            market = Market(
+                {
+                    row[options.runner]: parse_odds(
+                        str(row[options.column]), options.source
+                    )
+                    for row in rows
+                }
+            )
+        except ValueError as error:
+            raise ValueError(f"race {rows[0][options.race]}: {error}") from error
+        if options.margin is None and options.places is None:
+            output.append(
+                {
+                    options.race: rows[0][options.race],
+                    "percentage": f"{market.percentage:.4f}",
+                }
+            )
+            continue
+
+        try:
+            adjusted = (
+                market.apply_margin(options.margin)
+                if options.margin is not None
+                else market.derive(options.places or 1)
+            )
+        except ValueError as error:
+            raise ValueError(f"race {rows[0][options.race]}: {error}") from error
+
+        for row in rows:
+            row[options.into] = format_odds(
+                adjusted[row[options.runner]], options.target
+            )
+        output.extend(rows)
+    return output
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+"""Differential testing of fast engines against pybet's reference implementations.
+
+Each operation, e.g. Market.derive, has a reference implementation, a generator of random inputs and a way
+to shrink an input to simpler ones. Fast variants are registered against an operation and run on the same
+inputs as its reference, and must give the same result, within the variant's tolerance, or raise the same
+type of exception. The first input on which a variant disagrees is shrunk to a minimal counterexample, and
+the time each variant takes relative to the reference is recorded, so correctness and speedup are tracked
+together as engines are added.
+
+Three variants are registered out of the box. Looking odds up in a prebuilt FractionalSet is faster than
+Odds.to_fractional. Settling through a BetStore and staking through kelly_array are slower than Bet.settle
+and kelly, since one call per input pays for the setup their bulk use amortises. They are checked for
+agreement only, and their reports show them as slower.
+
+Run every check from the repository root with: python -m pybet.differential [cases] [seed]
+
+Example:
+    >>> register('Market.derive', 'fast derive', fast_derive, tolerance=1e-9)
+    >>> [report] = check(['Market.derive'], cases=500, seed=1)
+    >>> report.failures, report.counterexample
+    (0, None)
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from copy import deepcopy
+from decimal import Decimal
+from math import inf
+from time import perf_counter
+from typing import Any, NamedTuple
+
+from .bets import Bet, BetStore
+from .market import Market
+from .odds import FractionalOddsSets, FractionalSet, Odds
+from .staking import kelly, kelly_array
+
+Case = tuple[Any, ...]
+
+
+class VariantReport(NamedTuple):
+    """The outcome of checking one variant of an operation against its reference"""
+
+    operation: str
+    variant: str
+    cases: int
+    failures: int
+    max_error: float
+    speedup: float
+    counterexample: Case | None
+
+
+class _Operation:
+    def __init__(
+        self,
+        reference: Callable[..., Any],
+        generate: Callable[[random.Random], Case],
+        shrink: Callable[[Case], Iterator[Case]],
+    ) -> None:
+        self.reference = reference
+        self.generate = generate
+        self.shrink = shrink
+        self.variants: dict[str, tuple[Callable[..., Any], float]] = {}
+
+
+_operations: dict[str, _Operation] = {}
+
+
+def define(
+    operation: str,
+    reference: Callable[..., Any],
+    generate: Callable[[random.Random], Case],
+    shrink: Callable[[Case], Iterator[Case]],
+) -> None:
+    """Defines an operation by its reference implementation, how to generate its inputs and how to shrink them
+
+    :param operation: The name of the operation, e.g. 'Market.derive'
+    :type operation: str
+    :param reference: The reference implementation, called with the items of each input
+    :type reference: Callable[..., Any]
+    :param generate: A function returning a random input from a random number generator
+    :type generate: Callable[[random.Random], tuple]
+    :param shrink: A function yielding simpler versions of an input
+    :type shrink: Callable[[tuple], Iterator[tuple]]
+    """
+
+    _operations[operation] = _Operation(reference, generate, shrink)
+
+
+def register(
+    operation: str, name: str, function: Callable[..., Any], *, tolerance: float = 0
+) -> None:
+    """Registers a fast variant of an operation, called with the same arguments as its reference
+
+    :param operation: The name of the operation, e.g. 'Market.derive'
+    :type operation: str
+    :param name: The name of the variant
+    :type name: str
+    :param function: The variant
+    :type function: Callable[..., Any]
+    :param tolerance: The largest relative difference from the reference allowed in any number, defaults to 0
+    :type tolerance: float, optional
+    :raises ValueError: If the operation is not defined
+    """
+    if operation not in _operations:
+        raise ValueError(f"Unknown operation: {operation}")
+
+    _operations[operation].variants[name] = (function, tolerance)
+
+
+def unregister(operation: str, name: str) -> None:
+    """Removes a registered variant of an operation
+
+    :param operation: The name of the operation
+    :type operation: str
+    :param name: The name of the variant
+    :type name: str
+    """
+
+    _operations[operation].variants.pop(name, None)
+
+
+def check(
+    operations: Iterable[str] | None = None,
+    *,
+    cases: int = 200,
+    seed: int | None = None,
+) -> list[VariantReport]:
+    """Runs every variant of the given operations, or of all operations, against its reference on random inputs
+
+    :param operations: The names of the operations to check, defaults to all
+    :type operations: Iterable[str], optional
+    :param cases: The number of random inputs per operation, defaults to 200
+    :type cases: int, optional
+    :param seed: A seed for generating inputs, defaults to None
+    :type seed: int, optional
+    :raises ValueError: If an operation is not defined
+    :return: A report for each variant
+    :rtype: list[VariantReport]
+    """
+    names = list(_operations) if operations is None else list(operations)
+    if unknown := set(names) - set(_operations):
+        raise ValueError(f"Unknown operations: {unknown}")
+
+    rng = random.Random(seed)
+    reports = []
+    for name in names:
+        operation = _operations[name]
+        inputs = [operation.generate(rng) for _ in range(cases)]
+        for variant, (function, tolerance) in operation.variants.items():
+            reports.append(
+                _check(name, variant, operation, function, tolerance, inputs)
+            )
+
+    return reports
+
+
+def _check(
+    name: str,
+    variant: str,
+    operation: _Operation,
+    function: Callable[..., Any],
+    tolerance: float,
+    inputs: list[Case],
+) -> VariantReport:
+    reference_seconds = variant_seconds = 0.0
+    failures = 0
+    max_error = 0.0
+    first_failure = None
+    for case in inputs:
+        expected, seconds = _timed(operation.reference, case)
+        reference_seconds += seconds
+        actual, seconds = _timed(function, case)
+        variant_seconds += seconds
+
+        error = _difference(expected, actual)
+        max_error = max(max_error, error)
+        if error > tolerance:
+            failures += 1
+            first_failure = first_failure or case
+
+    counterexample = (
+        None
+        if first_failure is None
+        else _shrink(operation, function, tolerance, first_failure)
+    )
+    return VariantReport(
+        name,
+        variant,
+        len(inputs),
+        failures,
+        max_error,
+        reference_seconds / variant_seconds if variant_seconds else inf,
+        counterexample,
+    )
+
+
+def _timed(function: Callable[..., Any], case: Case) -> tuple[Any, float]:
+    """Calls a function with a copy of an input, so that neither the reference nor a variant sees the other's
+    changes to it, returning the result, or the exception raised, and the time taken"""
+    arguments = deepcopy(case)
+    start = perf_counter()
+    try:
+        result = function(*arguments)
+    except Exception as error:
+        result = error
+    return result, perf_counter() - start
+
+
+def _fails(
+    operation: _Operation, function: Callable[..., Any], tolerance: float, case: Case
+) -> bool:
+    expected, _ = _timed(operation.reference, case)
+    actual, _ = _timed(function, case)
+    return _difference(expected, actual) > tolerance
+
+
+def _shrink(
+    operation: _Operation, function: Callable[..., Any], tolerance: float, case: Case
+) -> Case:
+    """Repeatedly replaces a failing input with the first simpler version of it that still fails"""
+    shrinking = True
+    while shrinking:
+        shrinking = False
+        for candidate in operation.shrink(case):
+            if _fails(operation, function, tolerance, candidate):
+                case, shrinking = candidate, True
+                break
+    return case
+
+
+def _difference(expected: Any, actual: Any) -> float:
+    """The largest relative difference between two results, which is infinite if they differ in kind"""
+    if isinstance(expected, Exception) or isinstance(actual, Exception):
+        return 0.0 if type(expected) is type(actual) else inf
+
+    if isinstance(expected, Mapping) and isinstance(actual, Mapping):
+        if expected.keys() != actual.keys():
+            return inf
+        return max((_difference(expected[k], actual[k]) for k in expected), default=0.0)
+
+    if isinstance(expected, float | Decimal) and isinstance(actual, float | Decimal):
+        difference = abs(float(expected) - float(actual))
+        return difference / max(abs(float(expected)), 1.0)
+
+    return 0.0 if expected == actual else inf
+
+
+# Market.derive
+
+
+def _generate_market(rng: random.Random) -> Case:
+    runners = rng.randint(3, 7)
+    market = Market(
+        {f"runner {i}": Odds(f"{rng.uniform(1.1, 30):.2f}") for i in range(runners)}
+    )
+    return (market, rng.randint(2, min(3, runners - 1)))
+
+
+def _shrink_market(case: Case) -> Iterator[Case]:
+    market, places = case
+    if places > 2:
+        yield (market, places - 1)
+    if len(market) > places + 1:
+        for runner in market:
+            yield (market.without([runner]), places)
+    for runner, odds in market.items():
+        simpler = Odds(round(odds)) if round(odds) > 1 else Odds(2)
+        if simpler != odds:
+            yield (Market({**market, runner: simpler}), places)
+
+
+# Bet.settle
+
+
+def _generate_bet(rng: random.Random) -> Case:
+    stake = Decimal(rng.randint(1, 10_000)).scaleb(-2)
+    odds = "SP" if rng.random() < 0.2 else Odds(f"{rng.uniform(1.01, 100):.2f}")
+    sp = Odds(f"{rng.uniform(1.01, 100):.2f}") if rng.random() < 0.6 else None
+    rf = rng.choice([0, 0, 0, 5, 25, Decimal("12.5")])
+    return (stake, odds, rng.random() < 0.5, sp, rf, rng.random() < 0.3)
+
+
+def _shrink_bet(case: Case) -> Iterator[Case]:
+    stake, odds, won, sp, rf, bog = case
+    if stake != 1:
+        yield (Decimal(1), odds, won, sp, rf, bog)
+    if odds != "SP" and odds != round(odds):
+        yield (stake, Odds(max(round(odds), 2)), won, sp, rf, bog)
+    if sp is not None:
+        yield (stake, odds, won, None, rf, bog)
+    if rf:
+        yield (stake, odds, won, sp, 0, bog)
+    if bog:
+        yield (stake, odds, won, sp, rf, False)
+
+
+def _settle(
+    stake: Decimal,
+    odds: Odds,
+    won: bool,  # noqa: FBT001
+    sp: Odds | None,
+    rf: Decimal,
+    bog: bool,  # noqa: FBT001
+) -> Decimal:
+    return Bet(stake, odds, lambda: won, bog=bog).settle(sp=sp, rf=rf)
+
+
+def _settle_store(
+    stake: Decimal,
+    odds: Odds,
+    won: bool,  # noqa: FBT001
+    sp: Odds | None,
+    rf: Decimal,
+    bog: bool,  # noqa: FBT001
+) -> Decimal:
+    view = BetStore().append(stake, odds, bog=bog)
+    view.resolve(won=won)
+    return view.settle(sp=sp, rf=rf)
+
+
+# Odds.to_fractional
+
+
+def _generate_fractional(rng: random.Random) -> Case:
+    fractional_set = rng.sample(FractionalOddsSets.STANDARD, rng.randint(1, 20))
+    return _fractional_case(Odds(f"{rng.uniform(1.01, 200):.2f}"), fractional_set)
+
+
+def _fractional_case(odds: Odds, fractional_set: Iterable[str]) -> Case:
+    """An input for Odds.to_fractional, carrying the set compiled in advance so only its lookup is timed"""
+    fractional_set = tuple(fractional_set)
+    return (odds, fractional_set, FractionalSet(fractional_set))
+
+
+def _shrink_fractional(case: Case) -> Iterator[Case]:
+    odds, fractional_set, _ = case
+    if odds != round(odds, 1):
+        yield _fractional_case(Odds(round(odds, 1)), fractional_set)
+    for i in range(len(fractional_set) if len(fractional_set) > 1 else 0):
+        yield _fractional_case(odds, fractional_set[:i] + fractional_set[i + 1 :])
+
+
+def _to_fractional(
+    odds: Odds, fractional_set: tuple[str, ...], compiled: FractionalSet
+) -> str:
+    return odds.to_fractional(list(fractional_set), "/")
+
+
+def _nearest_fraction(
+    odds: Odds, fractional_set: tuple[str, ...], compiled: FractionalSet
+) -> str:
+    return compiled.nearest(odds)
+
+
+# kelly
+
+
+def _generate_kelly(rng: random.Random) -> Case:
+    true_odds = Odds(f"{rng.uniform(1.01, 20):.2f}")
+    market_odds = Odds(f"{float(true_odds) * rng.uniform(0.8, 1.5):.2f}")
+    bank = Decimal(rng.randint(1, 100_000)).scaleb(-2)
+    return (true_odds, market_odds, bank, rng.choice([0, 0, 2, 5]))
+
+
+def _shrink_kelly(case: Case) -> Iterator[Case]:
+    true_odds, market_odds, bank, commission = case
+    if commission:
+        yield (true_odds, market_odds, bank, 0)
+    if bank != 100:
+        yield (true_odds, market_odds, Decimal(100), commission)
+    if true_odds != round(true_odds, 1):
+        yield (Odds(round(true_odds, 1)), market_odds, bank, commission)
+    if market_odds != round(market_odds, 1):
+        yield (true_odds, Odds(round(market_odds, 1)), bank, commission)
+
+
+def _kelly_array(
+    true_odds: Odds, market_odds: Odds, bank: Decimal, commission: Decimal
+) -> Decimal:
+    return kelly_array([true_odds], [market_odds], bank, commission)[0]
+
+
+define("Market.derive", Market.derive, _generate_market, _shrink_market)
+define("Bet.settle", _settle, _generate_bet, _shrink_bet)
+define("Odds.to_fractional", _to_fractional, _generate_fractional, _shrink_fractional)
+define("kelly", kelly, _generate_kelly, _shrink_kelly)
+
+register("Bet.settle", "BetStore", _settle_store)
+register("Odds.to_fractional", "compiled fractional set", _nearest_fraction)
+register("kelly", "kelly_array", _kelly_array)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Checks every variant, printing a line for each and any counterexample
+
+    :param argv: The number of cases per operation and a seed, defaults to those the program was run with
+    :type argv: list[str], optional
+    :return: The exit status, 1 if any variant failed
+    :rtype: int
+    """
+    args = sys.argv[1:] if argv is None else argv
+    cases = int(args[0]) if args else 1000
+    seed = int(args[1]) if len(args) > 1 else None
+    reports = check(cases=cases, seed=seed)
+    for report in reports:
+        speed = (
+            f"{report.speedup:6.2f}x faster"
+            if report.speedup >= 1
+            else f"{1 / report.speedup:6.2f}x slower"
+        )
+        print(
+            f"{report.operation:<20} {report.variant:<26} {report.cases:>6} cases"
+            f" {report.failures:>6} failures  max error {report.max_error:<8.2g}"
+            f" {speed}"
+        )
+        if report.counterexample is not None:
+            print(f"    counterexample: {report.counterexample!r}")
+    return 1 if any(r.failures for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
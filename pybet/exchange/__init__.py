@@ -0,0 +1,19 @@
+from .book import Exchange, Fill, OrderBook, Side
+from .hedging import Hedge, Position, hedge, hedge_many
+from .ladder import TICKS, offset, snap, tick_index, ticks_between
+
+__all__ = [
+    "TICKS",
+    "Exchange",
+    "Fill",
+    "Hedge",
+    "OrderBook",
+    "Position",
+    "Side",
+    "hedge",
+    "hedge_many",
+    "offset",
+    "snap",
+    "tick_index",
+    "ticks_between",
+]
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Hashable, Iterable
+from decimal import Decimal
+from enum import Enum
+from itertools import count
+from typing import Any, NamedTuple
+
+from ..market import Market
+from ..odds import Odds
+from .ladder import TICKS, tick_index
+
+_Queues = dict[int, deque[list[Any]]]
+
+
+class Side(Enum):
+    """The side of an exchange order, backing a runner to win or laying it"""
+
+    BACK = 1
+    LAY = 2
+
+    def __str__(self):
+        return self.name
+
+
+class Fill(NamedTuple):
+    """A match between an incoming order and an order resting in the book, at the resting order's price"""
+
+    taker: int
+    maker: int
+    odds: Odds
+    size: Decimal
+
+
+class OrderBook:
+    """The unmatched back and lay orders on one runner, held at prices on the tick ladder and matched in price then
+    time priority, i.e. at the best price first and, at the same price, in the order placed.
+
+    A back order matches resting lay orders at its price or longer, and a lay order matches resting back orders
+    at its price or shorter, and any part left unmatched rests in the book. Each side's price levels are held in
+    arrays indexed by tick, with a bit per non-empty level, so the best price is found in constant time. Sizes are
+    held in whole pence, and cancelled orders are dropped from their level's queue when next reached.
+
+    Example:
+        >>> book = OrderBook()
+        >>> book.place(Side.LAY, Odds(3), 10)
+        (1, [])
+        >>> book.place(Side.BACK, Odds('2.9'), 25)
+        (2, [Fill(taker=2, maker=1, odds=Odds('3.00'), size=Decimal('10.00'))])
+        >>> book.best_lay
+        Odds('2.90')
+    """
+
+    def __init__(self) -> None:
+        self._orders: dict[int, list[Any]] = {}
+        self._queues: tuple[_Queues, _Queues] = ({}, {})
+        self._volumes = ([0] * len(TICKS), [0] * len(TICKS))
+        self._levels = [0, 0]
+        self._ids = count(1)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._orders
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # Properties
+
+    @property
+    def best_back(self) -> Odds | None:
+        """The best price available to back, i.e. the longest price of the resting lay orders
+
+        :return: The best price available to back, or None if there are no lay orders
+        :rtype: Odds, optional
+        """
+        levels = self._levels[Side.LAY.value - 1]
+
+        return TICKS[levels.bit_length() - 1] if levels else None
+
+    @property
+    def best_lay(self) -> Odds | None:
+        """The best price available to lay, i.e. the shortest price of the resting back orders
+
+        :return: The best price available to lay, or None if there are no back orders
+        :rtype: Odds, optional
+        """
+        levels = self._levels[Side.BACK.value - 1]
+
+        return TICKS[(levels & -levels).bit_length() - 1] if levels else None
+
+    # Instance methods
+
+    def place(
+        self,
+        side: Side,
+        odds: Decimal | float,
+        size: Decimal | float | str,
+        *,
+        order_id: int | None = None,
+        persist: bool = True,
+    ) -> tuple[int, list[Fill]]:
+        """Places an order, matching as much of it as possible against resting orders
+
+        :param side: Whether to back or lay
+        :type side: Side
+        :param odds: The price, which must be on the tick ladder
+        :type odds: Decimal
+        :param size: The backer's stake, in pounds, rounded to the nearest penny
+        :type size: Decimal
+        :param order_id: An id for the order, e.g. from historical data, defaults to the next unused in sequence
+        :type order_id: int, optional
+        :param persist: Whether any unmatched part rests in the book rather than lapsing, defaults to True
+        :type persist: bool, optional
+        :raises ValueError: If the price is not on the ladder or the size is not positive
+        :raises ValueError: If the order id is already in the book
+        :return: The order's id and its fills
+        :rtype: tuple[int, list[Fill]]
+        """
+        tick = tick_index(odds)
+        remaining = round(float(size) * 100)
+        if remaining <= 0:
+            raise ValueError("Size must be positive")
+
+        if order_id is None:
+            order_id = next(i for i in self._ids if i not in self._orders)
+        elif order_id in self._orders:
+            raise ValueError(f"Order {order_id} is already in the book")
+
+        fills: list[Fill] = []
+        remaining = self._match(order_id, side, tick, remaining, fills)
+        if remaining and persist:
+            own = side.value - 1
+            order = [own, tick, remaining, order_id]
+            self._orders[order_id] = order
+            self._queues[own].setdefault(tick, deque()).append(order)
+            self._volumes[own][tick] += remaining
+            self._levels[own] |= 1 << tick
+
+        return order_id, fills
+
+    def cancel(self, order_id: int, size: Decimal | float | None = None) -> Decimal:
+        """Cancels all of an order's unmatched size, or reduces it by the given size
+
+        :param order_id: The order's id
+        :type order_id: int
+        :param size: The size to cancel, defaults to all of it
+        :type size: Decimal, optional
+        :raises ValueError: If the size is not positive
+        :return: The size cancelled, which is zero if the order is no longer in the book
+        :rtype: Decimal
+        """
+        reduction = None if size is None else round(float(size) * 100)
+        if reduction is not None and reduction <= 0:
+            raise ValueError("Size must be positive")
+
+        order = self._orders.get(order_id)
+        if order is None:
+            return Decimal("0.00")
+
+        own, tick, remaining, _ = order
+        cancelled = remaining if reduction is None else min(reduction, remaining)
+        order[2] -= cancelled
+        self._volumes[own][tick] -= cancelled
+        if not order[2]:
+            del self._orders[order_id]
+        if not self._volumes[own][tick]:
+            del self._queues[own][tick]
+            self._levels[own] &= ~(1 << tick)
+
+        return Decimal(cancelled).scaleb(-2)
+
+    def remaining(self, order_id: int) -> Decimal:
+        """Returns the unmatched size of an order
+
+        :param order_id: The order's id
+        :type order_id: int
+        :return: The unmatched size, which is zero if the order is no longer in the book
+        :rtype: Decimal
+        """
+        order = self._orders.get(order_id)
+
+        return Decimal(order[2] if order else 0).scaleb(-2)
+
+    def depth(self, side: Side, levels: int = 3) -> list[tuple[Odds, Decimal]]:
+        """Returns the best prices available to back or lay with the size available at each
+
+        :param side: Whether the prices are to back, from resting lay orders, or to lay, from resting back orders
+        :type side: Side
+        :param levels: The most prices to return, defaults to 3
+        :type levels: int, optional
+        :return: Each price, best first, and the size available at it
+        :rtype: list[tuple[Odds, Decimal]]
+        """
+        resting = (Side.LAY if side == Side.BACK else Side.BACK).value - 1
+        ticks = sorted(self._queues[resting], reverse=side == Side.BACK)[:levels]
+
+        return [
+            (TICKS[tick], Decimal(self._volumes[resting][tick]).scaleb(-2))
+            for tick in ticks
+        ]
+
+    def _match(
+        self, taker: int, side: Side, tick: int, remaining: int, fills: list[Fill]
+    ) -> int:
+        """Matches an incoming order against the opposite side while it crosses, returning its unmatched size"""
+        resting = 1 if side == Side.BACK else 0
+        queues, volumes = self._queues[resting], self._volumes[resting]
+        while remaining and (levels := self._levels[resting]):
+            if side == Side.BACK:
+                best = levels.bit_length() - 1
+                if best < tick:
+                    break
+            else:
+                best = (levels & -levels).bit_length() - 1
+                if best > tick:
+                    break
+
+            queue = queues[best]
+            while remaining and queue:
+                order = queue[0]
+                maker = order[3]
+                if self._orders.get(maker) is not order:
+                    queue.popleft()
+                    continue
+
+                size = min(order[2], remaining)
+                fills.append(Fill(taker, maker, TICKS[best], Decimal(size).scaleb(-2)))
+                order[2] -= size
+                volumes[best] -= size
+                remaining -= size
+                if not order[2]:
+                    queue.popleft()
+                    del self._orders[maker]
+
+            if not volumes[best]:
+                del queues[best]
+                self._levels[resting] &= ~(1 << best)
+
+        return remaining
+
+
+class Exchange:
+    """The order books of every runner in a market, placing and cancelling orders by market-wide order ids,
+    with views of the best prices available to back and to lay as markets.
+
+    Example:
+        >>> exchange = Exchange(['Frankel', 'Shergar'])
+        >>> exchange.place('Frankel', Side.LAY, Odds(2), 100)
+        (1, [])
+        >>> exchange.place('Shergar', Side.LAY, Odds('1.9'), 100)
+        (2, [])
+        >>> exchange.back_market()
+        {'Frankel': Odds('2.00'), 'Shergar': Odds('1.90')}
+    """
+
+    def __init__(self, runners: Iterable[Hashable]) -> None:
+        """Initialises an exchange market with an empty order book for each runner
+
+        :param runners: The runners in the market
+        :type runners: Iterable[Hashable]
+        """
+        self.books = {runner: OrderBook() for runner in runners}
+        self._runners: dict[int, Hashable] = {}
+        self._ids = count(1)
+
+    # Instance methods
+
+    def place(
+        self,
+        runner: Hashable,
+        side: Side,
+        odds: Decimal | float,
+        size: Decimal | float | str,
+        *,
+        order_id: int | None = None,
+        persist: bool = True,
+    ) -> tuple[int, list[Fill]]:
+        """Places an order on a runner, see OrderBook.place
+
+        :param runner: The runner
+        :type runner: Hashable
+        :param side: Whether to back or lay
+        :type side: Side
+        :param odds: The price, which must be on the tick ladder
+        :type odds: Decimal
+        :param size: The backer's stake, in pounds, rounded to the nearest penny
+        :type size: Decimal
+        :param order_id: An id for the order, e.g. from historical data, defaults to the next unused in sequence
+        :type order_id: int, optional
+        :param persist: Whether any unmatched part rests in the book rather than lapsing, defaults to True
+        :type persist: bool, optional
+        :raises ValueError: If the runner is not in the market, or the order is invalid
+        :return: The order's id and its fills
+        :rtype: tuple[int, list[Fill]]
+        """
+        if runner not in self.books:
+            raise ValueError(f"Unknown runner: {runner}")
+
+        if order_id is None:
+            order_id = next(i for i in self._ids if i not in self._runners)
+        elif order_id in self._runners:
+            raise ValueError(f"Order {order_id} is already in the market")
+
+        book = self.books[runner]
+        order_id, fills = book.place(
+            side, odds, size, order_id=order_id, persist=persist
+        )
+        if order_id in book:
+            self._runners[order_id] = runner
+        for fill in fills:
+            if fill.maker not in book:
+                self._runners.pop(fill.maker, None)
+
+        return order_id, fills
+
+    def cancel(self, order_id: int, size: Decimal | float | None = None) -> Decimal:
+        """Cancels all of an order's unmatched size, or reduces it by the given size
+
+        :param order_id: The order's id
+        :type order_id: int
+        :param size: The size to cancel, defaults to all of it
+        :type size: Decimal, optional
+        :raises ValueError: If the size is not positive
+        :return: The size cancelled, which is zero if the order is no longer in the market
+        :rtype: Decimal
+        """
+        if size is not None and round(float(size) * 100) <= 0:
+            raise ValueError("Size must be positive")
+
+        runner = self._runners.get(order_id)
+        if runner is None:
+            return Decimal("0.00")
+
+        book = self.books[runner]
+        cancelled = book.cancel(order_id, size)
+        if order_id not in book:
+            del self._runners[order_id]
+
+        return cancelled
+
+    def replay(self, instructions: Iterable[tuple[Any, ...]]) -> list[Fill]:
+        """Replays historical orders, each either ("place", order_id, runner, side, odds, size)
+        or ("cancel", order_id, size), with size None to cancel all of it
+
+        :param instructions: The orders and cancellations, in the order they were made
+        :type instructions: Iterable[tuple]
+        :raises ValueError: If an instruction is not a placement or cancellation
+        :return: Every fill, in the order matched
+        :rtype: list[Fill]
+        """
+        fills = []
+        for instruction in instructions:
+            if instruction[0] == "place":
+                _, order_id, runner, side, odds, size = instruction
+                fills.extend(self.place(runner, side, odds, size, order_id=order_id)[1])
+            elif instruction[0] == "cancel":
+                self.cancel(instruction[1], instruction[2])
+            else:
+                raise ValueError(f"Unknown instruction: {instruction[0]}")
+
+        return fills
+
+    def back_market(self) -> Market:
+        """Returns the best price available to back each runner, or None where there is none
+
+        :return: A market of the best back prices
+        :rtype: Market
+        """
+
+        return Market({runner: book.best_back for runner, book in self.books.items()})
+
+    def lay_market(self) -> Market:
+        """Returns the best price available to lay each runner, or None where there is none
+
+        :return: A market of the best lay prices
+        :rtype: Market
+        """
+
+        return Market({runner: book.best_lay for runner, book in self.books.items()})
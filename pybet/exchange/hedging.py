@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, NamedTuple
+
+from ..market import Market
+from ..odds import Odds
+from .book import Side
+from .ladder import snap
+
+
+class Position(NamedTuple):
+    """A matched back or lay bet on a runner"""
+
+    runner: Hashable
+    side: Side
+    odds: Odds
+    stake: Decimal
+
+
+class Hedge(NamedTuple):
+    """The bets that hedge a market's positions, and the profit in each outcome once they are matched
+
+    Attributes:
+        bets: The hedging bets to place.
+        profits: The profit if each runner wins, after commission, with the hedging bets matched.
+    """
+
+    bets: list[Position]
+    profits: dict[Hashable, Decimal]
+
+
+def hedge(
+    positions: Iterable[Position],
+    back_market: Market,
+    lay_market: Market | None = None,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    runners: Iterable[Hashable] | None = None,
+    targets: Mapping[Hashable, Decimal] | None = None,
+    min_stake: Decimal = Decimal(0),
+    increment: Decimal = Decimal("0.01"),
+    ladder: bool = True,
+) -> Hedge:
+    """Calculates the bets that green up a market, i.e. make the profit the same whichever runner wins.
+
+    Positions are aggregated into the profit on each runner if it wins and if it loses, and each runner is then
+    hedged on its own, by laying it if it pays more when it wins or backing it if it pays more when it loses,
+    so every runner's contribution is the same win or lose, and so therefore is the total. Chosen runners can
+    be left with a target profit when they win over when they lose, and others left unhedged. Hedge prices are
+    taken at or inside the ladder from the current prices, and stakes rounded to the increment, with any below
+    the minimum stake left unplaced, so the profits returned are those of the bets as they would be placed.
+
+    :param positions: The matched bets held in the market
+    :type positions: Iterable[Position]
+    :param back_market: The prices available to back each runner
+    :type back_market: Market
+    :param lay_market: The prices available to lay each runner, defaults to the back prices
+    :type lay_market: Market, optional
+    :param percentage_commission: The percentage commission charged on net winnings in the market
+    :type percentage_commission: Decimal
+    :param runners: The runners to hedge, defaults to all of them
+    :type runners: Iterable[Hashable], optional
+    :param targets: The extra profit to leave on each runner winning, defaults to none
+    :type targets: Mapping[Hashable, Decimal], optional
+    :param min_stake: The smallest stake that can be placed, defaults to 0
+    :type min_stake: Decimal, optional
+    :param increment: The unit stakes are rounded to, defaults to 0.01
+    :type increment: Decimal, optional
+    :param ladder: Whether to round prices to the tick ladder, backing at the tick below and laying at the tick above, defaults to True
+    :type ladder: bool, optional
+    :raises ValueError: If commission is not between 0 and 100
+    :return: The hedging bets and the profit in each outcome
+    :rtype: Hedge
+
+    :Example:
+        >>> positions = [Position('Frankel', Side.BACK, Odds(4), Decimal(10))]
+        >>> hedge(positions, Market({'Frankel': Odds(2.9), 'Shergar': Odds(1.5)}), Market({'Frankel': Odds(3)}))
+        Hedge(bets=[Position(runner='Frankel', side=<Side.LAY: 2>, odds=Odds('3.00'), stake=Decimal('13.33'))], profits={'Frankel': Decimal('3.34'), 'Shergar': Decimal('3.33')})
+    """
+    if not 0 <= percentage_commission <= 100:
+        raise ValueError("Commission must be between 0 and 100")
+
+    lay_market = back_market if lay_market is None else lay_market
+    wins, losses = _aggregate(positions)
+    chosen = set(wins if runners is None else runners)
+    targets = targets or {}
+    step = Decimal(increment)
+
+    bets = []
+    for runner in wins:
+        if runner not in chosen:
+            continue
+
+        difference = wins[runner] - losses[runner] - Decimal(targets.get(runner, 0))
+        side = Side.LAY if difference > 0 else Side.BACK
+        price = (lay_market if side == Side.LAY else back_market).get(runner)
+        if not difference or price is None:
+            continue
+
+        odds = snap(price, "up" if side == Side.LAY else "down") if ladder else price
+        stake = (abs(difference) / odds).quantize(step, ROUND_HALF_UP)
+        if stake <= 0 or stake < min_stake:
+            continue
+
+        bets.append(Position(runner, side, odds, stake))
+        _add(wins, losses, bets[-1])
+
+    outcomes = dict.fromkeys([*back_market, *lay_market, *wins])
+    return Hedge(bets, _profits(wins, losses, outcomes, percentage_commission))
+
+
+def hedge_many(
+    markets: Iterable[tuple[Iterable[Position], Market, Market | None]],
+    percentage_commission: Decimal = Decimal(0),
+    **kwargs: Any,
+) -> list[Hedge]:
+    """Calculates the bets that green up each of many markets, see hedge
+
+    :param markets: The positions, back prices and lay prices, or None, of each market
+    :type markets: Iterable[tuple[Iterable[Position], Market, Market | None]]
+    :param percentage_commission: The percentage commission charged on net winnings in each market
+    :type percentage_commission: Decimal
+    :return: The hedge of each market
+    :rtype: list[Hedge]
+    """
+
+    return [
+        hedge(positions, back, lay, percentage_commission, **kwargs)
+        for positions, back, lay in markets
+    ]
+
+
+def _profits(
+    wins: Mapping[Hashable, Decimal],
+    losses: Mapping[Hashable, Decimal],
+    outcomes: Iterable[Hashable],
+    percentage_commission: Decimal = Decimal(0),
+) -> dict[Hashable, Decimal]:
+    """Returns the profit, after commission, if each runner wins, from the profit on each runner's positions if it wins and if it loses"""
+    total_losses = sum(losses.values(), Decimal(0))
+    retained = 1 - Decimal(percentage_commission) / 100
+
+    results = {}
+    for runner in outcomes:
+        profit = total_losses - losses.get(runner, 0) + wins.get(runner, 0)
+        results[runner] = round(profit * retained if profit > 0 else profit, 2)
+    return results
+
+
+def _aggregate(
+    positions: Iterable[Position],
+) -> tuple[dict[Hashable, Decimal], dict[Hashable, Decimal]]:
+    """Returns the profit on each runner's positions if it wins and if it loses"""
+    wins: dict[Hashable, Decimal] = {}
+    losses: dict[Hashable, Decimal] = {}
+    for position in positions:
+        wins.setdefault(position.runner, Decimal(0))
+        losses.setdefault(position.runner, Decimal(0))
+        _add(wins, losses, position)
+    return wins, losses
+
+
+def _add(
+    wins: dict[Hashable, Decimal], losses: dict[Hashable, Decimal], position: Position
+) -> None:
+    stake = Decimal(position.stake)
+    winnings = stake * (Decimal(position.odds) - 1)
+    sign = 1 if position.side == Side.BACK else -1
+    wins[position.runner] += sign * winnings
+    losses[position.runner] -= sign * stake
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import Literal
+
+from ..odds import Odds
+
+_BANDS = [
+    ("1.01", "2", "0.01"),
+    ("2", "3", "0.02"),
+    ("3", "4", "0.05"),
+    ("4", "6", "0.1"),
+    ("6", "10", "0.2"),
+    ("10", "20", "0.5"),
+    ("20", "30", "1"),
+    ("30", "50", "2"),
+    ("50", "100", "5"),
+    ("100", "1000", "10"),
+]
+
+
+def _ladder() -> tuple[Odds, ...]:
+    ticks = []
+    for start, end, increment in _BANDS:
+        price, step = Decimal(start), Decimal(increment)
+        while price < Decimal(end):
+            ticks.append(Odds(price))
+            price += step
+    return (*ticks, Odds(1000))
+
+
+TICKS = _ladder()
+"""The prices exchanges accept, from 1.01 to 1000, in increments widening from 0.01 to 10 as prices lengthen"""
+
+_VALUES = [float(tick) for tick in TICKS]
+_INDEX: dict[Decimal | float, int] = {
+    **{tick: i for i, tick in enumerate(TICKS)},
+    **{value: i for i, value in enumerate(_VALUES)},
+}
+
+
+def tick_index(odds: Decimal | float) -> int:
+    """Returns the position of a price on the tick ladder
+
+    :param odds: A price on the ladder
+    :type odds: Decimal
+    :raises ValueError: If the price is not on the ladder
+    :return: The index of the price in TICKS
+    :rtype: int
+
+    :Example:
+        >>> tick_index(Odds('2.02'))
+        100
+    """
+    try:
+        return _INDEX[odds]
+    except KeyError:
+        raise ValueError(f"Odds {odds} are not on the tick ladder") from None
+
+
+def snap(
+    odds: Decimal | float, rounding: Literal["nearest", "down", "up"] = "nearest"
+) -> Odds:
+    """Returns the price on the tick ladder nearest to, below or above the given odds, limited to the ladder's range
+
+    :param odds: The odds
+    :type odds: Decimal
+    :param rounding: Whether to take the nearest tick, the tick at or below, or the tick at or above, defaults to "nearest"
+    :type rounding: str, optional
+    :return: A price on the ladder
+    :rtype: Odds
+
+    :Example:
+        >>> snap(Odds('3.33'))
+        Odds('3.35')
+        >>> snap(Odds('3.33'), 'down')
+        Odds('3.30')
+    """
+    value = float(odds)
+    above = min(bisect_left(_VALUES, value), len(TICKS) - 1)
+    below = max(bisect_right(_VALUES, value) - 1, 0)
+    if rounding == "down":
+        return TICKS[below]
+    if rounding == "up":
+        return TICKS[above]
+
+    return TICKS[below if value - _VALUES[below] <= _VALUES[above] - value else above]
+
+
+def offset(odds: Decimal | float, ticks: int) -> Odds:
+    """Returns the price a number of ticks from a price on the ladder, limited to the ladder's range
+
+    :param odds: A price on the ladder
+    :type odds: Decimal
+    :param ticks: The number of ticks to move, positive to lengthen and negative to shorten
+    :type ticks: int
+    :raises ValueError: If the price is not on the ladder
+    :return: A price on the ladder
+    :rtype: Odds
+
+    :Example:
+        >>> offset(Odds('1.99'), 2)
+        Odds('2.02')
+    """
+
+    return TICKS[min(max(tick_index(odds) + ticks, 0), len(TICKS) - 1)]
+
+
+def ticks_between(a: Decimal | float, b: Decimal | float) -> int:
+    """Returns the number of ticks from one price on the ladder to another
+
+    :param a: A price on the ladder
+    :type a: Decimal
+    :param b: Another price on the ladder
+    :type b: Decimal
+    :raises ValueError: If either price is not on the ladder
+    :return: The number of ticks from a to b, negative if b is shorter
+    :rtype: int
+
+    :Example:
+        >>> ticks_between(Odds('1.98'), Odds('2.04'))
+        4
+    """
+
+    return tick_index(b) - tick_index(a)
@@ -0,0 +1,277 @@
+"""Opt-in instrumentation of pybet's public operations, recording call counts, latencies and memory.
+
+Instrumentation is off by default, when the operations are left untouched so cost nothing. Enabling it,
+with enable, the instrument context manager or by setting the PYBET_INSTRUMENT environment variable to 1,
+replaces each registered operation with a wrapper that records every call until it is disabled. Functions,
+e.g. kelly, are replaced in their module and package, so are only recorded when looked up from there.
+
+Example:
+    >>> with instrument(LoggingExporter()):
+    ...     market.derive(3)
+    >>> snapshot()['Market.derive'].calls
+    1
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import sys
+import threading
+from array import array
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from importlib import import_module
+from statistics import quantiles
+from time import perf_counter
+from typing import Any, NamedTuple, Protocol
+
+from . import staking
+from .bets import Bet, EachWay
+from .market import Market
+from .odds import Odds
+
+_SAMPLES = 10_000
+_MISSING = object()
+
+
+class OperationStats(NamedTuple):
+    """The statistics recorded for one operation, where net_blocks is the net change in memory blocks allocated
+    across its calls, so is negative when calls freed more than they allocated"""
+
+    name: str
+    calls: int
+    total_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+    net_blocks: int
+
+
+class Exporter(Protocol):
+    """A destination for instrumentation snapshots, e.g. a metrics system"""
+
+    def export(self, stats: dict[str, OperationStats]) -> None: ...
+
+
+class MemoryExporter:
+    """An exporter keeping every snapshot in memory
+
+    Attributes:
+        snapshots: The snapshots exported, in the order exported.
+    """
+
+    def __init__(self) -> None:
+        self.snapshots: list[dict[str, OperationStats]] = []
+
+    def export(self, stats: dict[str, OperationStats]) -> None:
+        self.snapshots.append(stats)
+
+
+class LoggingExporter:
+    """An exporter logging one line per operation"""
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.INFO
+    ) -> None:
+        """Initialises a logging exporter
+
+        :param logger: The logger to log to, defaults to the pybet.instrumentation logger
+        :type logger: logging.Logger, optional
+        :param level: The level to log at, defaults to INFO
+        :type level: int, optional
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def export(self, stats: dict[str, OperationStats]) -> None:
+        for s in stats.values():
+            self.logger.log(
+                self.level,
+                "%s calls=%d total=%.6fs p50=%.2gs p95=%.2gs p99=%.2gs net_blocks=%+d",
+                s.name,
+                s.calls,
+                s.total_seconds,
+                s.p50_seconds,
+                s.p95_seconds,
+                s.p99_seconds,
+                s.net_blocks,
+            )
+
+
+class CallbackExporter:
+    """An exporter passing each snapshot to a callback, e.g. to push it to a metrics system"""
+
+    def __init__(self, callback: Callable[[dict[str, OperationStats]], None]) -> None:
+        self.callback = callback
+
+    def export(self, stats: dict[str, OperationStats]) -> None:
+        self.callback(stats)
+
+
+class _Operation:
+    __slots__ = ("blocks", "calls", "samples", "total")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.blocks = 0
+        self.samples = array("d")
+
+    def record(self, seconds: float, blocks: int) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.blocks += blocks
+        if len(self.samples) < _SAMPLES:
+            self.samples.append(seconds)
+        elif (index := _random.randrange(self.calls)) < _SAMPLES:
+            self.samples[index] = seconds
+
+    def stats(self, name: str) -> OperationStats:
+        if len(self.samples) > 1:
+            cuts = quantiles(self.samples, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = self.samples[0] if self.samples else 0.0
+        return OperationStats(name, self.calls, self.total, p50, p95, p99, self.blocks)
+
+
+_targets: dict[tuple[Any, str], str] = {}
+_originals: dict[tuple[Any, str], Any] = {}
+_operations: dict[str, _Operation] = {}
+_lock = threading.Lock()
+_random = random.Random()
+
+
+def register(owner: Any, attribute: str, name: str | None = None) -> None:
+    """Registers an operation to instrument, taking effect from the next time instrumentation is enabled.
+    The same operation can be registered on several owners under one name, e.g. a function in its module and package.
+
+    :param owner: The class or module the operation is an attribute of
+    :type owner: Any
+    :param attribute: The name of the attribute
+    :type attribute: str
+    :param name: The name to record the operation under, defaults to owner.attribute
+    :type name: str, optional
+    """
+
+    _targets[owner, attribute] = name or f"{owner.__name__}.{attribute}"
+
+
+def enable() -> None:
+    """Enables instrumentation of every registered operation, if not already enabled"""
+    for (owner, attribute), name in _targets.items():
+        if (owner, attribute) in _originals:
+            continue
+        original = _originals[owner, attribute] = owner.__dict__.get(
+            attribute, _MISSING
+        )
+        wrapper: Any
+        if isinstance(original, classmethod | staticmethod):
+            wrapper = type(original)(_wrap(name, original.__func__))
+        elif attribute == "__new__":
+            wrapper = staticmethod(_wrap(name, getattr(owner, attribute)))
+        else:
+            wrapper = _wrap(name, getattr(owner, attribute))
+        setattr(owner, attribute, wrapper)
+
+
+def disable() -> None:
+    """Disables instrumentation, restoring every operation, and keeping what has been recorded"""
+    for (owner, attribute), original in _originals.items():
+        if original is _MISSING:
+            delattr(owner, attribute)
+        else:
+            setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is enabled
+
+    :return: True if enabled
+    :rtype: bool
+    """
+
+    return bool(_originals)
+
+
+def snapshot() -> dict[str, OperationStats]:
+    """Returns the statistics recorded for each operation called since the last reset
+
+    :return: The statistics of each operation
+    :rtype: dict[str, OperationStats]
+    """
+    with _lock:
+        return {name: op.stats(name) for name, op in _operations.items()}
+
+
+def reset() -> None:
+    """Discards everything recorded"""
+    with _lock:
+        _operations.clear()
+
+
+def export(*exporters: Exporter) -> None:
+    """Sends a snapshot to each exporter
+
+    :param exporters: The exporters
+    :type exporters: Exporter
+    """
+    stats = snapshot()
+    for exporter in exporters:
+        exporter.export(stats)
+
+
+@contextmanager
+def instrument(*exporters: Exporter) -> Iterator[None]:
+    """Enables instrumentation within a block, exporting a snapshot on leaving it, and disables it
+    afterwards unless it was already enabled
+
+    :param exporters: The exporters to send the snapshot to
+    :type exporters: Exporter
+    """
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+        export(*exporters)
+
+
+def _wrap(name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        blocks = sys.getallocatedblocks()
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            blocks = sys.getallocatedblocks() - blocks
+            with _lock:
+                if (operation := _operations.get(name)) is None:
+                    operation = _operations[name] = _Operation()
+                operation.record(seconds, blocks)
+
+    return wrapper
+
+
+for _attribute in ("apply_margin", "derive", "equalise", "fill", "meld", "without"):
+    register(Market, _attribute)
+register(Odds, "__new__", "Odds")
+register(Odds, "to_fractional")
+register(Odds, "fractional")
+register(Bet, "settle")
+register(EachWay, "settle")
+for _module, _function in (
+    ("kelly", "kelly"),
+    ("kelly", "kelly_array"),
+    ("kelly", "simultaneous_kelly"),
+    ("dutching", "dutch"),
+):
+    register(staking, _function, _function)
+    register(import_module(f".staking.{_module}", __package__), _function, _function)
@@ -4,10 +4,13 @@ from decimal import Decimal
 from functools import reduce
 from itertools import permutations
 from operator import mul
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .odds import Odds
 
+if TYPE_CHECKING:
+    from .models import FinishingModel
+
 
 class Market(dict):
     """A betting market represented by a dictionary of runners and odds
@@ -28,6 +31,16 @@ class Market(dict):
             value = Odds(value)
         super().__setitem__(key, value)
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickles the market compactly as its runners, its odds as decimal strings and any attributes, e.g. places
+
+        :return: A function and the arguments and state to recreate the market
+        :rtype: tuple
+        """
+        odds = tuple(None if o is None else Decimal.__str__(o) for o in self.values())
+
+        return (_restore, (self.__class__, tuple(self), odds), self.__dict__ or None)
+
     # Properties
 
     @property
@@ -123,16 +136,26 @@ class Market(dict):
             self[runner] = Odds(Decimal(odds) / adjustment)
         return self
 
-    def derive(self, places: int, *, discounts: list[float] | None = None) -> Market:
+    def derive(
+        self,
+        places: int,
+        *,
+        discounts: list[float] | None = None,
+        model: FinishingModel | None = None,
+    ) -> Market:
         """Derives a place market from a win market using the Harville formula (see https://en.wikipedia.org/wiki/Harville_formula)
-        applying a specified discounted version of that formula if required
+        applying a specified discounted version of that formula if required, or using another finishing order model
 
         :param places: The number of places to derive the market for
         :type places: int
         :param discounts: A list of discounts to apply to the probability of each horse in the market, defaults to None
         :type discounts: List[float], optional
+        :param model: A finishing order model to use instead of Harville, e.g. Henery or Stern from pybet.models, defaults to None
+        :type model: FinishingModel, optional
         :raises ValueError: If the number of places is invalid
         :raises ValueError: If the market is not a win market
+        :raises ValueError: If both discounts and a model are specified
+        :raises ValueError: If the model cannot be fitted to the market
         :return: A revised market with the specified number of places
         :rtype: Market
 
@@ -148,8 +171,23 @@ class Market(dict):
         if places >= len(self) or places <= 1:
             raise ValueError("Invalid number of places")
 
+        if model is not None and discounts is not None:
+            raise ValueError("Discounts only apply to the Harville formula")
+
         fair_market = Market(self)
         fair_market.apply_margin(Decimal(0))
+        if model is not None:
+            runners = list(self)
+            probabilities = [float(fair_market[r].to_probability()) for r in runners]
+            chances = model.chances(model.fit(runners, probabilities), places)
+            place_market = Market({
+                runner: Odds.probability(Decimal(chance))
+                for runner, chance in zip(runners, chances)
+            })
+            place_market.places = places
+
+            return place_market
+
         derived_market = Market.fromkeys(self.keys())
         prob = lambda x: float(fair_market[x].to_probability())
         product = lambda x: reduce(mul, x, 1)
@@ -234,6 +272,7 @@ class Market(dict):
             raise ValueError("Percentage must be between 0 and 100")
 
         new_market = Market(zip(self.keys(), [None] * len(self)))
+        new_market.places = self.places
         market_1 = self.apply_margin(Decimal(0))
         market_2 = other.apply_margin(Decimal(0))
         for runner in self.keys():
@@ -275,4 +314,15 @@ class Market(dict):
             ['Sea The Stars', 'Nijinsky', 'Dancing Brave']
         """
 
-        return Market({key: value for key, value in self.items() if key not in runners})
+        new_market = Market(
+            {key: value for key, value in self.items() if key not in runners}
+        )
+        new_market.places = self.places
+
+        return new_market
+
+
+def _restore(cls: type[Market], runners: tuple, odds: tuple) -> Market:
+    market = cls()
+    dict.update(market, zip(runners, (None if o is None else Odds(o) for o in odds)))
+    return market
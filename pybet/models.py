@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+from math import erf, exp, lgamma, log, pi, sqrt
+
+_STEP = 0.02
+_TOLERANCE = 1e-6
+
+
+class FinishingModel(ABC):
+    """A model of a race's finishing order in which each runner's finishing time, on some scale, is a standard
+    random variable shifted by the runner's strength, so stronger runners tend to finish sooner.
+
+    Strengths are fitted so that each runner's chance of finishing first matches its win price, and the
+    chance of finishing in the places then follows from integrating over the time at which the runner
+    finishes. The standard density and distribution are tabulated once, on a grid fine enough for the
+    integrals, and each runner's are the same tables shifted by its strength.
+
+    Fits start from the exact response of the win chances to the strengths, take quasi-Newton steps that
+    refine it as they go, and backtrack along any step that does not bring the win chances closer to the
+    prices, recomputing the response if none does. Fitted strengths and their response are cached by runners,
+    so a repeat derivation at the same prices needs no fitting and one after small price moves needs neither
+    the response nor as many steps.
+
+    Attributes:
+        iterations: The number of evaluations of the win chances taken by the last fit.
+    """
+
+    #: The approximate change in the log of a runner's win chance per unit of strength, used to start fits
+    slope = 1.0
+    #: The most evaluations of the win chances a fit can take
+    max_iterations = 100
+    #: The most fits kept for runners previously fitted
+    cache_size = 1024
+
+    def __init__(self) -> None:
+        """Initialises the model, tabulating its standard density and distribution"""
+        self.iterations = 0
+        self._densities, self._distribution = self._tabulate()
+        self._fits: dict[
+            tuple[Hashable, ...], tuple[list[float], list[float], list[list[float]]]
+        ] = {}
+
+    # Instance methods
+
+    def fit(self, runners: list[Hashable], probabilities: list[float]) -> list[float]:
+        """Returns the strengths of runners which give them the specified chances of winning
+
+        :param runners: The runners, used to find any previous fit to start from
+        :type runners: list[Hashable]
+        :param probabilities: Each runner's chance of winning, summing to 1
+        :type probabilities: list[float]
+        :raises ValueError: If the strengths do not converge
+        :return: Each runner's strength
+        :rtype: list[float]
+        """
+        key = tuple(runners)
+        previous = self._fits.pop(key, None)
+        self.iterations = 0
+        if previous is not None and previous[0] == probabilities:
+            self._fits[key] = previous
+            return previous[1]
+
+        targets = [log(p) for p in probabilities]
+        if previous is None:
+            strengths = [t / self.slope for t in targets]
+            inverse = None
+        else:
+            strengths, inverse = previous[1], [list(row) for row in previous[2]]
+
+        errors = self._errors(strengths, targets)
+        fresh = False
+        while max(map(abs, errors)) >= _TOLERANCE:
+            if inverse is None:
+                inverse, fresh = _invert(self._response(strengths)), True
+
+            step = [sum(h * e for h, e in zip(row, errors)) for row in inverse]
+            moved = self._search(strengths, step, targets, errors)
+            if moved is None:
+                if fresh:
+                    raise ValueError("Strengths did not converge to the win chances")
+
+                inverse = None
+                continue
+
+            trial, trial_errors = moved
+            _update(
+                inverse,
+                [t - s for t, s in zip(trial, strengths)],
+                [e - t for e, t in zip(errors, trial_errors)],
+            )
+            strengths, errors, fresh = trial, trial_errors, False
+
+        if inverse is None:
+            inverse = _invert(self._response(strengths))
+        self._fits[key] = (probabilities, strengths, inverse)
+        if len(self._fits) > self.cache_size:
+            del self._fits[next(iter(self._fits))]
+
+        return strengths
+
+    def chances(self, strengths: list[float], places: int) -> list[float]:
+        """Returns each runner's chance of finishing within the specified number of places
+
+        :param strengths: Each runner's strength
+        :type strengths: list[float]
+        :param places: The number of places
+        :type places: int
+        :return: Each runner's chance of being placed, summing to the number of places
+        :rtype: list[float]
+        """
+        length, delays = self._grid(strengths)
+        finished = [_shift(self._distribution, 0, 1, d, length) for d in delays]
+
+        counts = [1.0] * length
+        zeros = [0.0] * length
+        prefixes = [[counts] + [zeros] * (places - 1)]
+        for done in finished:
+            prefixes.append(_include(prefixes[-1], done))
+        suffixes = [[counts] + [zeros] * (places - 1)]
+        for done in reversed(finished):
+            suffixes.append(_include(suffixes[-1], done))
+        suffixes.reverse()
+
+        chances = []
+        for i, delay in enumerate(delays):
+            before, after = prefixes[i], suffixes[i + 1]
+            beaten = [0.0] * length
+            for a in range(places):
+                for b in range(places - a):
+                    beaten = [x + y * z for x, y, z in zip(beaten, before[a], after[b])]
+            density = _shift(self._densities, 0, 0, delay, length)
+            chances.append(_STEP * sum(d * x for d, x in zip(density, beaten)))
+
+        scale = min(places, len(strengths)) / sum(chances)
+        return [chance * scale for chance in chances]
+
+    def _grid(self, strengths: list[float]) -> tuple[int, list[float]]:
+        """The number of grid times spanning every runner's finish, and each runner's delay in grid steps"""
+        strongest = max(strengths)
+        length = len(self._densities) + int((strongest - min(strengths)) / _STEP) + 2
+
+        return length, [(strongest - s) / _STEP for s in strengths]
+
+    def _response(self, strengths: list[float]) -> list[list[float]]:
+        """The change in the log of each runner's win chance per unit of each runner's strength, plus a constant
+        so that the response to shifting every strength, which changes nothing, can still be inverted"""
+        length, delays = self._grid(strengths)
+        densities, turning, running, slowing = [], [], [], []
+        remaining = [1.0] * length
+        for delay in delays:
+            densities.append(_shift(self._densities, 0, 0, delay, length))
+            turning.append(_slope(self._densities, 0, 0, delay, length))
+            running.append(
+                [1 - x for x in _shift(self._distribution, 0, 1, delay, length)]
+            )
+            slowing.append(
+                [-x for x in _slope(self._distribution, 0, 1, delay, length)]
+            )
+            remaining = [w * r for w, r in zip(remaining, running[-1])]
+
+        others = [
+            [w / r if r > 1e-150 else 0.0 for w, r in zip(remaining, rest)]
+            for rest in running
+        ]
+        ratios = [
+            [d / r if r > 1e-150 else 0.0 for d, r in zip(change, rest)]
+            for change, rest in zip(slowing, running)
+        ]
+
+        # The change in each runner's chance per grid step of delay to each runner, from which every strength
+        # but the strongest's is measured
+        chances, delayed = [], []
+        for i, (density, rest) in enumerate(zip(densities, others)):
+            weighted = [g * w for g, w in zip(density, rest)]
+            chances.append(sum(weighted))
+            delayed.append(
+                [
+                    sum(t * w for t, w in zip(turning[i], rest))
+                    if i == k
+                    else sum(a * b for a, b in zip(weighted, ratio))
+                    for k, ratio in enumerate(ratios)
+                ]
+            )
+
+        anchor = delays.index(0)
+        changes = []
+        for row in delayed:
+            change = [-d / _STEP for d in row]
+            change[anchor] = sum(d for k, d in enumerate(row) if k != anchor) / _STEP
+            changes.append(change)
+
+        total = sum(chances)
+        columns = [sum(column) / total for column in zip(*changes)]
+        size = len(strengths)
+
+        return [
+            [c / chance - t + 1 / size for c, t in zip(change, columns)]
+            for chance, change in zip(chances, changes)
+        ]
+
+    def _errors(self, strengths: list[float], targets: list[float]) -> list[float]:
+        """The difference between the log of each runner's win chance and its target"""
+        if self.iterations >= self.max_iterations:
+            raise ValueError("Strengths did not converge to the win chances")
+
+        self.iterations += 1
+        chances = self.chances(strengths, 1)
+
+        return [t - log(max(c, 1e-300)) for t, c in zip(targets, chances)]
+
+    def _search(
+        self,
+        strengths: list[float],
+        step: list[float],
+        targets: list[float],
+        errors: list[float],
+    ) -> tuple[list[float], list[float]] | None:
+        """Backtracks along a step until it reduces the errors, returning the strengths and errors reached"""
+        norm = sum(e * e for e in errors)
+        size = 1.0
+        while size > 1 / 64:
+            trial = [s + size * d for s, d in zip(strengths, step)]
+            trial_errors = self._errors(trial, targets)
+            if sum(e * e for e in trial_errors) < norm:
+                return trial, trial_errors
+
+            size /= 4
+
+        return None
+
+    @abstractmethod
+    def _tabulate(self) -> tuple[list[float], list[float]]:
+        """The standard density and distribution on the grid, from the lowest value with any density to the highest"""
+
+
+class Henery(FinishingModel):
+    """Henery's model, in which runners' finishing times are normally distributed with the same spread, so
+    favourites are less likely to be placed than Harville implies.
+
+    Example:
+        >>> market = Market({'Frankel': Odds(2), 'Sea The Stars': Odds(4), 'Nijinsky': Odds(6), 'Mill Reef': Odds(12)})
+        >>> market.derive(2, model=Henery())
+        {'Frankel': Odds('1.30'), 'Sea The Stars': Odds('1.80'), 'Nijinsky': Odds('2.36'), 'Mill Reef': Odds('3.96')}
+    """
+
+    slope = 1.5
+
+    def _tabulate(self) -> tuple[list[float], list[float]]:
+        values = [-8 + i * _STEP for i in range(int(16 / _STEP) + 1)]
+
+        return (
+            [exp(-v * v / 2) / sqrt(2 * pi) for v in values],
+            [(1 + erf(v / sqrt(2))) / 2 for v in values],
+        )
+
+
+class Stern(FinishingModel):
+    """Stern's model, in which runners' finishing times are gamma distributed with the same shape and rates
+    given by their strengths. A shape of 1 is Harville's model, and larger shapes rate favourites' chances of
+    being placed lower.
+
+    Example:
+        >>> market = Market({'Frankel': Odds(2), 'Sea The Stars': Odds(4), 'Nijinsky': Odds(6), 'Mill Reef': Odds(12)})
+        >>> market.derive(2, model=Stern(4))
+        {'Frankel': Odds('1.27'), 'Sea The Stars': Odds('1.78'), 'Nijinsky': Odds('2.41'), 'Mill Reef': Odds('4.30')}
+    """
+
+    def __init__(self, shape: int = 4) -> None:
+        """Initialises the model
+
+        :param shape: The shape of the finishing times' gamma distribution, defaults to 4
+        :type shape: int, optional
+        :raises ValueError: If the shape is not a positive whole number
+        """
+        if not isinstance(shape, int) or shape < 1:
+            raise ValueError("Shape must be a positive whole number")
+
+        self.shape = shape
+        self.slope = sqrt(shape)
+        super().__init__()
+
+    def _tabulate(self) -> tuple[list[float], list[float]]:
+        shape = self.shape
+        lowest = (log(1e-12) + lgamma(shape)) / shape
+        highest = log(shape + 10 * sqrt(shape) + 30)
+        values = [
+            lowest + i * _STEP for i in range(int((highest - lowest) / _STEP) + 1)
+        ]
+
+        densities, distribution = [], []
+        for v in values:
+            x = exp(v)
+            densities.append(exp(shape * v - x - lgamma(shape)))
+            term, remaining = 1.0, 1.0
+            for m in range(1, shape):
+                term *= x / m
+                remaining += term
+            distribution.append(1 - exp(-x) * remaining)
+
+        return densities, distribution
+
+
+def _invert(matrix: list[list[float]]) -> list[list[float]]:
+    """The inverse of a square matrix, by Gauss-Jordan elimination with partial pivoting"""
+    size = len(matrix)
+    rows = [
+        [*row, *(1.0 if i == j else 0.0 for j in range(size))]
+        for i, row in enumerate(matrix)
+    ]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda r: abs(rows[r][column]))
+        if abs(rows[pivot][column]) < 1e-300:
+            raise ValueError("Strengths did not converge to the win chances")
+
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        leading = rows[column]
+        scale = leading[column]
+        leading[:] = [x / scale for x in leading]
+        for r, row in enumerate(rows):
+            factor = row[column]
+            if r != column and factor:
+                row[:] = [x - factor * y for x, y in zip(row, leading)]
+
+    return [row[size:] for row in rows]
+
+
+def _update(inverse: list[list[float]], step: list[float], change: list[float]) -> None:
+    """Updates an estimate of the inverse of the response of the log win chances to the strengths, in place,
+    so that it maps the latest change in the chances to the step that made it (Broyden's method)"""
+    mapped = [sum(h * c for h, c in zip(row, change)) for row in inverse]
+    weights = [
+        sum(s * inverse[i][j] for i, s in enumerate(step)) for j in range(len(step))
+    ]
+    denominator = sum(w * c for w, c in zip(weights, change))
+    if abs(denominator) < 1e-300:
+        return
+
+    for row, s, m in zip(inverse, step, mapped):
+        factor = (s - m) / denominator
+        for j, w in enumerate(weights):
+            row[j] += factor * w
+
+
+def _shift(
+    table: list[float], low: float, high: float, delay: float, length: int
+) -> list[float]:
+    """The values of a table delayed by a number of grid steps, interpolated, and padded with its limits"""
+    earlier, later, fraction = _align(table, low, high, delay, length)
+
+    return [y + fraction * (x - y) for x, y in zip(earlier, later)]
+
+
+def _slope(
+    table: list[float], low: float, high: float, delay: float, length: int
+) -> list[float]:
+    """The change in the values of a delayed table, as interpolated by _shift, per grid step of further delay"""
+    earlier, later, _ = _align(table, low, high, delay, length)
+
+    return [x - y for x, y in zip(earlier, later)]
+
+
+def _align(
+    table: list[float], low: float, high: float, delay: float, length: int
+) -> tuple[list[float], list[float], float]:
+    """The table values either side of each delayed grid time, and the fraction of a step between them"""
+    whole = int(delay)
+    padded = [low] * (whole + 1) + table
+    padded += [high] * max(0, length + 1 - len(padded))
+
+    return padded[:length], padded[1 : length + 1], delay - whole
+
+
+def _include(counts: list[list[float]], done: list[float]) -> list[list[float]]:
+    """Adds a runner, finished at each grid time with the given chance, to the chances of each number finished"""
+    included = [[c * (1 - d) for c, d in zip(counts[0], done)]]
+    for previous, current in zip(counts, counts[1:]):
+        included.append(
+            [p * d + c * (1 - d) for p, c, d in zip(previous, current, done)]
+        )
+
+    return included
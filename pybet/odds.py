@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections.abc import Iterable
 from decimal import Decimal
 from fractions import Fraction
 from math import inf
@@ -28,6 +30,53 @@ class FractionalOddsSets:
     ]  # [1:] removes 1/1 so it doesn't duplicate
 
 
+class FractionalSet:
+    """A fractional odds set compiled for nearest lookups by bisection, giving the same result as Odds.to_fractional
+    for many lookups against one set
+
+    Example:
+        >>> fractional_set = FractionalSet(FractionalOddsSets.STANDARD)
+        >>> fractional_set.nearest(Odds(4.27))
+        '10/3'
+    """
+
+    def __init__(self, fractional_set: Iterable[str]) -> None:
+        """Initialises a compiled fractional odds set
+
+        :param fractional_set: The fractional odds to select from
+        :type fractional_set: Iterable[str]
+        :raises ValueError: If the set contains no odds
+        """
+        nearest: dict[Decimal, tuple[int, str]] = {}
+        for index, fraction in enumerate(fractional_set):
+            value = Odds.fractional(fraction)
+            if value not in nearest:
+                parsed = Fraction(fraction)
+                nearest[value] = (index, f"{parsed.numerator}/{parsed.denominator}")
+
+        if not nearest:
+            raise ValueError("Fractional odds set contains no odds")
+
+        self._values = sorted(nearest)
+        self._fractions = [nearest[value] for value in self._values]
+
+    def nearest(self, odds: Decimal) -> str:
+        """Returns the closest fractional odds in the set, preferring the earliest in the set when equally close
+
+        :param odds: The decimal odds to match
+        :type odds: Decimal
+        :return: The closest fractional odds, e.g. '9/4'
+        :rtype: str
+        """
+        position = bisect_left(self._values, odds)
+        candidates = [i for i in (position - 1, position) if 0 <= i < len(self._values)]
+        best = min(
+            candidates,
+            key=lambda i: (abs(odds - self._values[i]), self._fractions[i][0]),
+        )
+        return self._fractions[best][1]
+
+
 class Odds(Decimal):
     """A class that allows decimal odds to be created from and converted to a range of other odds formats"""
 
@@ -165,6 +214,15 @@ class Odds(Decimal):
 
     # Dunder methods
 
+    def __reduce__(self) -> tuple[type[Odds], tuple[str]]:
+        """Pickles the odds as their class and full decimal string, as str gives only two decimal places
+
+        :return: The class and the arguments to recreate the odds
+        :rtype: tuple[type[Odds], tuple[str]]
+        """
+
+        return (self.__class__, (Decimal.__str__(self),))
+
     def __repr__(self) -> str:
         """A string representation of the odds as a decimal to two decimal places
 
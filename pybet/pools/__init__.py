@@ -0,0 +1,3 @@
+from .pool import ExactaPool, PlacePool, Pool, TrifectaPool, WinPool
+
+__all__ = ["ExactaPool", "PlacePool", "Pool", "TrifectaPool", "WinPool"]
@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from decimal import ROUND_DOWN, Decimal
+from heapq import nlargest
+from itertools import permutations
+from operator import itemgetter
+from typing import Any
+
+from ..market import Market
+from ..odds import Odds
+
+Key = tuple[int, ...]
+
+
+class Pool:
+    """A pari-mutuel pool, in which the stakes on every selection, less a deduction, are shared between
+    the stakes on the winning selections.
+
+    Runners are indexed when the pool is created and stakes are held in whole pence per combination of runners,
+    alongside an index of the combinations containing each runner, so bets are added in constant time and a
+    scratched runner's bets are refunded without scanning the pool. Dividends are per unit staked, including
+    the stake, and rounded down to the breakage.
+
+    A result is the finishing order, each position being a runner or, for a dead heat, a set of runners.
+    When selections dead heat, the pool is shared equally between each of the winning selections backed.
+    If no winning selection is backed there are no dividends, e.g. for the pool to be carried over.
+
+    Example:
+        >>> pool = ExactaPool(['Frankel', 'Shergar', 'Nijinsky'], deduction=20)
+        >>> pool.add(('Frankel', 'Shergar'), 10)
+        >>> pool.add(('Shergar', 'Frankel'), 30)
+        >>> pool.dividends(['Frankel', 'Shergar', 'Nijinsky'])
+        {('Frankel', 'Shergar'): Decimal('3.20')}
+    """
+
+    legs: int = 1
+
+    def __init__(
+        self,
+        runners: Iterable[Hashable],
+        *,
+        deduction: Decimal = Decimal(0),
+        breakage: Decimal = Decimal("0.01"),
+    ) -> None:
+        """Initialises an empty pool
+
+        :param runners: The runners in the event
+        :type runners: Iterable[Hashable]
+        :param deduction: The percentage of the pool deducted before dividends are paid, defaults to 0
+        :type deduction: Decimal, optional
+        :param breakage: The unit dividends are rounded down to, defaults to 0.01
+        :type breakage: Decimal, optional
+        :raises ValueError: If the deduction is not >= 0 and < 100
+        :raises ValueError: If runners are repeated or there are too few for a selection
+        """
+        if not 0 <= deduction < 100:
+            raise ValueError("Deduction must be >= 0 and < 100")
+
+        self._runners = list(runners)
+        self._index = {runner: i for i, runner in enumerate(self._runners)}
+        if len(self._index) != len(self._runners) or len(self._runners) < self.legs:
+            raise ValueError(f"Pool must have at least {self.legs} distinct runners")
+
+        self.deduction = Decimal(deduction)
+        self.breakage = Decimal(breakage)
+        self._stakes: dict[Key, int] = {}
+        self._containing: list[set[Key]] = [set() for _ in self._runners]
+        self._scratched: set[int] = set()
+        self._total = 0
+        self._refunds = 0
+
+    def __len__(self) -> int:
+        return len(self._stakes)
+
+    # Properties
+
+    @property
+    def total(self) -> Decimal:
+        """The total staked in the pool, excluding refunded stakes
+
+        :return: The total staked
+        :rtype: Decimal
+        """
+
+        return Decimal(self._total).scaleb(-2)
+
+    @property
+    def net(self) -> Decimal:
+        """The pool left to share between winning stakes once the deduction is taken
+
+        :return: The net pool
+        :rtype: Decimal
+        """
+
+        return self._net.scaleb(-2).quantize(Decimal("0.01"), ROUND_DOWN)
+
+    @property
+    def refunds(self) -> Decimal:
+        """The total refunded on bets on scratched runners
+
+        :return: The total refunded
+        :rtype: Decimal
+        """
+
+        return Decimal(self._refunds).scaleb(-2)
+
+    @property
+    def _net(self) -> Decimal:
+        return self._total * (100 - self.deduction) / 100
+
+    # Instance methods
+
+    def add(self, selection: Any, stake: Decimal | float | str) -> None:
+        """Adds a bet to the pool
+
+        :param selection: A runner, or for a pool of combinations, a tuple of runners in finishing order
+        :type selection: Any
+        :param stake: The stake, in pounds, which must be a whole number of pence
+        :type stake: Decimal
+        :raises ValueError: If the selection is invalid or includes a scratched runner
+        :raises ValueError: If the stake is not positive and a whole number of pence
+        """
+        key = self._key(selection)
+        if self._scratched.intersection(key):
+            raise ValueError("Selection includes a scratched runner")
+
+        pence = Decimal(stake) * 100
+        if pence <= 0 or pence != pence.to_integral_value():
+            raise ValueError("Stake must be positive and a whole number of pence")
+
+        if key not in self._stakes:
+            self._stakes[key] = 0
+            for runner in key:
+                self._containing[runner].add(key)
+        self._stakes[key] += int(pence)
+        self._total += int(pence)
+
+    def add_many(self, bets: Iterable[tuple[Any, Decimal | float | str]]) -> None:
+        """Adds many bets to the pool
+
+        :param bets: The selection and stake of each bet
+        :type bets: Iterable[tuple[Any, Decimal]]
+        :raises ValueError: If any selection or stake is invalid, in which case the bets before it are added
+        """
+
+        for selection, stake in bets:
+            self.add(selection, stake)
+
+    def stake(self, selection: Any) -> Decimal:
+        """Returns the total staked on a selection
+
+        :param selection: A runner, or for a pool of combinations, a tuple of runners in finishing order
+        :type selection: Any
+        :return: The total staked on the selection
+        :rtype: Decimal
+        """
+
+        return Decimal(self._stakes.get(self._key(selection), 0)).scaleb(-2)
+
+    def scratch(self, runner: Hashable) -> Decimal:
+        """Scratches a runner, refunding every bet on a selection including it
+
+        :param runner: The runner
+        :type runner: Hashable
+        :raises ValueError: If the runner is not in the pool
+        :return: The amount refunded
+        :rtype: Decimal
+        """
+        if runner not in self._index:
+            raise ValueError(f"Unknown runner: {runner}")
+
+        index = self._index[runner]
+        self._scratched.add(index)
+        refunded = 0
+        for key in self._containing[index]:
+            refunded += self._stakes.pop(key)
+            for other in key:
+                if other != index:
+                    self._containing[other].discard(key)
+        self._containing[index] = set()
+        self._total -= refunded
+        self._refunds += refunded
+
+        return Decimal(refunded).scaleb(-2)
+
+    def approximates(self) -> dict[Any, Decimal]:
+        """Returns the dividend each backed selection would pay if it won outright with the pool as it stands
+
+        :return: The approximate dividend of each backed selection
+        :rtype: dict[Any, Decimal]
+        """
+        net = self._net
+
+        return {
+            self._selection(key): self._dividend(net, stake)
+            for key, stake in self._stakes.items()
+        }
+
+    def market(self) -> Market:
+        """Returns a market of the approximate dividends as odds, with unbacked runners unpriced in a pool of runners.
+        Dividends below 1, when the deduction exceeds the rest of the pool, are priced at 1.
+
+        :return: A market of the approximate dividend of each selection
+        :rtype: Market
+        """
+        market = Market()
+        if self.legs == 1:
+            for index, runner in enumerate(self._runners):
+                if index not in self._scratched:
+                    market[runner] = None
+        for selection, dividend in self.approximates().items():
+            market[selection] = Odds(max(dividend, Decimal(1)))
+
+        return market
+
+    def dividends(self, result: Sequence[Any]) -> dict[Any, Decimal]:
+        """Returns the dividend per unit staked on each winning selection
+
+        :param result: The finishing order, with a set of runners at any position that was a dead heat
+        :type result: Sequence[Any]
+        :raises ValueError: If the result includes unknown, scratched or repeated runners, or is too short
+        :return: The dividend of each winning selection backed
+        :rtype: dict[Any, Decimal]
+        """
+        groups = self._groups(result)
+        if sum(len(group) for group in groups) < self.legs:
+            raise ValueError(f"Result must have at least {self.legs} finishers")
+
+        backed = [key for key in set(_orders(groups, self.legs)) if key in self._stakes]
+        if not backed:
+            return {}
+
+        share = self._net / len(backed)
+        return {
+            self._selection(key): self._dividend(share, self._stakes[key])
+            for key in backed
+        }
+
+    def _key(self, selection: Any) -> Key:
+        runners = (selection,) if self.legs == 1 else tuple(selection)
+        if len(runners) != self.legs or len(set(runners)) != self.legs:
+            raise ValueError(f"Selection must be {self.legs} distinct runners")
+
+        try:
+            return tuple(self._index[runner] for runner in runners)
+        except KeyError as error:
+            raise ValueError(f"Unknown runner: {error.args[0]}") from error
+
+    def _selection(self, key: Key) -> Any:
+        if self.legs == 1:
+            return self._runners[key[0]]
+        return tuple(self._runners[i] for i in key)
+
+    def _groups(self, result: Sequence[Any]) -> list[list[int]]:
+        groups = [
+            list(position) if isinstance(position, set | frozenset) else [position]
+            for position in result
+        ]
+        finishers = [runner for group in groups for runner in group]
+        if len(set(finishers)) != len(finishers):
+            raise ValueError("Result must not repeat runners")
+
+        indices = [[self._runner_index(runner) for runner in group] for group in groups]
+        if any(i in self._scratched for group in indices for i in group):
+            raise ValueError("Result must not include scratched runners")
+
+        return indices
+
+    def _runner_index(self, runner: Hashable) -> int:
+        if runner not in self._index:
+            raise ValueError(f"Unknown runner: {runner}")
+        return self._index[runner]
+
+    def _dividend(self, returns: Decimal, stake: int) -> Decimal:
+        return (returns / stake).quantize(self.breakage, ROUND_DOWN)
+
+
+class WinPool(Pool):
+    """A pool on the winner of an event, see Pool
+
+    Example:
+        >>> pool = WinPool(['Frankel', 'Shergar', 'Nijinsky'], deduction=15)
+        >>> pool.add_many([('Frankel', 60), ('Shergar', 30), ('Nijinsky', 10)])
+        >>> pool.market()
+        {'Frankel': Odds('1.41'), 'Shergar': Odds('2.83'), 'Nijinsky': Odds('8.50')}
+    """
+
+    legs = 1
+
+
+class ExactaPool(Pool):
+    """A pool on the first two finishers in order, see Pool"""
+
+    legs = 2
+
+
+class TrifectaPool(Pool):
+    """A pool on the first three finishers in order, see Pool"""
+
+    legs = 3
+
+
+class PlacePool(Pool):
+    """A pool on runners finishing in the places, see Pool.
+
+    The net pool, less the stakes on the placed runners, is the profit, which is split equally between the places
+    and then between the stakes on each placed runner. Runners dead heating for the last place share it. If the
+    stakes on the placed runners exceed the net pool, their stakes are returned.
+
+    Example:
+        >>> pool = PlacePool(['Frankel', 'Shergar', 'Nijinsky', 'Mill Reef'], places=2)
+        >>> pool.add_many([('Frankel', 50), ('Shergar', 30), ('Nijinsky', 15), ('Mill Reef', 5)])
+        >>> pool.dividends(['Nijinsky', 'Shergar', 'Frankel', 'Mill Reef'])
+        {'Nijinsky': Decimal('2.83'), 'Shergar': Decimal('1.91')}
+    """
+
+    def __init__(
+        self,
+        runners: Iterable[Hashable],
+        *,
+        places: int = 3,
+        deduction: Decimal = Decimal(0),
+        breakage: Decimal = Decimal("0.01"),
+    ) -> None:
+        """Initialises an empty pool
+
+        :param runners: The runners in the event
+        :type runners: Iterable[Hashable]
+        :param places: The number of places paid, defaults to 3
+        :type places: int, optional
+        :param deduction: The percentage of the pool deducted before dividends are paid, defaults to 0
+        :type deduction: Decimal, optional
+        :param breakage: The unit dividends are rounded down to, defaults to 0.01
+        :type breakage: Decimal, optional
+        :raises ValueError: If the number of places is not at least 1
+        """
+        if places < 1:
+            raise ValueError("Places must be at least 1")
+
+        super().__init__(runners, deduction=deduction, breakage=breakage)
+        self.places = places
+
+    def approximates(self) -> dict[Any, Decimal]:
+        """Returns the lowest dividend each backed runner would pay if placed, i.e. alongside the most backed others
+
+        :return: The approximate dividend of each backed runner
+        :rtype: dict[Any, Decimal]
+        """
+        net = self._net
+        top = nlargest(self.places, self._stakes.items(), key=itemgetter(1))
+
+        approximates = {}
+        for key, stake in self._stakes.items():
+            others = [s for k, s in top if k != key][: self.places - 1]
+            profit = max(net - stake - sum(others), Decimal(0))
+            approximates[self._selection(key)] = self._dividend(
+                stake + profit / self.places, stake
+            )
+        return approximates
+
+    def market(self) -> Market:
+        """Returns a market of the approximate dividends as odds, with the pool's places
+
+        :return: A market of the approximate dividend of each runner
+        :rtype: Market
+        """
+        market = super().market()
+        market.places = self.places
+        return market
+
+    def dividends(self, result: Sequence[Any]) -> dict[Any, Decimal]:
+        """Returns the dividend per unit staked on each placed runner
+
+        :param result: The finishing order, with a set of runners at any position that was a dead heat
+        :type result: Sequence[Any]
+        :raises ValueError: If the result includes unknown, scratched or repeated runners
+        :return: The dividend of each placed runner backed
+        :rtype: dict[Any, Decimal]
+        """
+        shares: dict[int, Decimal] = {}
+        position = 0
+        for group in self._groups(result):
+            if position >= self.places:
+                break
+            taken = min(len(group), self.places - position)
+            for runner in group:
+                shares[runner] = Decimal(taken) / len(group)
+            position += len(group)
+
+        backed = {r: share for r, share in shares.items() if (r,) in self._stakes}
+        if not backed:
+            return {}
+
+        stakes = sum(self._stakes[r,] for r in backed)
+        profit = max(self._net - stakes, Decimal(0))
+        units = sum(backed.values())
+        return {
+            self._runners[r]: self._dividend(
+                self._stakes[r,] + profit * share / units, self._stakes[r,]
+            )
+            for r, share in backed.items()
+        }
+
+
+def _orders(groups: list[list[int]], legs: int) -> Iterator[Key]:
+    """Yields every order of the first legs finishers consistent with the result, given dead heats"""
+    group, rest = groups[0], groups[1:]
+    for order in permutations(group, min(len(group), legs)):
+        if len(order) == legs:
+            yield order
+        else:
+            for tail in _orders(rest, legs - len(order)):
+                yield order + tail
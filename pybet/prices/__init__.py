@@ -0,0 +1,15 @@
+from .binary import MarketFileReader, MarketFileWriter, Snapshot
+from .history import MarketHistory
+from .index import BestPriceIndex
+from .shared import SharedMarketBook
+from .store import MarketStore
+
+__all__ = [
+    "BestPriceIndex",
+    "MarketFileReader",
+    "MarketFileWriter",
+    "MarketHistory",
+    "MarketStore",
+    "SharedMarketBook",
+    "Snapshot",
+]
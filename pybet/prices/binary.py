@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import Hashable, Iterator
+from math import isnan, nan
+from os import PathLike
+from typing import NamedTuple, Self
+
+from ..market import Market
+from ..odds import Odds
+
+_MAGIC = b"PYBETMKT"
+_VERSION = 2
+_HEADER = struct.Struct("<8sHxxxxxx")
+_RECORD = struct.Struct("<4sIdIIIxxxx")
+_TAG = b"SNAP"
+_TRAILER = struct.Struct("<QQ8s")
+
+
+class Snapshot(NamedTuple):
+    """A market snapshot read from a market file"""
+
+    time: float
+    event: Hashable
+    market: Market
+
+
+class MarketFileWriter:
+    """A writer of market snapshots to a compact binary file, which can be read with MarketFileReader.
+
+    Each snapshot is written as it arrives, as a record of its time, event, places and the names of any runners
+    or events not seen before, followed by a block of 32-bit runner ids and a block of 64-bit floats, with unpriced
+    runners as NaN. An index of the time, event, places and position of every snapshot, and the names of runners
+    and events, is written as a footer on closing. A file whose writer was never closed, e.g. after a crash, has
+    no footer, and is read by scanning its records up to the last one written in full. Runner and event names
+    must be strings or integers.
+
+    Example:
+        >>> with MarketFileWriter('season.markets') as writer:
+        ...     writer.write(1_700_000_000, '2:30 Ascot', Market({'Frankel': Odds(3), 'Shergar': Odds(4)}))
+    """
+
+    def __init__(self, path: str | PathLike) -> None:
+        """Initialises a writer, creating or overwriting the file
+
+        :param path: The path of the file
+        :type path: str | PathLike
+        """
+        self.path = path
+        self._file = open(path, "wb")  # noqa: SIM115
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+        self._runners: dict[Hashable, int] = {}
+        self._events: dict[Hashable, int] = {}
+        self._times = array("d")
+        self._event_ids = array("I")
+        self._places = array("I")
+        self._offsets = array("Q")
+        self._counts = array("I")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def write(self, time: float, event: Hashable, market: Market) -> None:
+        """Writes a snapshot of a market
+
+        :param time: The time of the snapshot, e.g. in seconds since the epoch
+        :type time: float
+        :param event: The event the market is for
+        :type event: Hashable
+        :param market: The market
+        :type market: Market
+        :raises ValueError: If the writer is closed
+        """
+        if self._file.closed:
+            raise ValueError("Writer is closed")
+
+        new = {
+            "runners": [r for r in market if r not in self._runners],
+            "events": [] if event in self._events else [event],
+        }
+        names = json.dumps(new).encode() if new["runners"] or new["events"] else b""
+        ids = array("I", (self._id(self._runners, r) for r in market))
+        prices = array("d", (nan if o is None else float(o) for o in market.values()))
+        event_id = self._id(self._events, event)
+
+        self._file.write(
+            _RECORD.pack(_TAG, event_id, time, market.places, len(ids), len(names))
+        )
+        self._file.write(names)
+        self._file.write(bytes(-len(names) % 8))
+
+        self._times.append(time)
+        self._event_ids.append(event_id)
+        self._places.append(market.places)
+        self._offsets.append(self._file.tell())
+        self._counts.append(len(ids))
+
+        self._file.write(ids.tobytes())
+        self._file.write(bytes(-ids.itemsize * len(ids) % 8))
+        self._file.write(prices.tobytes())
+
+    def close(self) -> None:
+        """Writes the footer and closes the file, if not already closed"""
+        if self._file.closed:
+            return
+
+        footer = self._file.tell()
+        for column in (
+            self._times,
+            self._offsets,
+            self._event_ids,
+            self._places,
+            self._counts,
+        ):
+            self._file.write(column.tobytes())
+        self._file.write(bytes(-self._file.tell() % 8))
+
+        names = {"runners": list(self._runners), "events": list(self._events)}
+        self._file.write(json.dumps(names).encode())
+        self._file.write(_TRAILER.pack(footer, len(self), _MAGIC))
+        self._file.close()
+
+    @staticmethod
+    def _id(ids: dict[Hashable, int], name: Hashable) -> int:
+        if (id_ := ids.get(name)) is None:
+            id_ = ids[name] = len(ids)
+        return id_
+
+
+class MarketFileReader:
+    """A memory-mapped reader of a market file written by MarketFileWriter.
+
+    Columns of every snapshot's time, event id and places, and each snapshot's runner ids and prices,
+    are exposed as memoryviews onto the mapped file without copying, and Market objects are only created
+    when a snapshot is read, so a whole file can be streamed in constant memory. If the file has no footer,
+    because its writer was not closed, the columns are rebuilt in memory by scanning its records.
+
+    Example:
+        >>> with MarketFileReader('season.markets') as reader:
+        ...     for time, event, market in reader:
+        ...         ...
+        >>> reader.times[-1]
+        1700000000.0
+    """
+
+    def __init__(self, path: str | PathLike) -> None:
+        """Initialises a reader, mapping the file into memory
+
+        :param path: The path of the file
+        :type path: str | PathLike
+        :raises ValueError: If the file is not a market file
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._map)
+        if size < _HEADER.size or _HEADER.unpack_from(self._map) != (_MAGIC, _VERSION):
+            self.close()
+            raise ValueError("File is not a market file")
+
+        view = self._view = memoryview(self._map)
+        if size < _HEADER.size + _TRAILER.size or self._map[-len(_MAGIC) :] != _MAGIC:
+            self._recover(size)
+            return
+
+        footer, count, _ = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        offsets = footer + 8 * count
+        event_ids = offsets + 8 * count
+        places = event_ids + 4 * count
+        counts = places + 4 * count
+        names_start = counts + 4 * count
+        names_start += -names_start % 8
+
+        self.times = view[footer:offsets].cast("d")
+        self._offsets = view[offsets:event_ids].cast("Q")
+        self.event_ids = view[event_ids:places].cast("I")
+        self.places = view[places:counts].cast("I")
+        self._counts = view[counts : counts + 4 * count].cast("I")
+        names = json.loads(bytes(view[names_start : size - _TRAILER.size]))
+        self.runners: list[Hashable] = names["runners"]
+        self.events: list[Hashable] = names["events"]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index: int) -> Snapshot:
+        if not -len(self) <= index < len(self):
+            raise IndexError("Snapshot index out of range")
+
+        index %= len(self)
+        ids, prices = self.arrays(index)
+        market = Market(
+            {
+                self.runners[runner]: None if isnan(price) else Odds(repr(price))
+                for runner, price in zip(ids, prices)
+            }
+        )
+        market.places = self.places[index]
+
+        return Snapshot(self.times[index], self.events[self.event_ids[index]], market)
+
+    def __iter__(self) -> Iterator[Snapshot]:
+        return (self[index] for index in range(len(self)))
+
+    # Instance methods
+
+    def arrays(self, index: int) -> tuple[memoryview[int], memoryview[float]]:
+        """Returns views of the runner ids and prices of a snapshot, without copying or creating a Market.
+        The views must be released, or no longer referenced, before the reader is closed.
+
+        :param index: The index of the snapshot
+        :type index: int
+        :return: The runner ids, indexing runners, and prices, with NaN for unpriced runners
+        :rtype: tuple[memoryview, memoryview]
+        """
+        offset, count = self._offsets[index], self._counts[index]
+        prices = offset + 4 * count + (-4 * count % 8)
+        return (
+            self._view[offset : offset + 4 * count].cast("I"),
+            self._view[prices : prices + 8 * count].cast("d"),
+        )
+
+    def _recover(self, size: int) -> None:
+        """Rebuilds the columns and names by scanning the records of a file without a footer"""
+        times, offsets = array("d"), array("Q")
+        event_ids, places, counts = array("I"), array("I"), array("I")
+        self.runners, self.events = [], []
+
+        position = _HEADER.size
+        while position + _RECORD.size <= size:
+            tag, event_id, time, places_, count, length = _RECORD.unpack_from(
+                self._map, position
+            )
+            start = position + _RECORD.size
+            ids = start + length + (-length % 8)
+            end = ids + 4 * count + (-4 * count % 8) + 8 * count
+            if tag != _TAG or end > size:
+                break
+
+            if length:
+                names = json.loads(self._map[start : start + length])
+                self.runners += names["runners"]
+                self.events += names["events"]
+            times.append(time)
+            offsets.append(ids)
+            event_ids.append(event_id)
+            places.append(places_)
+            counts.append(count)
+            position = end
+
+        self.times = memoryview(times)
+        self._offsets = memoryview(offsets)
+        self.event_ids = memoryview(event_ids)
+        self.places = memoryview(places)
+        self._counts = memoryview(counts)
+
+    def close(self) -> None:
+        """Releases the column views and unmaps the file
+
+        :raises ValueError: If views returned by arrays are still held
+        """
+        for name in ("times", "_offsets", "event_ids", "places", "_counts", "_view"):
+            if (view := getattr(self, name, None)) is not None:
+                view.release()
+
+        try:
+            self._map.close()
+        except BufferError:
+            raise ValueError(
+                "Views returned by arrays must be released first"
+            ) from None
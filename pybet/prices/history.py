@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable, Iterator
+from math import isnan, nan
+from operator import itemgetter
+from os import PathLike
+from typing import BinaryIO
+
+from ..market import Market
+from ..odds import Odds
+
+_TICK = struct.Struct("<idd")
+
+
+class _Series:
+    """The retained price ticks of one runner, with the last tick evicted before them, and the first time, offset
+    and length of each block of its ticks in the spill file"""
+
+    __slots__ = (
+        "block_counts",
+        "block_offsets",
+        "block_times",
+        "evicted",
+        "prices",
+        "times",
+    )
+
+    def __init__(self) -> None:
+        self.times = array("d")
+        self.prices = array("d")
+        self.evicted: tuple[float, float] | None = None
+        self.block_times = array("d")
+        self.block_offsets = array("Q")
+        self.block_counts = array("I")
+
+    def at(self, time: float) -> float | None:
+        index = bisect_right(self.times, time)
+        if index:
+            return self.prices[index - 1]
+        if self.evicted is not None and self.evicted[0] <= time:
+            return self.evicted[1]
+        return None
+
+
+class MarketHistory:
+    """A time-indexed history of the prices in a market, recorded as timestamped deltas.
+
+    Each runner's ticks are held in a pair of arrays of times and prices, with withdrawn prices held as NaN,
+    so queries bisect on time rather than keep copies of whole markets. Once a runner has more than the capacity
+    of ticks, its oldest half is evicted, and appended to a spill file if one is given as a block of ticks.
+    The first time and position of each runner's blocks are kept in memory, so prices before the ticks retained
+    are read back by bisecting to a single block rather than scanning the file.
+
+    Example:
+        >>> history = MarketHistory(capacity=100_000, spill='ascot.ticks')
+        >>> history.record(1_700_000_000, Market({'Frankel': Odds(3), 'Shergar': Odds(4)}))
+        >>> history.record(1_700_000_060, Market({'Frankel': Odds(2.5), 'Shergar': Odds(4)}))
+        >>> history.as_of(1_700_000_030)
+        {'Frankel': Odds('3.00'), 'Shergar': Odds('4.00')}
+        >>> history.moves(300)
+        [('Frankel', Odds('3.00'), Odds('2.50'))]
+    """
+
+    def __init__(
+        self, *, capacity: int = 10_000, spill: str | PathLike | None = None
+    ) -> None:
+        """Initialises a market history
+
+        :param capacity: The most ticks retained in memory per runner, defaults to 10,000
+        :type capacity: int, optional
+        :param spill: The path of a file to append evicted ticks to, emptied if it exists, defaults to None
+        :type spill: str | PathLike, optional
+        :raises ValueError: If the capacity is less than 2
+        """
+        if capacity < 2:
+            raise ValueError("Capacity must be at least 2")
+
+        if spill is not None:
+            open(spill, "wb").close()
+
+        self.capacity = capacity
+        self.spill = spill
+        self.places = 1
+        self.latest = -float("inf")
+        self._series: dict[Hashable, _Series] = {}
+        self._ids: dict[Hashable, int] = {}
+
+    def __contains__(self, runner: object) -> bool:
+        return runner in self._series
+
+    def __len__(self) -> int:
+        return sum(len(series.times) for series in self._series.values())
+
+    # Properties
+
+    @property
+    def runners(self) -> list[Hashable]:
+        """The runners recorded, in the order first seen, which is also the order of ids in a spill file
+
+        :return: The runners
+        :rtype: list[Hashable]
+        """
+
+        return list(self._series)
+
+    # Instance methods
+
+    def record(self, time: float, market: Market) -> None:
+        """Records a snapshot of a market, storing only the prices that have changed
+
+        :param time: The time of the snapshot, e.g. in seconds since the epoch
+        :type time: float
+        :param market: The market
+        :type market: Market
+        :raises ValueError: If the time is before the latest time recorded
+        """
+        self._advance(time)
+        self.places = market.places
+        for runner, odds in market.items():
+            self.record_price(time, runner, odds)
+
+    def record_price(self, time: float, runner: Hashable, odds: Odds | None) -> None:
+        """Records a single price change, storing it only if the price has changed
+
+        :param time: The time of the change
+        :type time: float
+        :param runner: The runner
+        :type runner: Hashable
+        :param odds: The new price, or None if withdrawn
+        :type odds: Odds, optional
+        :raises ValueError: If the time is before the latest time recorded
+        """
+        self._advance(time)
+        series = self._series.get(runner)
+        if series is None:
+            series = self._series[runner] = _Series()
+            self._ids[runner] = len(self._ids)
+
+        price = nan if odds is None else float(odds)
+        if series.prices:
+            last = series.prices[-1]
+            if last == price or (isnan(last) and isnan(price)):
+                return
+
+        if len(series.times) >= self.capacity:
+            self._evict(runner, series)
+
+        series.times.append(time)
+        series.prices.append(price)
+
+    def as_of(self, time: float) -> Market:
+        """Returns the market as it was at a given time, reading prices evicted from memory back from the spill file
+
+        :param time: The time
+        :type time: float
+        :raises ValueError: If prices at that time have been evicted and there is no spill file
+        :return: The prices of the runners priced at that time
+        :rtype: Market
+        """
+        market = Market()
+        for runner, price in self._prices_at(time).items():
+            if price is not None and not isnan(price):
+                market[runner] = _odds(price)
+
+        market.places = self.places
+        return market
+
+    def series(
+        self, runner: Hashable, start: float | None = None, end: float | None = None
+    ) -> list[tuple[float, Odds | None]]:
+        """Returns the price changes of a runner retained in memory, optionally between two times
+
+        :param runner: The runner
+        :type runner: Hashable
+        :param start: The earliest time to include, defaults to None
+        :type start: float, optional
+        :param end: The latest time to include, defaults to None
+        :type end: float, optional
+        :raises ValueError: If the runner has not been recorded
+        :return: The time and price of each change, with None for a withdrawal
+        :rtype: list[tuple[float, Odds | None]]
+        """
+        if runner not in self._series:
+            raise ValueError("Runner has not been recorded")
+
+        times = self._series[runner].times
+        prices = self._series[runner].prices
+        first = 0 if start is None else bisect_left(times, start)
+        last = len(times) if end is None else bisect_right(times, end)
+        return [
+            (times[i], None if isnan(prices[i]) else _odds(prices[i]))
+            for i in range(first, last)
+        ]
+
+    def moves(
+        self, window: float, *, now: float | None = None, top: int | None = None
+    ) -> list[tuple[Hashable, Odds, Odds]]:
+        """Returns the runners whose prices have moved most over a recent window, largest first,
+        measured by the change in implied percentage, i.e. the steamers and drifters
+
+        :param window: The length of the window, in the same units as times
+        :type window: float
+        :param now: The end of the window, defaults to the latest time recorded
+        :type now: float, optional
+        :param top: The most runners to return, defaults to all that have moved
+        :type top: int, optional
+        :raises ValueError: If prices at the start of the window have been evicted and there is no spill file
+        :return: Each runner with its price at the start and end of the window
+        :rtype: list[tuple[Hashable, Odds, Odds]]
+        """
+        end = self.latest if now is None else now
+        starts, ends = self._prices_at(end - window), self._prices_at(end)
+        moved = []
+        for runner in self._series:
+            before, after = starts[runner], ends[runner]
+            if (
+                before is not None
+                and after is not None
+                and not isnan(before)
+                and not isnan(after)
+                and before != after
+            ):
+                moved.append((abs(1 / after - 1 / before), runner, before, after))
+
+        moved.sort(key=itemgetter(0), reverse=True)
+        return [(r, _odds(b), _odds(a)) for _, r, b, a in moved[:top]]
+
+    def spilled(self) -> Iterator[tuple[float, Hashable, Odds | None]]:
+        """Reads back the ticks evicted to the spill file, in the order evicted
+
+        :raises ValueError: If there is no spill file
+        :return: The time, runner and price of each evicted tick
+        :rtype: Iterator[tuple[float, Hashable, Odds | None]]
+        """
+        if self.spill is None:
+            raise ValueError("History has no spill file")
+
+        runners = self.runners
+        for runner_id, time, price in self._ticks():
+            yield time, runners[runner_id], None if isnan(price) else _odds(price)
+
+    def _advance(self, time: float) -> None:
+        """Moves the latest time recorded on to a time, checking it is not before it"""
+        if time < self.latest:
+            raise ValueError("Time must not be before the latest time recorded")
+        self.latest = time
+
+    def _prices_at(self, time: float) -> dict[Hashable, float | None]:
+        """Returns each runner's price at a time, reading the spill file for runners evicted past it"""
+        prices: dict[Hashable, float | None] = {}
+        evicted = []
+        for runner, series in self._series.items():
+            prices[runner] = series.at(time)
+            if series.evicted is not None and time < series.evicted[0]:
+                evicted.append((runner, series))
+
+        if evicted:
+            if self.spill is None:
+                raise ValueError(
+                    "Prices at the time have been evicted and there is no spill file"
+                )
+            with open(self.spill, "rb") as file:
+                for runner, series in evicted:
+                    prices[runner] = _spilled_at(file, series, time)
+
+        return prices
+
+    def _ticks(self) -> Iterator[tuple[int, float, float]]:
+        """Reads the runner id, time and price of each tick in the spill file"""
+        assert self.spill is not None
+        with open(self.spill, "rb") as file:
+            while chunk := file.read(_TICK.size * 4096):
+                yield from _TICK.iter_unpack(chunk)
+
+    def _evict(self, runner: Hashable, series: _Series) -> None:
+        half = len(series.times) // 2
+        if self.spill is not None:
+            runner_id = self._ids[runner]
+            with open(self.spill, "ab") as file:
+                series.block_times.append(series.times[0])
+                series.block_offsets.append(file.tell())
+                series.block_counts.append(half)
+                file.writelines(
+                    _TICK.pack(runner_id, series.times[i], series.prices[i])
+                    for i in range(half)
+                )
+
+        series.evicted = (series.times[half - 1], series.prices[half - 1])
+        del series.times[:half]
+        del series.prices[:half]
+
+
+def _spilled_at(file: BinaryIO, series: _Series, time: float) -> float | None:
+    """Returns a runner's price at a time from the one block of its spilled ticks spanning it"""
+    block = bisect_right(series.block_times, time) - 1
+    if block < 0:
+        return None
+
+    file.seek(series.block_offsets[block])
+    ticks = list(_TICK.iter_unpack(file.read(_TICK.size * series.block_counts[block])))
+    index = bisect_right(ticks, time, key=itemgetter(1))
+    return ticks[index - 1][2]
+
+
+def _odds(price: float) -> Odds:
+    return Odds(repr(price))
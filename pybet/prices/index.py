@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+from decimal import Decimal
+from operator import itemgetter
+
+from ..market import Market
+from ..odds import Odds
+
+_TOLERANCE = Decimal("1e-12")
+_WIN_PERCENTAGE = Market()._fair_percentage
+
+
+class BestPriceIndex:
+    """An index of the best price available for each runner in many events across many bookmakers,
+    with the percentage of each event's best-price book, i.e. the book formed by backing every runner
+    at its best price.
+
+    Each price change adjusts the best-price book of its event by the change in that runner's best price,
+    so events whose best-price book falls below the fair percentage, i.e. arbitrages, are flagged in
+    constant time. Only when the bookmaker offering a runner's best price shortens it are that runner's
+    other prices rescanned. Runners priced by no bookmaker are left out of an event's book. An event's places are
+    set by the first market given for it, and every bookmaker's market for the event must have the same places.
+
+    Example:
+        >>> index = BestPriceIndex()
+        >>> index.update('2:30 Ascot', 'Bet365', Market({'Frankel': Odds(2), 'Shergar': Odds(1.9)}))
+        >>> index.update('2:30 Ascot', 'Coral', Market({'Frankel': Odds(1.8), 'Shergar': Odds(2.2)}))
+        >>> index.best_price('2:30 Ascot', 'Shergar')
+        (Odds('2.20'), 'Coral')
+        >>> index.arbitrages
+        {'2:30 Ascot'}
+    """
+
+    def __init__(self) -> None:
+        self._prices: dict[Hashable, dict[Hashable, dict[Hashable, Odds]]] = {}
+        self._best: dict[Hashable, dict[Hashable, tuple[Odds, Hashable]]] = {}
+        self._books: dict[Hashable, Decimal] = {}
+        self._places: dict[Hashable, int] = {}
+        self._fair: dict[Hashable, int] = {}
+        self._arbitrages: set[Hashable] = set()
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._prices
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    # Properties
+
+    @property
+    def arbitrages(self) -> set[Hashable]:
+        """The events whose best-price book is below the fair percentage
+
+        :return: The events with an arbitrage
+        :rtype: set[Hashable]
+        """
+
+        return set(self._arbitrages)
+
+    # Instance methods
+
+    def update(self, event: Hashable, bookmaker: Hashable, market: Market) -> None:
+        """Sets a bookmaker's prices for the runners in an event's market, setting the event's places from the
+        first market given for it
+
+        :param event: The event the market is for
+        :type event: Hashable
+        :param bookmaker: The bookmaker offering the market
+        :type bookmaker: Hashable
+        :param market: The bookmaker's market, where a price of None withdraws any price for that runner
+        :type market: Market
+        :raises ValueError: If the market's places differ from the event's
+        """
+        places = self._places.setdefault(event, market.places)
+        if market.places != places:
+            raise ValueError(f"Event has {places} places, not {market.places}")
+
+        self._fair[event] = market._fair_percentage
+        for runner, odds in market.items():
+            self.set_price(event, bookmaker, runner, odds)
+        self._flag(event)
+
+    def set_price(
+        self, event: Hashable, bookmaker: Hashable, runner: Hashable, odds: Odds | None
+    ) -> None:
+        """Sets or withdraws a single price offered by a bookmaker
+
+        :param event: The event the runner is in
+        :type event: Hashable
+        :param bookmaker: The bookmaker offering the price
+        :type bookmaker: Hashable
+        :param runner: The runner the price is for
+        :type runner: Hashable
+        :param odds: The price, or None to withdraw it
+        :type odds: Odds, optional
+        :raises ValueError: If the odds are not an instance of Odds or None
+        """
+        if odds is not None and not isinstance(odds, Odds):
+            raise ValueError("Odds must be an instance of Odds or None")
+
+        prices = self._prices.setdefault(event, {}).setdefault(runner, {})
+        best = self._best.setdefault(event, {})
+        current = best.get(runner)
+
+        if odds is None:
+            prices.pop(bookmaker, None)
+        else:
+            prices[bookmaker] = odds
+
+        new: tuple[Odds, Hashable] | None
+        if odds is not None and (current is None or odds > current[0]):
+            new = (odds, bookmaker)
+        elif current is not None and current[1] == bookmaker:
+            new = _best(prices)
+        else:
+            return
+
+        change = -_percentage(current) + _percentage(new)
+        if new is None:
+            best.pop(runner)
+        else:
+            best[runner] = new
+        self._books[event] = self._books.get(event, Decimal(0)) + change
+        self._flag(event)
+
+    def remove(self, event: Hashable) -> None:
+        """Removes an event and all its prices, e.g. once it has been run
+
+        :param event: The event to remove
+        :type event: Hashable
+        :raises ValueError: If the event is not in the index
+        """
+        if event not in self._prices:
+            raise ValueError("Event is not in the index")
+
+        del self._prices[event]
+        self._best.pop(event, None)
+        self._books.pop(event, None)
+        self._places.pop(event, None)
+        self._fair.pop(event, None)
+        self._arbitrages.discard(event)
+
+    def best_price(self, event: Hashable, runner: Hashable) -> tuple[Odds, Hashable]:
+        """Returns the best price for a runner and the bookmaker offering it
+
+        :param event: The event the runner is in
+        :type event: Hashable
+        :param runner: The runner
+        :type runner: Hashable
+        :raises ValueError: If no bookmaker prices the runner
+        :return: The best price and its bookmaker
+        :rtype: tuple[Odds, Hashable]
+        """
+        if (best := self._best.get(event, {}).get(runner)) is None:
+            raise ValueError("Runner is not priced")
+
+        return best
+
+    def best_market(self, event: Hashable) -> Market:
+        """Returns a market of the best price for each runner in an event
+
+        :param event: The event
+        :type event: Hashable
+        :raises ValueError: If the event is not in the index
+        :return: The best-price market, with the event's places
+        :rtype: Market
+        """
+        if event not in self._prices:
+            raise ValueError("Event is not in the index")
+
+        market = Market(
+            {runner: odds for runner, (odds, _) in self._best[event].items()}
+        )
+        market.places = self._places.get(event, 1)
+        return market
+
+    def percentage(self, event: Hashable) -> Decimal:
+        """Returns the percentage of an event's best-price book
+
+        :param event: The event
+        :type event: Hashable
+        :raises ValueError: If the event is not in the index
+        :return: The best-price book percentage
+        :rtype: Decimal
+        """
+        if event not in self._prices:
+            raise ValueError("Event is not in the index")
+
+        return self._books.get(event, Decimal(0))
+
+    def _flag(self, event: Hashable) -> None:
+        book = self._books.get(event, Decimal(0))
+        fair = self._fair.get(event, _WIN_PERCENTAGE)
+        if self._best.get(event) and book < fair - _TOLERANCE:
+            self._arbitrages.add(event)
+        else:
+            self._arbitrages.discard(event)
+
+
+def _best(prices: dict[Hashable, Odds]) -> tuple[Odds, Hashable] | None:
+    return max(
+        ((odds, bookmaker) for bookmaker, odds in prices.items()),
+        key=itemgetter(0),
+        default=None,
+    )
+
+
+def _percentage(price: tuple[Odds, Hashable] | None) -> Decimal:
+    return Decimal(0) if price is None else price[0].to_percentage()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Mapping
+from math import isnan, nan
+from multiprocessing import shared_memory
+from typing import Any, Self
+
+from ..market import Market
+from ..odds import Odds
+
+_RETRIES = 1000
+
+
+class SharedMarketBook:
+    """A book of live markets held in shared memory, which worker processes can read without copying.
+
+    The events and runners are fixed when the book is created, and each event's prices are held as a row of floats,
+    with NaN for unpriced runners, alongside its places and a version counter. Pickling the book, e.g. to pass it
+    to a process pool's initializer, sends only the names of the shared memory block, events and runners, and
+    the receiving process attaches to the same block, so later updates are seen without re-pickling. Each write
+    makes the event's version odd until done, and readers retry until they see the same even version before and
+    after reading, so a market is never read half-updated. The version is bumped without a lock, so the book has a
+    single writer: only the process that created it can write, and attached copies are read-only. Threads in the
+    creating process must not write at the same time.
+
+    Example:
+        >>> book = SharedMarketBook({'2:30 Ascot': Market({'Frankel': Odds(3), 'Shergar': Odds(4)})})
+        >>> with ProcessPoolExecutor(initializer=attach, initargs=(book,)) as pool:
+        ...     book.set_price('2:30 Ascot', 'Frankel', Odds(2.5))
+        ...     pool.submit(analyse, '2:30 Ascot')
+        >>> book.close()
+        >>> book.unlink()
+    """
+
+    def __init__(self, markets: Mapping[Hashable, Market]) -> None:
+        """Initialises a book, creating a shared memory block holding the markets
+
+        :param markets: The market for each event, whose runners are fixed from then on
+        :type markets: Mapping[Hashable, Market]
+        :raises ValueError: If there are no markets
+        """
+        if not markets:
+            raise ValueError("Book must have at least one market")
+
+        runners = {event: list(market) for event, market in markets.items()}
+        width = max(1, *(len(r) for r in runners.values()))
+        self._attach(None, runners, width)
+
+        for event, market in markets.items():
+            self[event] = market
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_attach, (self._memory.name, self._runners, self._width))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, event: Hashable) -> Market:
+        row = self._row(event)
+        prices, places = self._read(row)
+        market = Market(
+            {
+                runner: None if isnan(price) else Odds(repr(price))
+                for runner, price in zip(self._runners[event], prices)
+            }
+        )
+        market.places = places
+        return market
+
+    def __setitem__(self, event: Hashable, market: Market) -> None:
+        row = self._row(event)
+        if unknown := market.keys() - set(self._runners[event]):
+            raise ValueError(f"Runners not in book: {unknown}")
+
+        start = row * self._width
+        values = [
+            nan if market.get(runner) is None else float(market[runner])
+            for runner in self._runners[event]
+        ]
+        self._begin(row)
+        self._prices[start : start + len(values)] = array("d", values)
+        self._places[row] = market.places
+        self._end(row)
+
+    # Properties
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block
+
+        :return: The name of the block
+        :rtype: str
+        """
+
+        return self._memory.name
+
+    # Instance methods
+
+    def runners(self, event: Hashable) -> list[Hashable]:
+        """Returns the runners in an event, in the order of its prices
+
+        :param event: The event
+        :type event: Hashable
+        :raises ValueError: If the event is not in the book
+        :return: The runners
+        :rtype: list[Hashable]
+        """
+        self._row(event)
+
+        return list(self._runners[event])
+
+    def prices(self, event: Hashable) -> memoryview[float]:
+        """Returns a view of an event's prices in shared memory, without copying or checking its version
+
+        :param event: The event
+        :type event: Hashable
+        :raises ValueError: If the event is not in the book
+        :return: The price of each runner, in the order of runners, with NaN for unpriced runners
+        :rtype: memoryview
+        """
+        start = self._row(event) * self._width
+
+        return self._prices[start : start + len(self._runners[event])]
+
+    def set_price(self, event: Hashable, runner: Hashable, odds: Odds | None) -> None:
+        """Sets a single runner's price
+
+        :param event: The event the runner is in
+        :type event: Hashable
+        :param runner: The runner
+        :type runner: Hashable
+        :param odds: The price, or None if unpriced
+        :type odds: Odds, optional
+        :raises ValueError: If the event or runner is not in the book, or the book was not created by this process
+        """
+        row = self._row(event)
+        if runner not in self._columns[event]:
+            raise ValueError("Runner is not in the book")
+
+        self._begin(row)
+        self._prices[row * self._width + self._columns[event][runner]] = (
+            nan if odds is None else float(odds)
+        )
+        self._end(row)
+
+    def close(self) -> None:
+        """Releases the views and detaches this process from the shared memory block"""
+        for view in (self._versions, self._places, self._prices):
+            view.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Frees the shared memory block once every process has closed the book"""
+        self._memory.unlink()
+
+    def _attach(
+        self, name: str | None, runners: dict[Hashable, list[Hashable]], width: int
+    ) -> None:
+        count = len(runners)
+        size = 8 * count * (2 + width)
+        self._memory = shared_memory.SharedMemory(name, create=name is None, size=size)
+        self._writer = name is None
+        self._runners = runners
+        self._width = width
+        self._rows = {event: row for row, event in enumerate(runners)}
+        self._columns = {
+            event: {runner: column for column, runner in enumerate(names)}
+            for event, names in runners.items()
+        }
+        buffer = self._memory.buf
+        assert buffer is not None
+        self._versions = buffer[: 8 * count].cast("Q")
+        self._places = buffer[8 * count : 16 * count].cast("Q")
+        self._prices = buffer[16 * count : size].cast("d")
+
+    def _row(self, event: Hashable) -> int:
+        if (row := self._rows.get(event)) is None:
+            raise ValueError("Event is not in the book")
+        return row
+
+    def _begin(self, row: int) -> None:
+        if not self._writer:
+            raise ValueError("Book can only be written by the process that created it")
+        self._versions[row] += 1
+
+    def _end(self, row: int) -> None:
+        self._versions[row] += 1
+
+    def _read(self, row: int) -> tuple[list[Any], int]:
+        start = row * self._width
+        for _ in range(_RETRIES):
+            version = self._versions[row]
+            if version % 2 == 0:
+                prices = self._prices[start : start + self._width].tolist()
+                places = self._places[row]
+                if self._versions[row] == version:
+                    return prices, places
+        raise RuntimeError("Market is being written too often to read")
+
+
+def _attach(
+    name: str, runners: dict[Hashable, list[Hashable]], width: int
+) -> SharedMarketBook:
+    book = SharedMarketBook.__new__(SharedMarketBook)
+    book._attach(name, runners, width)
+    return book
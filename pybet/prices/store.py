@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from decimal import Decimal
+from threading import Lock
+
+from ..market import Market
+from ..odds import Odds
+
+
+class MarketStore:
+    """A store of many live markets shared between threads, e.g. by the workers of a pricing service.
+
+    A Market is a dict, so one thread updating prices while another runs apply_margin or derive on it can see
+    some prices old and some new, or fail with "dictionary changed size during iteration". The store guards
+    its markets with a fixed set of locks, each covering the events whose hash falls to it, so threads working
+    on different events rarely wait for each other. Reads return copies taken under the lock, and calculations
+    such as derive run on those copies after the lock is released, so they see one consistent version of the
+    market without holding up writers. The same holds without the GIL, e.g. on free-threaded CPython.
+
+    Example:
+        >>> store = MarketStore({'2:30 Ascot': Market({'Frankel': Odds(3), 'Shergar': Odds(4)})})
+        >>> store.set_price('2:30 Ascot', 'Frankel', Odds(2.5))
+        >>> store.percentage('2:30 Ascot')
+        Decimal('65')
+        >>> with store.modify('2:30 Ascot') as market:
+        ...     market.apply_margin(10)
+    """
+
+    def __init__(
+        self, markets: Mapping[Hashable, Market] | None = None, *, stripes: int = 64
+    ) -> None:
+        """Initialises a store, optionally with a copy of each of the given markets
+
+        :param markets: The market for each event, defaults to None
+        :type markets: Mapping[Hashable, Market], optional
+        :param stripes: The number of locks shared between the events, defaults to 64
+        :type stripes: int, optional
+        :raises ValueError: If stripes is less than 1
+        """
+        if stripes < 1:
+            raise ValueError("Stripes must be at least 1")
+
+        self._locks = [Lock() for _ in range(stripes)]
+        self._markets: dict[Hashable, Market] = {}
+        for event, market in (markets or {}).items():
+            self[event] = market
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._markets
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._markets))
+
+    def __getitem__(self, event: Hashable) -> Market:
+        with self._lock(event):
+            return _copy(self._markets[event])
+
+    def __setitem__(self, event: Hashable, market: Market) -> None:
+        market = _copy(market)
+        with self._lock(event):
+            self._markets[event] = market
+
+    def __delitem__(self, event: Hashable) -> None:
+        with self._lock(event):
+            del self._markets[event]
+
+    # Instance methods
+
+    def set_price(self, event: Hashable, runner: Hashable, odds: Odds | None) -> None:
+        """Sets the price of a runner, adding the event if it is not yet in the store
+
+        :param event: The event
+        :type event: Hashable
+        :param runner: The runner
+        :type runner: Hashable
+        :param odds: The runner's odds, or None if unpriced
+        :type odds: Odds, optional
+        """
+
+        with self._lock(event):
+            self._markets.setdefault(event, Market())[runner] = odds
+
+    def update(self, event: Hashable, prices: Mapping[Hashable, Odds | None]) -> None:
+        """Sets the prices of many runners in an event at once, so no reader sees only some of them changed
+
+        :param event: The event
+        :type event: Hashable
+        :param prices: The odds of each runner, or None if unpriced
+        :type prices: Mapping[Hashable, Odds | None]
+        """
+
+        with self._lock(event):
+            market = self._markets.setdefault(event, Market())
+            for runner, odds in prices.items():
+                market[runner] = odds
+
+    def batch(self, updates: Iterable[tuple[Hashable, Hashable, Odds | None]]) -> None:
+        """Sets many prices across many events, taking each lock once for all of its events' prices.
+        Each event's prices change together, though different events may be seen changed at different times.
+
+        :param updates: The event, runner and odds, or None if unpriced, of each price
+        :type updates: Iterable[tuple[Hashable, Hashable, Odds | None]]
+        """
+        grouped: dict[int, dict[Hashable, dict[Hashable, Odds | None]]] = {}
+        for event, runner, odds in updates:
+            events = grouped.setdefault(self._stripe(event), {})
+            events.setdefault(event, {})[runner] = odds
+
+        for stripe, events in grouped.items():
+            with self._locks[stripe]:
+                for event, prices in events.items():
+                    market = self._markets.setdefault(event, Market())
+                    for runner, odds in prices.items():
+                        market[runner] = odds
+
+    @contextmanager
+    def modify(self, event: Hashable) -> Iterator[Market]:
+        """Holds the lock of an event while its live market is changed in place, e.g. by apply_margin.
+        The store must not be used again within the block, as its lock may be the one held.
+
+        :param event: The event
+        :type event: Hashable
+        :raises KeyError: If the event is not in the store
+        :return: The event's market
+        :rtype: Market
+        """
+
+        with self._lock(event):
+            yield self._markets[event]
+
+    def snapshot(self) -> dict[Hashable, Market]:
+        """Returns a copy of every market as they all stood at one moment, holding every lock while copying
+
+        :return: The market of each event
+        :rtype: dict[Hashable, Market]
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            return {event: _copy(market) for event, market in self._markets.items()}
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def percentage(self, event: Hashable) -> Decimal:
+        """Returns the percentage of an event's market as it stands
+
+        :param event: The event
+        :type event: Hashable
+        :raises KeyError: If the event is not in the store
+        :return: The market percentage
+        :rtype: Decimal
+        """
+
+        return self[event].percentage
+
+    def derive(
+        self, event: Hashable, places: int, *, discounts: list[float] | None = None
+    ) -> Market:
+        """Derives a place market from an event's win market as it stands, see Market.derive
+
+        :param event: The event
+        :type event: Hashable
+        :param places: The number of places to derive the market for
+        :type places: int
+        :param discounts: A list of discounts to apply to the probability of each runner, defaults to None
+        :type discounts: list[float], optional
+        :raises KeyError: If the event is not in the store
+        :raises ValueError: If the number of places is invalid or the market is not a win market
+        :return: The derived market
+        :rtype: Market
+        """
+
+        return self[event].derive(places, discounts=discounts)
+
+    def _stripe(self, event: Hashable) -> int:
+        return hash(event) % len(self._locks)
+
+    def _lock(self, event: Hashable) -> Lock:
+        return self._locks[self._stripe(event)]
+
+
+def _copy(market: Market) -> Market:
+    """Copies a market and its attributes, e.g. places, without revalidating its odds"""
+    copy = market.__class__()
+    dict.update(copy, market)
+    copy.__dict__.update(market.__dict__)
+    return copy
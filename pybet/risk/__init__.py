@@ -0,0 +1,13 @@
+from .cashout import CashOutBook
+from .distribution import ReturnDistribution, return_distribution
+from .liability import LiabilityBook
+from .repricing import Repricer, reprice
+
+__all__ = [
+    "CashOutBook",
+    "LiabilityBook",
+    "Repricer",
+    "ReturnDistribution",
+    "reprice",
+    "return_distribution",
+]
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable
+from decimal import Decimal
+from math import fsum, prod
+
+from ..bets import Bet, EachWay
+from ..market import Market
+from ..odds import Odds
+
+
+class CashOutBook:
+    """A book of open singles and accumulators valued for cash-out from live market prices.
+
+    Fair probabilities are cached per market, and each bet's value, i.e. its potential returns multiplied by
+    the fair probability of all its unresolved legs winning, is held in an array. Updating a market only
+    revalues the bets with a leg in it, and the book total is summed from the array when read.
+
+    Example:
+        >>> book = CashOutBook(margin=5)
+        >>> book.update('2:30 Ascot', Market({'Frankel': Odds(2), 'Nijinsky': Odds(2)}))
+        >>> book.add(Bet(10, Odds(3), frankel_wins), ('2:30 Ascot', 'Frankel'))
+        >>> book.value(bet)
+        Decimal('14.25')
+    """
+
+    def __init__(self, *, margin: Decimal | float = 0) -> None:
+        """Initialises a cash-out book
+
+        :param margin: The percentage deducted from fair value when cashing out, defaults to 0
+        :type margin: Decimal, optional
+        :raises ValueError: If the margin is not between 0 and 100
+        """
+        if not 0 <= margin <= 100:
+            raise ValueError("Margin must be between 0 and 100")
+
+        self.margin = margin
+        self._factor = 1 - float(margin) / 100
+        self._probabilities: dict[Hashable, dict[Hashable, float]] = {}
+        self._bets: list[Bet] = []
+        self._rows: dict[Bet, int] = {}
+        self._legs: list[tuple[tuple[Hashable, Hashable], ...]] = []
+        self._payouts = array("d")
+        self._values = array("d")
+        self._by_event: dict[Hashable, set[int]] = {}
+
+    def __contains__(self, bet: object) -> bool:
+        return bet in self._rows
+
+    def __len__(self) -> int:
+        return len(self._bets)
+
+    # Properties
+
+    @property
+    def total(self) -> Decimal:
+        """The total cash-out value of the book
+
+        :return: The total cash-out value
+        :rtype: Decimal
+        """
+
+        return round(Decimal(fsum(self._values)) * Decimal(self._factor), 2)
+
+    # Instance methods
+
+    def update(self, event: Hashable, market: Market) -> None:
+        """Sets the live market for an event, revaluing only the bets with a leg in that event
+
+        :param event: The event the market is for
+        :type event: Hashable
+        :param market: The live market
+        :type market: Market
+        :raises ValueError: If the market has no prices
+        """
+        priced = Market()
+        priced.places = market.places
+        for runner, odds in market.items():
+            if odds is not None:
+                priced[runner] = odds
+        if not priced:
+            raise ValueError("Market has no prices")
+
+        scale = priced._fair_percentage / priced.percentage
+        self._probabilities[event] = {
+            r: float(o.to_probability() * scale) for r, o in priced.items()
+        }
+
+        for row in self._by_event.get(event, ()):
+            self._revalue(row)
+
+    def add(
+        self, bet: Bet, *legs: tuple[Hashable, Hashable], odds: Odds | None = None
+    ) -> None:
+        """Adds an open bet to the book with its unresolved legs, one for a single or several for an accumulator
+
+        :param bet: The bet to add
+        :type bet: Bet
+        :param legs: The (event, runner) of each unresolved leg of the bet
+        :type legs: tuple[Hashable, Hashable]
+        :param odds: The odds of the bet, required for SP bets, defaults to the bet's odds
+        :type odds: Odds, optional
+        :raises ValueError: If the bet is already in the book, each-way or has no legs
+        :raises ValueError: If the bet is at SP and no odds are given
+        :raises ValueError: If there is no market for a leg's event
+        """
+        if bet in self._rows:
+            raise ValueError("Bet is already in the book")
+
+        if isinstance(bet, EachWay):
+            raise ValueError("Each-way bets are not supported")
+
+        if not legs:
+            raise ValueError("Bet must have at least one unresolved leg")
+
+        price = odds or bet.odds
+        if not isinstance(price, Odds):
+            raise ValueError("Odds must be given for SP bets")
+
+        if missing := {event for event, _ in legs} - set(self._probabilities):
+            raise ValueError(f"No market for events: {missing}")
+
+        row = len(self._bets)
+        self._bets.append(bet)
+        self._rows[bet] = row
+        self._legs.append(tuple(legs))
+        self._payouts.append(float(bet.stake * price))
+        self._values.append(0.0)
+        for event, _ in legs:
+            self._by_event.setdefault(event, set()).add(row)
+        self._revalue(row)
+
+    def remove(self, bet: Bet) -> None:
+        """Removes a bet from the book, e.g. once cashed out or settled
+
+        :param bet: The bet to remove
+        :type bet: Bet
+        :raises ValueError: If the bet is not in the book
+        """
+        if bet not in self._rows:
+            raise ValueError("Bet is not in the book")
+
+        row = self._rows.pop(bet)
+        last = len(self._bets) - 1
+        for event, _ in self._legs[row]:
+            self._by_event[event].discard(row)
+
+        if row != last:
+            moved = self._bets[last]
+            self._bets[row] = moved
+            self._rows[moved] = row
+            self._legs[row] = self._legs[last]
+            self._payouts[row] = self._payouts[last]
+            self._values[row] = self._values[last]
+            for event, _ in self._legs[row]:
+                self._by_event[event].discard(last)
+                self._by_event[event].add(row)
+
+        self._bets.pop()
+        self._legs.pop()
+        self._payouts.pop()
+        self._values.pop()
+
+    def value(self, bet: Bet) -> Decimal:
+        """Returns the cash-out value of a bet
+
+        :param bet: The bet to value
+        :type bet: Bet
+        :raises ValueError: If the bet is not in the book
+        :return: The cash-out value to 2 decimal places
+        :rtype: Decimal
+        """
+        if bet not in self._rows:
+            raise ValueError("Bet is not in the book")
+
+        return round(Decimal(self._values[self._rows[bet]] * self._factor), 2)
+
+    def values(self) -> dict[Bet, Decimal]:
+        """Returns the cash-out value of every bet in the book
+
+        :return: The cash-out value of each bet to 2 decimal places
+        :rtype: dict[Bet, Decimal]
+        """
+
+        return {
+            bet: round(Decimal(value * self._factor), 2)
+            for bet, value in zip(self._bets, self._values)
+        }
+
+    def _revalue(self, row: int) -> None:
+        probability = prod(
+            self._probabilities[event].get(runner, 0.0)
+            for event, runner in self._legs[row]
+        )
+        self._values[row] = self._payouts[row] * probability
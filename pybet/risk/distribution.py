@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import cmath
+import random
+from bisect import bisect_left
+from collections.abc import Hashable, Iterable, Iterator, Mapping, Sequence
+from decimal import Decimal
+from itertools import accumulate, product
+from math import prod
+from typing import Literal
+
+from ..bets import Bet, EachWay
+from ..market import Market
+from ..odds import Odds
+
+Position = tuple[Bet, Sequence[tuple[Hashable, Hashable]]]
+Legs = frozenset[tuple[Hashable, Hashable]]
+
+_DIRECT_LIMIT = 1 << 16
+
+
+class ReturnDistribution:
+    """The probability distribution of the profit or loss of a portfolio of bets
+
+    Example:
+        >>> dist = return_distribution(positions, markets)
+        >>> dist.probability_of_loss
+        0.62
+        >>> dist.value_at_risk(0.95)
+        Decimal('40.00')
+    """
+
+    def __init__(self, outcomes: Mapping[float, float]) -> None:
+        """Initialises a distribution from profits and their probabilities
+
+        :param outcomes: The probability of each profit or loss
+        :type outcomes: Mapping[float, float]
+        :raises ValueError: If there are no outcomes
+        """
+        if not outcomes:
+            raise ValueError("Distribution must have at least one outcome")
+
+        total = sum(outcomes.values())
+        self._values = sorted(outcomes)
+        self._probabilities = [outcomes[value] / total for value in self._values]
+        self._cumulative = list(accumulate(self._probabilities))
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        return zip(self._values, self._probabilities)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    # Properties
+
+    @property
+    def mean(self) -> Decimal:
+        """The expected profit or loss
+
+        :return: The expected profit or loss to 2 decimal places
+        :rtype: Decimal
+        """
+
+        return _money(sum(v * p for v, p in self))
+
+    @property
+    def probability_of_loss(self) -> float:
+        """The probability that the portfolio makes a loss
+
+        :return: The probability of a loss
+        :rtype: float
+        """
+
+        return sum(p for v, p in self if v < 0)
+
+    # Instance methods
+
+    def quantile(self, q: float) -> Decimal:
+        """Returns the smallest profit or loss with at least the given probability of not being exceeded
+
+        :param q: The quantile, between 0 and 1
+        :type q: float
+        :raises ValueError: If the quantile is not between 0 and 1
+        :return: The profit or loss at the quantile to 2 decimal places
+        :rtype: Decimal
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+
+        index = bisect_left(self._cumulative, q - 1e-12)
+        return _money(self._values[min(index, len(self._values) - 1)])
+
+    def value_at_risk(self, level: float = 0.95) -> Decimal:
+        """Returns the loss that will not be exceeded at the given confidence level
+
+        :param level: The confidence level, defaults to 0.95
+        :type level: float, optional
+        :return: The value at risk, as a positive loss, to 2 decimal places
+        :rtype: Decimal
+        """
+
+        return max(-self.quantile(1 - level), Decimal(0))
+
+
+def return_distribution(
+    positions: Iterable[Position],
+    markets: Mapping[Hashable, Market],
+    *,
+    step: float = 1.0,
+    method: Literal["auto", "exact", "monte_carlo"] = "auto",
+    max_outcomes: int = 100_000,
+    samples: int = 100_000,
+    seed: int | None = None,
+) -> ReturnDistribution:
+    """Computes the distribution of the profit or loss of a portfolio of singles and accumulators,
+    given the fair probabilities of the markets their legs are in.
+
+    Events are independent and each has one winner. Bets on the same legs are pooled and events linked by
+    accumulators are grouped. Each group's outcomes are enumerated exactly, or sampled by Monte Carlo if there
+    are too many, and the independent groups' distributions are then convolved, using an FFT when they are large.
+
+    :param positions: Each bet with the (event, runner) of each of its legs
+    :type positions: Iterable[tuple[Bet, Sequence[tuple[Hashable, Hashable]]]]
+    :param markets: The market for each event
+    :type markets: Mapping[Hashable, Market]
+    :param step: The width of the grid returns are rounded to, defaults to 1.0
+    :type step: float, optional
+    :param method: Whether to enumerate, sample or choose per group by max_outcomes, defaults to "auto"
+    :type method: str, optional
+    :param max_outcomes: The most joint outcomes in a group to enumerate when method is "auto", defaults to 100,000
+    :type max_outcomes: int, optional
+    :param samples: The number of Monte Carlo samples per group, defaults to 100,000
+    :type samples: int, optional
+    :param seed: A seed for Monte Carlo sampling, defaults to None
+    :type seed: int, optional
+    :raises ValueError: If a bet is each-way, at SP or has no legs
+    :raises ValueError: If there is no market for a leg's event, or it is a place market
+    :return: The distribution of profit or loss
+    :rtype: ReturnDistribution
+    """
+    if step <= 0:
+        raise ValueError("Step must be greater than 0")
+
+    stakes = 0.0
+    combinations: dict[Legs, float] = {}
+    parent: dict[Hashable, Hashable] = {}
+
+    for bet, legs in positions:
+        payout = _payout(bet, legs, markets)
+        stakes += float(bet.stake)
+        key = frozenset(legs)
+        combinations[key] = combinations.get(key, 0.0) + payout
+        events = [event for event, _ in legs]
+        for event in events:
+            parent.setdefault(event, event)
+        for event in events[1:]:
+            parent[_root(parent, event)] = _root(parent, events[0])
+
+    components: dict[Hashable, list[tuple[float, Legs]]] = {}
+    for key, payout in combinations.items():
+        event, _ = next(iter(key))
+        components.setdefault(_root(parent, event), []).append((payout, key))
+
+    rng = random.Random(seed)
+    distribution = {0: 1.0}
+    for bets in components.values():
+        probabilities = _probabilities(bets, markets)
+        outcomes = prod(len(p) for p in probabilities.values())
+        sample = method == "monte_carlo" or (
+            method == "auto" and outcomes > max_outcomes
+        )
+        component = (
+            _sampled(bets, probabilities, step, samples, rng)
+            if sample
+            else _enumerated(bets, probabilities, step)
+        )
+        distribution = _convolve(distribution, component)
+
+    return ReturnDistribution(
+        {
+            round(index * step - stakes, 9): probability
+            for index, probability in distribution.items()
+        }
+    )
+
+
+def _payout(
+    bet: Bet,
+    legs: Sequence[tuple[Hashable, Hashable]],
+    markets: Mapping[Hashable, Market],
+) -> float:
+    if isinstance(bet, EachWay):
+        raise ValueError("Each-way bets are not supported")
+
+    if not isinstance(bet.odds, Odds):
+        raise ValueError("SP bets are not supported")
+
+    if not legs:
+        raise ValueError("Bet must have at least one leg")
+
+    if missing := {event for event, _ in legs} - set(markets):
+        raise ValueError(f"No market for events: {missing}")
+
+    if places := {event for event, _ in legs if markets[event].places != 1}:
+        raise ValueError(f"Place markets are not supported: {places}")
+
+    return float(bet.stake * bet.odds)
+
+
+def _root(parent: dict[Hashable, Hashable], event: Hashable) -> Hashable:
+    while parent[event] != event:
+        parent[event] = parent[parent[event]]
+        event = parent[event]
+    return event
+
+
+def _probabilities(
+    bets: list[tuple[float, Legs]],
+    markets: Mapping[Hashable, Market],
+) -> dict[Hashable, dict[Hashable, float]]:
+    """Returns the fair win probability of each runner in each event the bets cover"""
+    probabilities = {}
+    for event in {event for _, legs in bets for event, _ in legs}:
+        priced = Market()
+        priced.places = markets[event].places
+        for runner, odds in markets[event].items():
+            if odds is not None:
+                priced[runner] = odds
+        scale = priced._fair_percentage / priced.percentage
+        probabilities[event] = {
+            r: float(o.to_probability() * scale) for r, o in priced.items()
+        }
+    return probabilities
+
+
+def _enumerated(
+    bets: list[tuple[float, Legs]],
+    probabilities: dict[Hashable, dict[Hashable, float]],
+    step: float,
+) -> dict[int, float]:
+    """Returns the exact distribution of payouts by enumerating every joint outcome"""
+    events = list(probabilities)
+    distribution: dict[int, float] = {}
+    for winners in product(*(probabilities[e].items() for e in events)):
+        outcome = dict(zip(events, (runner for runner, _ in winners)))
+        probability = prod(p for _, p in winners)
+        payout = sum(
+            payout
+            for payout, legs in bets
+            if all(outcome[event] == runner for event, runner in legs)
+        )
+        index = round(payout / step)
+        distribution[index] = distribution.get(index, 0.0) + probability
+    return distribution
+
+
+def _sampled(
+    bets: list[tuple[float, Legs]],
+    probabilities: dict[Hashable, dict[Hashable, float]],
+    step: float,
+    samples: int,
+    rng: random.Random,
+) -> dict[int, float]:
+    """Returns an estimated distribution of payouts from sampled joint outcomes"""
+    events = list(probabilities)
+    draws = {
+        event: rng.choices(
+            list(probabilities[event]), list(probabilities[event].values()), k=samples
+        )
+        for event in events
+    }
+    distribution: dict[int, float] = {}
+    for i in range(samples):
+        payout = sum(
+            payout
+            for payout, legs in bets
+            if all(draws[event][i] == runner for event, runner in legs)
+        )
+        index = round(payout / step)
+        distribution[index] = distribution.get(index, 0.0) + 1 / samples
+    return distribution
+
+
+def _convolve(a: dict[int, float], b: dict[int, float]) -> dict[int, float]:
+    """Returns the distribution of the sum of two independent discrete distributions"""
+    if len(a) * len(b) <= _DIRECT_LIMIT:
+        result: dict[int, float] = {}
+        for x, p in a.items():
+            for y, q in b.items():
+                result[x + y] = result.get(x + y, 0.0) + p * q
+        return result
+
+    a_min, b_min = min(a), min(b)
+    size = max(a) - a_min + max(b) - b_min + 1
+    length = 1 << (size - 1).bit_length()
+    fa = [0j] * length
+    fb = [0j] * length
+    for x, p in a.items():
+        fa[x - a_min] = complex(p)
+    for y, q in b.items():
+        fb[y - b_min] = complex(q)
+
+    product_ = _fft([x * y for x, y in zip(_fft(fa), _fft(fb))], invert=True)
+    return {
+        i + a_min + b_min: value.real
+        for i, value in enumerate(product_[:size])
+        if value.real > 1e-15
+    }
+
+
+def _fft(values: list[complex], *, invert: bool = False) -> list[complex]:
+    """Iterative radix-2 fast Fourier transform of a list whose length is a power of two"""
+    n = len(values)
+    result = list(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            result[i], result[j] = result[j], result[i]
+
+    length = 2
+    sign = 1 if invert else -1
+    while length <= n:
+        root = cmath.exp(sign * 2j * cmath.pi / length)
+        for start in range(0, n, length):
+            w = 1 + 0j
+            for k in range(start, start + length // 2):
+                u, v = result[k], result[k + length // 2] * w
+                result[k], result[k + length // 2] = u + v, u - v
+                w *= root
+        length <<= 1
+
+    return [value / n for value in result] if invert else result
+
+
+def _money(value: float) -> Decimal:
+    return round(Decimal(value), 2)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from functools import reduce
+from heapq import nlargest
+from operator import itemgetter, mul
+from typing import Any
+
+from ..bets import Bet, EachWay
+from ..market import Market
+from ..odds import Odds
+
+
+class LiabilityBook:
+    """A bookmaker's book of open bets, keeping the liability on each runner,
+    and on each combination of runners for multiples, up to date as bets are added and cancelled.
+
+    Liabilities are the potential returns payable, so the profit or loss if a runner wins
+    is the total stakes taken less the liabilities on that runner.
+
+    Example:
+        >>> book = LiabilityBook()
+        >>> book.add(Bet(10, Odds(3), frankel_wins), 'Frankel')
+        >>> book.add(Bet(10, Odds(5), nijinsky_wins), 'Nijinsky')
+        >>> book.pnl('Frankel')
+        Decimal('-10')
+    """
+
+    def __init__(self) -> None:
+        self._bets: dict[Bet, tuple[frozenset[Any], Decimal, Decimal]] = {}
+        self._stakes = Decimal(0)
+        self._liabilities: dict[frozenset[Any], Decimal] = {}
+        self._combinations: dict[Any, set[frozenset[Any]]] = {}
+
+    def __contains__(self, bet: object) -> bool:
+        return bet in self._bets
+
+    def __len__(self) -> int:
+        return len(self._bets)
+
+    # Properties
+
+    @property
+    def stakes(self) -> Decimal:
+        """The total stakes taken on open bets
+
+        :return: The total stakes
+        :rtype: Decimal
+        """
+
+        return self._stakes
+
+    @property
+    def runners(self) -> list[Any]:
+        """The runners carrying a liability, either from singles or as a leg of a multiple
+
+        :return: A list of runners
+        :rtype: list[Any]
+        """
+
+        return list(self._combinations)
+
+    @property
+    def worst_case(self) -> tuple[frozenset[Any], Decimal]:
+        """The winning runners that would cost the book most, with the book's profit or loss if they win.
+        Each runner winning alone and the legs of each multiple all winning are considered, as the book does not
+        know which runners are in the same event, so other runners winning together are not.
+
+        :raises ValueError: If the book is empty
+        :return: The winning runners and the profit or loss if they win
+        :rtype: tuple[frozenset[Any], Decimal]
+        """
+
+        if not self._bets:
+            raise ValueError("Book is empty")
+
+        winners = {frozenset([runner]) for runner in self._combinations}
+        winners.update(self._liabilities)
+        worst = min(winners, key=lambda w: self.pnl(*w))
+        return worst, self.pnl(*worst)
+
+    # Instance methods
+
+    def add(self, bet: Bet, *selections: Any, odds: Odds | None = None) -> None:
+        """Adds a bet to the book, on one selection for a single or on several for a multiple
+
+        :param bet: The bet to add
+        :type bet: Bet
+        :param selections: The runner backed, or the runners in each leg of a multiple
+        :type selections: Any
+        :param odds: The odds to take liability at, required for SP bets, defaults to the bet's odds
+        :type odds: Odds, optional
+        :raises ValueError: If the bet is already in the book, voided, each-way, or has no selections
+        :raises ValueError: If the bet is at SP and no odds are given
+        """
+
+        if bet in self._bets:
+            raise ValueError("Bet is already in the book")
+
+        if isinstance(bet, EachWay):
+            raise ValueError("Each-way bets are not supported")
+
+        if bet.status == Bet.Status.VOID:
+            raise ValueError("Cannot add a voided bet")
+
+        if not selections:
+            raise ValueError("Bet must have at least one selection")
+
+        price = odds or bet.odds
+        if not isinstance(price, Odds):
+            raise ValueError("Odds must be given for SP bets")
+
+        key = frozenset(selections)
+        liability = bet.stake * Decimal(price)
+        self._bets[bet] = (key, bet.stake, liability)
+        self._update(key, bet.stake, liability)
+
+    def remove(self, bet: Bet) -> None:
+        """Removes a bet from the book, e.g. on cancellation or settlement
+
+        :param bet: The bet to remove
+        :type bet: Bet
+        :raises ValueError: If the bet is not in the book
+        """
+
+        if bet not in self._bets:
+            raise ValueError("Bet is not in the book")
+
+        key, stake, liability = self._bets.pop(bet)
+        self._update(key, -stake, -liability)
+
+    def liability(self, *selections: Any) -> Decimal:
+        """Returns the liability on a runner, or on a combination of runners
+
+        :param selections: The runner, or the runners in the combination
+        :type selections: Any
+        :return: The potential returns payable
+        :rtype: Decimal
+        """
+
+        return self._liabilities.get(frozenset(selections), Decimal(0))
+
+    def pnl(self, *winners: Any) -> Decimal:
+        """Returns the book's profit or loss if the given runners win, including any multiples
+        whose legs are all among them
+
+        :param winners: The winning runners
+        :type winners: Any
+        :return: The profit or loss of the book
+        :rtype: Decimal
+        """
+
+        winning = frozenset(winners)
+        combinations = set().union(*(self._combinations.get(w, ()) for w in winning))
+        payout = sum(
+            (self._liabilities[c] for c in combinations if c <= winning), Decimal(0)
+        )
+        return self._stakes - payout
+
+    def top_exposures(self, n: int = 5) -> list[tuple[frozenset[Any], Decimal]]:
+        """Returns the largest liabilities in the book by runner or combination
+
+        :param n: The number of exposures to return, defaults to 5
+        :type n: int, optional
+        :return: The runners or combinations with their liabilities, largest first
+        :rtype: list[tuple[frozenset[Any], Decimal]]
+        """
+
+        return nlargest(n, self._liabilities.items(), key=itemgetter(1))
+
+    def expected_value(self, *markets: Market) -> Decimal:
+        """Returns the expected profit or loss of the book given the fair probabilities of the runners in the markets,
+        i.e. of winning a win market or of placing in a place market. Legs of multiples are assumed to be independent.
+
+        :param markets: The markets covering every runner in the book
+        :type markets: Market
+        :raises ValueError: If a runner in the book is not in any of the markets
+        :return: The expected profit or loss of the book
+        :rtype: Decimal
+        """
+
+        probabilities: dict[Any, Decimal] = {}
+        for market in markets:
+            scale = market._fair_percentage / market.percentage
+            probabilities |= {r: o.to_probability() * scale for r, o in market.items()}
+
+        if missing := set(self._combinations) - set(probabilities):
+            raise ValueError(f"No market for runners: {missing}")
+
+        expected_payout = sum(
+            (
+                liability * reduce(mul, (probabilities[r] for r in key), Decimal(1))
+                for key, liability in self._liabilities.items()
+            ),
+            Decimal(0),
+        )
+        return self._stakes - expected_payout
+
+    def _update(self, key: frozenset[Any], stake: Decimal, liability: Decimal) -> None:
+        self._stakes += stake
+        total = self._liabilities.get(key, Decimal(0)) + liability
+        if total:
+            self._liabilities[key] = total
+            for runner in key:
+                self._combinations.setdefault(runner, set()).add(key)
+            return
+
+        self._liabilities.pop(key, None)
+        for runner in key:
+            self._combinations[runner].discard(key)
+            if not self._combinations[runner]:
+                del self._combinations[runner]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Hashable, Mapping, Sequence
+from decimal import Decimal
+from math import exp
+
+from ..exchange.ladder import TICKS
+from ..market import Market
+from ..odds import Odds
+
+_MAX_ITERATIONS = 60
+
+
+class Repricer:
+    """A repricing engine that shortens runners carrying more than their share of liability and lengthens the
+    rest, while keeping the book at a target overround.
+
+    Each runner's fair probability is skewed by its liability less the book's expected liability, relative to
+    the total liability, so the book shortens the runners it stands to lose most on. The skewed probabilities
+    are then scaled until the book, with every price taken to the nearest on the ladder and kept within the
+    maximum move of its current price, first reaches the target. The scale found is kept and used to start the
+    next call, so repricing after each accepted bet takes few iterations.
+
+    Attributes:
+        iterations: The number of book evaluations taken by the last call to reprice.
+
+    Example:
+        >>> repricer = Repricer(margin=10, max_ticks=20)
+        >>> market = Market({'Frankel': Odds(2), 'Shergar': Odds(4), 'Nijinsky': Odds(4)})
+        >>> repricer.reprice(market, {'Frankel': 500, 'Shergar': 50, 'Nijinsky': 50})
+        {'Frankel': Odds('1.80'), 'Shergar': Odds('3.65'), 'Nijinsky': Odds('3.65')}
+    """
+
+    def __init__(
+        self,
+        *,
+        margin: Decimal | None = None,
+        sensitivity: float = 1.0,
+        max_ticks: int | None = None,
+        ladder: Sequence[Odds] = TICKS,
+    ) -> None:
+        """Initialises the repricer
+
+        :param margin: The target margin as a percentage, defaults to the margin of each market repriced
+        :type margin: Decimal, optional
+        :param sensitivity: How strongly prices respond to liabilities, defaults to 1
+        :type sensitivity: float, optional
+        :param max_ticks: The most ladder steps any price can move in one call, defaults to no limit
+        :type max_ticks: int, optional
+        :param ladder: The prices that can be offered, defaults to the exchange tick ladder
+        :type ladder: Sequence[Odds], optional
+        :raises ValueError: If the ladder is empty or max_ticks is negative
+        """
+        if not ladder:
+            raise ValueError("Ladder must have at least one price")
+
+        if max_ticks is not None and max_ticks < 0:
+            raise ValueError("Max ticks must be at least 0")
+
+        self.margin = margin
+        self.sensitivity = sensitivity
+        self.max_ticks = max_ticks
+        self.iterations = 0
+        self._ladder = sorted(set(ladder))
+        self._values = [float(price) for price in self._ladder]
+        self._scales: dict[frozenset[Hashable], float] = {}
+
+    def reprice(
+        self, market: Market, liabilities: Mapping[Hashable, Decimal]
+    ) -> Market:
+        """Returns new prices for a market given the liability on each runner
+
+        :param market: The current prices
+        :type market: Market
+        :param liabilities: The liability on each runner, i.e. the returns payable if it wins, defaulting to 0
+        :type liabilities: Mapping[Hashable, Decimal]
+        :raises ValueError: If any runner is unpriced
+        :return: The new prices, on the ladder, with the market's places
+        :rtype: Market
+        """
+        if any(odds is None for odds in market.values()):
+            raise ValueError("Every runner must be priced")
+
+        runners = list(market)
+        target = float(market.percentage if self.margin is None else 100 + self.margin)
+        chances = [1 / float(market[r]) for r in runners]
+        total = sum(chances)
+        fair = [c / total for c in chances]
+
+        owed = [float(liabilities.get(r, 0)) for r in runners]
+        scale = sum(owed) or 1.0
+        expected = sum(p * o for p, o in zip(fair, owed))
+        skewed = [
+            p * exp(self.sensitivity * (o - expected) / scale)
+            for p, o in zip(fair, owed)
+        ]
+        total = sum(skewed)
+        probabilities = [q / total for q in skewed]
+
+        current = [self._nearest(float(market[r])) for r in runners]
+        key = frozenset(runners)
+        ticks = self._solve(probabilities, current, target, self._scales.get(key))
+        self._scales[key] = self._scale
+
+        repriced = Market({r: self._ladder[t] for r, t in zip(runners, ticks)})
+        repriced.__dict__.update(market.__dict__)
+        return repriced
+
+    def _prices(
+        self, probabilities: list[float], current: list[int], scale: float
+    ) -> list[int]:
+        """The ladder index of each runner's price at a scale, limited to the maximum move from its current price"""
+        ticks = [self._nearest(1 / (scale * p)) for p in probabilities]
+        if self.max_ticks is None:
+            return ticks
+
+        return [
+            min(max(tick, now - self.max_ticks), now + self.max_ticks)
+            for tick, now in zip(ticks, current)
+        ]
+
+    def _book(self, ticks: list[int]) -> float:
+        return sum(100 / self._values[t] for t in ticks)
+
+    def _solve(
+        self,
+        probabilities: list[float],
+        current: list[int],
+        target: float,
+        start: float | None,
+    ) -> list[int]:
+        """Finds by bisection the smallest scale at which the book of ladder prices reaches the target, or the
+        nearest the maximum move allows"""
+        self.iterations = 0
+        low, high = (
+            (1.0, target / 100) if start is None else (start / 1.01, start * 1.01)
+        )
+
+        def prices(scale: float) -> tuple[list[int], bool]:
+            self.iterations += 1
+            ticks = self._prices(probabilities, current, scale)
+            return ticks, self._book(ticks) >= target
+
+        limit = len(self._values) if self.max_ticks is None else self.max_ticks
+        shortest = [max(now - limit, 0) for now in current]
+        longest = [min(now + limit, len(self._values) - 1) for now in current]
+
+        (below, reached), (above, reaches) = prices(low), prices(high)
+        step = high / low
+        while reached and below != longest and self.iterations < _MAX_ITERATIONS:
+            high, above = low, below
+            low /= step
+            step *= step
+            below, reached = prices(low)
+        while not reaches and above != shortest and self.iterations < _MAX_ITERATIONS:
+            low, below = high, above
+            high *= step
+            step *= step
+            above, reaches = prices(high)
+
+        while not self._adjacent(probabilities, above, below) and (
+            high / low - 1 > 1e-9 and self.iterations < _MAX_ITERATIONS
+        ):
+            middle = (low + high) / 2
+            ticks, reached = prices(middle)
+            if reached:
+                high, above = middle, ticks
+            else:
+                low, below = middle, ticks
+
+        self._scale = high
+        return above
+
+    @staticmethod
+    def _adjacent(
+        probabilities: list[float], above: list[int], below: list[int]
+    ) -> bool:
+        """Whether two sets of prices are a single step apart, i.e. only runners with the same chance differ, by one tick"""
+        moved = {p for p, a, b in zip(probabilities, above, below) if a != b}
+
+        return len(moved) <= 1 and all(abs(a - b) <= 1 for a, b in zip(above, below))
+
+    def _nearest(self, value: float) -> int:
+        above = min(bisect_left(self._values, value), len(self._values) - 1)
+        below = max(above - 1, 0)
+        return (
+            below
+            if value - self._values[below] <= self._values[above] - value
+            else above
+        )
+
+
+def reprice(
+    market: Market,
+    liabilities: Mapping[Hashable, Decimal],
+    *,
+    margin: Decimal | None = None,
+    sensitivity: float = 1.0,
+    max_ticks: int | None = None,
+    ladder: Sequence[Odds] = TICKS,
+) -> Market:
+    """Returns new prices for a market that balance its liabilities at a target margin, see Repricer
+
+    :param market: The current prices
+    :type market: Market
+    :param liabilities: The liability on each runner, i.e. the returns payable if it wins, defaulting to 0
+    :type liabilities: Mapping[Hashable, Decimal]
+    :param margin: The target margin as a percentage, defaults to the market's margin
+    :type margin: Decimal, optional
+    :param sensitivity: How strongly prices respond to liabilities, defaults to 1
+    :type sensitivity: float, optional
+    :param max_ticks: The most ladder steps any price can move, defaults to no limit
+    :type max_ticks: int, optional
+    :param ladder: The prices that can be offered, defaults to the exchange tick ladder
+    :type ladder: Sequence[Odds], optional
+    :return: The new prices
+    :rtype: Market
+    """
+
+    return Repricer(
+        margin=margin, sensitivity=sensitivity, max_ticks=max_ticks, ladder=ladder
+    ).reprice(market, liabilities)
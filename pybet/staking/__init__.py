@@ -1,3 +1,16 @@
-from .kelly import kelly
+from .dutching import dutch, dutch_batch, dutch_opportunities, dutch_to_profit
+from .kelly import kelly, kelly_array, simultaneous_kelly, simultaneous_kelly_batch
+from .portfolio import PortfolioKelly, portfolio_kelly
 
-__all__ = ["kelly"]
+__all__ = [
+    "PortfolioKelly",
+    "dutch",
+    "dutch_batch",
+    "dutch_opportunities",
+    "dutch_to_profit",
+    "kelly",
+    "kelly_array",
+    "portfolio_kelly",
+    "simultaneous_kelly",
+    "simultaneous_kelly_batch",
+]
@@ -0,0 +1,256 @@
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Sequence
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from operator import itemgetter
+from typing import Any
+
+from ..market import Market
+from ..odds import Odds
+
+Selector = Callable[[Market], Iterable[Any]]
+
+
+def dutch(
+    market: Market,
+    stake: Decimal,
+    runners: Iterable[Any] | None = None,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    increment: Decimal = Decimal("0.01"),
+    ladder: Sequence[Decimal] | None = None,
+) -> dict[Any, Decimal]:
+    """Splits a total stake across runners so that any of them winning returns the same amount.
+    Stakes are rounded down to the increment and the remainder is given to the runners furthest
+    below their exact stakes, so that the stakes add up to the total exactly.
+
+    :param market: The market of odds available for each runner
+    :type market: Market
+    :param stake: The total stake
+    :type stake: Decimal
+    :param runners: The runners to back, defaults to all runners in the market
+    :type runners: Iterable[Any], optional
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param increment: The increment stakes are rounded to, e.g. 0.01 or 1, defaults to 0.01
+    :type increment: Decimal, optional
+    :param ladder: The prices that can be taken, sorted shortest first, e.g. the exchange TICKS, to which each runner's
+        odds are rounded down before staking, defaults to taking the market's odds as they are
+    :type ladder: Sequence[Decimal], optional
+    :raises ValueError: If commission is not between 0 and 100
+    :raises ValueError: If the stake is not a positive multiple of the increment
+    :raises ValueError: If there are no runners, or a runner is not priced in the market or is shorter than the ladder
+    :return: The stake to place on each runner
+    :rtype: dict[Any, Decimal]
+
+    :Example:
+        >>> market = Market({'Frankel': Odds(3), 'Nijinsky': Odds(3), 'Shergar': Odds(3)})
+        >>> dutch(market, 100)
+        {'Frankel': Decimal('33.34'), 'Nijinsky': Decimal('33.33'), 'Shergar': Decimal('33.33')}
+    """
+    total = Decimal(stake)
+    step = Decimal(increment)
+    if step <= 0 or total <= 0 or total % step:
+        raise ValueError("Stake must be a positive multiple of the increment")
+
+    chances = _chances(market, runners, percentage_commission, ladder)
+    book = sum(chances.values())
+    exact = {runner: total * chance / book for runner, chance in chances.items()}
+    stakes = {runner: _round(s, step, ROUND_FLOOR) for runner, s in exact.items()}
+
+    shortfall = int((total - sum(stakes.values())) / step)
+    ranked = sorted(exact, key=lambda runner: stakes[runner] - exact[runner])
+    for runner in ranked[:shortfall]:
+        stakes[runner] += step
+
+    return stakes
+
+
+def dutch_to_profit(
+    market: Market,
+    profit: Decimal,
+    runners: Iterable[Any] | None = None,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    increment: Decimal = Decimal("0.01"),
+    ladder: Sequence[Decimal] | None = None,
+) -> dict[Any, Decimal]:
+    """Calculates the smallest stakes, in multiples of the increment, on runners so that any of them
+    winning makes at least the target profit over the total staked
+
+    :param market: The market of odds available for each runner
+    :type market: Market
+    :param profit: The target profit
+    :type profit: Decimal
+    :param runners: The runners to back, defaults to all runners in the market
+    :type runners: Iterable[Any], optional
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param increment: The increment stakes are rounded to, e.g. 0.01 or 1, defaults to 0.01
+    :type increment: Decimal, optional
+    :param ladder: The prices that can be taken, sorted shortest first, e.g. the exchange TICKS, to which each runner's
+        odds are rounded down before staking, defaults to taking the market's odds as they are
+    :type ladder: Sequence[Decimal], optional
+    :raises ValueError: If commission is not between 0 and 100
+    :raises ValueError: If the profit or increment is not greater than 0
+    :raises ValueError: If there are no runners, or a runner is not priced in the market or is shorter than the ladder
+    :raises ValueError: If the runners' combined book is 100% or more, so no profit can be guaranteed
+    :return: The stake to place on each runner
+    :rtype: dict[Any, Decimal]
+
+    :Example:
+        >>> market = Market({'Frankel': Odds(2), 'Nijinsky': Odds(5), 'Shergar': Odds(5)})
+        >>> dutch_to_profit(market, 10)
+        {'Frankel': Decimal('50.00'), 'Nijinsky': Decimal('20.00'), 'Shergar': Decimal('20.00')}
+    """
+    target = Decimal(profit)
+    step = Decimal(increment)
+    if target <= 0 or step <= 0:
+        raise ValueError("Profit and increment must be greater than 0")
+
+    chances = _chances(market, runners, percentage_commission, ladder)
+    book = sum(chances.values())
+    if book >= 1:
+        raise ValueError("Runners' combined book must be less than 100%")
+
+    total = target * book / (1 - book)
+    while True:
+        stakes = {
+            runner: _round((target + total) * chance, step, ROUND_CEILING)
+            for runner, chance in chances.items()
+        }
+        staked = sum(stakes.values(), Decimal(0))
+        if staked == total:
+            return stakes
+        total = staked
+
+
+def dutch_batch(
+    markets: Iterable[Market],
+    stake: Decimal,
+    selector: Selector | None = None,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    increment: Decimal = Decimal("0.01"),
+    ladder: Sequence[Decimal] | None = None,
+) -> list[dict[Any, Decimal]]:
+    """Splits the same total stake across runners in each of many markets, see dutch
+
+    :param markets: The markets
+    :type markets: Iterable[Market]
+    :param stake: The total stake for each market
+    :type stake: Decimal
+    :param selector: A function choosing the runners to back in a market, defaults to all runners
+    :type selector: Callable[[Market], Iterable[Any]], optional
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param increment: The increment stakes are rounded to, defaults to 0.01
+    :type increment: Decimal, optional
+    :param ladder: The prices that can be taken, sorted shortest first, e.g. the exchange TICKS, to which each runner's
+        odds are rounded down before staking, defaults to taking the market's odds as they are
+    :type ladder: Sequence[Decimal], optional
+    :return: The stake to place on each runner in each market
+    :rtype: list[dict[Any, Decimal]]
+    """
+
+    return [
+        dutch(
+            market,
+            stake,
+            selector(market) if selector else None,
+            percentage_commission,
+            increment=increment,
+            ladder=ladder,
+        )
+        for market in markets
+    ]
+
+
+def dutch_opportunities(
+    markets: Sequence[Market],
+    selector: Selector | None = None,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    min_return: float = 0,
+    ladder: Sequence[Decimal] | None = None,
+) -> list[tuple[int, float]]:
+    """Scans many markets for dutches that return a profit whichever selected runner wins,
+    using floating point for speed
+
+    :param markets: The markets to scan
+    :type markets: Sequence[Market]
+    :param selector: A function choosing the runners to back in a market, defaults to all runners
+    :type selector: Callable[[Market], Iterable[Any]], optional
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param min_return: The smallest profit per unit staked worth reporting, defaults to 0
+    :type min_return: float, optional
+    :param ladder: The prices that can be taken, sorted shortest first, e.g. the exchange TICKS, to which each runner's
+        odds are rounded down before staking, defaults to taking the market's odds as they are
+    :type ladder: Sequence[Decimal], optional
+    :raises ValueError: If commission is not between 0 and 100
+    :raises ValueError: If a runner is shorter than the ladder
+    :return: The index of each market with an opportunity and its profit per unit staked, best first
+    :rtype: list[tuple[int, float]]
+
+    :Example:
+        >>> markets = [Market({'Frankel': Odds(2), 'Shergar': Odds(2)}), Market({'Frankel': Odds(2.5), 'Shergar': Odds(2.5)})]
+        >>> dutch_opportunities(markets)
+        [(1, 0.25)]
+    """
+    if not 0 <= percentage_commission <= 100:
+        raise ValueError("Commission must be between 0 and 100")
+
+    retained = 1 - float(percentage_commission) / 100
+    opportunities = []
+    for index, market in enumerate(markets):
+        runners = selector(market) if selector else market
+        book = 0.0
+        for runner in runners:
+            odds = market.get(runner)
+            if odds is None:
+                break
+            book += 1 / ((float(_take(odds, ladder)) - 1) * retained + 1)
+        else:
+            if book and 1 / book - 1 > min_return:
+                opportunities.append((index, 1 / book - 1))
+
+    return sorted(opportunities, key=itemgetter(1), reverse=True)
+
+
+def _chances(
+    market: Market,
+    runners: Iterable[Any] | None,
+    percentage_commission: Decimal,
+    ladder: Sequence[Decimal] | None,
+) -> dict[Any, Decimal]:
+    """Returns the stake per unit returned for each runner, i.e. its implied probability after commission"""
+    if not 0 <= percentage_commission <= 100:
+        raise ValueError("Commission must be between 0 and 100")
+
+    selected = list(market if runners is None else runners)
+    if not selected:
+        raise ValueError("There must be at least one runner")
+
+    if unpriced := [r for r in selected if market.get(r) is None]:
+        raise ValueError(f"Runners not priced in market: {unpriced}")
+
+    retained = 1 - Decimal(percentage_commission) / 100
+    return {r: 1 / (_take(market[r], ladder).to_one() * retained + 1) for r in selected}
+
+
+def _take(odds: Odds, ladder: Sequence[Decimal] | None) -> Odds:
+    """Returns the odds, or the longest price on the ladder no longer than them"""
+    if ladder is None:
+        return odds
+
+    position = bisect_right(ladder, odds)
+    if not position:
+        raise ValueError(f"Odds {odds} are shorter than the ladder")
+
+    return Odds(ladder[position - 1])
+
+
+def _round(value: Decimal, increment: Decimal, rounding: str) -> Decimal:
+    return ((value / increment).to_integral_value(rounding) * increment).quantize(
+        increment
+    )
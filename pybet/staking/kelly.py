@@ -1,5 +1,8 @@
+from collections.abc import Iterable, Sequence
 from decimal import Decimal
+from typing import Any
 
+from ..market import Market
 from ..odds import Odds
 
 
@@ -44,3 +47,207 @@ def kelly(
     stake: Decimal = round(bank * max(kelly, Decimal(0)), 2)
 
     return stake
+
+
+def simultaneous_kelly(
+    true_market: Market,
+    market: Market,
+    bank: Decimal,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    fraction: Decimal = Decimal(1),
+) -> dict[Any, Decimal]:
+    """Calculates the stakes that should be placed on each runner in a market according to the Kelly Criterion
+    for simultaneous bets on mutually exclusive outcomes, using the closed-form algorithm of Smoczynski and Tomkins
+    [https://doi.org/10.1017/S1748499510000230], i.e. runners are sorted by expected return and backed while their
+    expected return exceeds the reserve rate of those already backed
+
+    :param true_market: A market of the calculated true odds of each runner
+    :type true_market: Market
+    :param market: A market of the odds currently available for each runner
+    :type market: Market
+    :param bank: The bank available
+    :type bank: Decimal
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+    :type fraction: Decimal, optional
+    :raises ValueError: If commission is not between 0 and 100
+    :raises ValueError: If fraction is not > 0 and <= 1
+    :raises ValueError: If the markets do not have the same runners
+    :return: The stake to place on each runner according to the Kelly criterion
+    :rtype: dict[Any, Decimal]
+
+    :Example:
+        >>> true_market = Market({'Frankel': Odds(2), 'Nijinsky': Odds(4), 'Shergar': Odds(4)})
+        >>> market = Market({'Frankel': Odds(2.2), 'Nijinsky': Odds(5), 'Shergar': Odds(2.5)})
+        >>> simultaneous_kelly(true_market, market, 100)
+        {'Frankel': Decimal('17.11'), 'Nijinsky': Decimal('10.53'), 'Shergar': Decimal('0.00')}
+    """
+    if not 0 <= percentage_commission <= 100:
+        raise ValueError("Commission must be between 0 and 100")
+
+    if not 0 < fraction <= 1:
+        raise ValueError("Fraction must be > 0 and <= 1")
+
+    if true_market.keys() != market.keys():
+        raise ValueError("Markets must have the same runners")
+
+    retained = Decimal(str(1 - percentage_commission / 100))
+    probabilities = {r: odds.to_probability() for r, odds in true_market.items()}
+    odds = {r: market_odds.to_one() * retained + 1 for r, market_odds in market.items()}
+    ranked = sorted(market, key=lambda r: probabilities[r] * odds[r], reverse=True)
+
+    backed: list[Any] = []
+    reserve = Decimal(1)
+    total_probability = total_chance = Decimal(0)
+    for runner in ranked:
+        if probabilities[runner] * odds[runner] <= reserve:
+            break
+        backed.append(runner)
+        total_probability += probabilities[runner]
+        total_chance += 1 / odds[runner]
+        reserve = (
+            (1 - total_probability) / (1 - total_chance)
+            if total_chance < 1
+            else Decimal(0)
+        )
+
+    stakes = dict.fromkeys(market, Decimal("0.00"))
+    for runner in backed:
+        kelly = probabilities[runner] - reserve / odds[runner]
+        stakes[runner] = round(bank * fraction * max(kelly, Decimal(0)), 2)
+
+    return stakes
+
+
+def simultaneous_kelly_batch(
+    races: Iterable[tuple[Market, Market]],
+    bank: Decimal,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    fraction: Decimal = Decimal(1),
+) -> list[dict[Any, Decimal]]:
+    """Calculates simultaneous Kelly stakes for each of many races, each staked from the same bank
+
+    :param races: The true market and available market for each race
+    :type races: Iterable[tuple[Market, Market]]
+    :param bank: The bank available for each race
+    :type bank: Decimal
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+    :type fraction: Decimal, optional
+    :return: The stake to place on each runner in each race
+    :rtype: list[dict[Any, Decimal]]
+    """
+
+    return [
+        simultaneous_kelly(
+            true_market, market, bank, percentage_commission, fraction=fraction
+        )
+        for true_market, market in races
+    ]
+
+
+def kelly_array(
+    true_odds: Sequence[Odds | float],
+    market_odds: Sequence[Odds | float],
+    banks: Decimal | float | Sequence[Decimal | float],
+    percentage_commission: Decimal | float | Sequence[Decimal | float] = Decimal(0),
+    *,
+    fraction: Decimal | float = 1,
+    max_stake: Decimal | float | None = None,
+    min_stake: Decimal | float = 0,
+) -> list[Decimal]:
+    """Calculates Kelly stakes for many selections at once. Stakes are calculated in floating point,
+    falling back to the Decimal calculation of kelly wherever a stake is too close to a half penny, or an edge
+    too close to zero, for floating point to round it reliably, so full Kelly stakes match kelly exactly.
+
+    :param true_odds: The calculated true odds of each selection
+    :type true_odds: Sequence[Odds]
+    :param market_odds: The odds currently available for each selection
+    :type market_odds: Sequence[Odds]
+    :param banks: The bank available for all selections, or for each selection
+    :type banks: Decimal | Sequence[Decimal]
+    :param percentage_commission: The percentage commission for all selections, or for each selection
+    :type percentage_commission: Decimal | Sequence[Decimal]
+    :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+    :type fraction: Decimal, optional
+    :param max_stake: The largest stake to place on any selection, defaults to None
+    :type max_stake: Decimal, optional
+    :param min_stake: The smallest stake worth placing, below which nothing is staked, defaults to 0
+    :type min_stake: Decimal, optional
+    :raises ValueError: If the sequences are not all the same length
+    :raises ValueError: If commission is not between 0 and 100
+    :raises ValueError: If fraction is not > 0 and <= 1
+    :return: The stake to place on each selection
+    :rtype: list[Decimal]
+
+    :Example:
+        >>> kelly_array([Odds(4), Odds(5)], [Odds(5), Odds(4)], 100)
+        [Decimal('6.25'), Decimal('0.00')]
+    """
+    count = len(true_odds)
+    if len(market_odds) != count:
+        raise ValueError("True odds and market odds must be the same length")
+
+    if not 0 < fraction <= 1:
+        raise ValueError("Fraction must be > 0 and <= 1")
+
+    bank_list = _broadcast(banks, count)
+    commission_list = _broadcast(percentage_commission, count)
+    if any(not 0 <= c <= 100 for c in set(commission_list)):
+        raise ValueError("Commission must be between 0 and 100")
+
+    retained = {c: 1 - float(c) / 100 for c in set(commission_list)}
+    scale = float(fraction)
+    cap = None if max_stake is None else Decimal(str(max_stake))
+    floor = Decimal(str(min_stake))
+
+    stakes = []
+    for true, available, bank, commission in zip(
+        true_odds, market_odds, bank_list, commission_list
+    ):
+        odds = (float(available) - 1) * retained[commission]
+        p = 1 / float(true)
+        kelly_fraction = (odds * p - (1 - p)) / odds if odds > 0 else 0.0
+        pence = float(bank) * max(kelly_fraction, 0.0) * scale * 100
+        if odds <= 0 or abs(kelly_fraction) < 1e-9 or abs(pence % 1 - 0.5) < 1e-6:
+            stake = _decimal_kelly(true, available, bank, commission, fraction)
+        else:
+            stake = Decimal(round(pence)).scaleb(-2)
+
+        if cap is not None:
+            stake = min(stake, cap)
+        stakes.append(stake if stake >= floor else Decimal("0.00"))
+
+    return stakes
+
+
+def _decimal_kelly(
+    true_odds: Odds | float,
+    market_odds: Odds | float,
+    bank: Decimal | float,
+    percentage_commission: Decimal | float,
+    fraction: Decimal | float,
+) -> Decimal:
+    """The Decimal calculation of kelly, with a fraction applied"""
+    p = 1 / Decimal(true_odds)
+    q = 1 - p
+    odds = (Decimal(market_odds) - 1) * Decimal(str(1 - percentage_commission / 100))
+    kelly = ((odds * p) - q) / odds
+    stake = Decimal(bank) * Decimal(fraction) * max(kelly, Decimal(0))
+
+    return round(stake, 2)
+
+
+def _broadcast(value: Any, count: int) -> list[Any]:
+    """Returns a list of the value repeated count times, or the value itself if already a sequence"""
+    if not isinstance(value, Sequence):
+        return [value] * count
+
+    if len(value) != count:
+        raise ValueError("Per-selection arguments must be the same length as odds")
+
+    return list(value)
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Hashable, Iterable, Mapping
+from decimal import ROUND_DOWN, Decimal
+from itertools import product
+from math import log, prod
+
+from ..odds import Odds
+
+
+class PortfolioKelly:
+    """An optimiser for Kelly stakes on simultaneous independent bets sharing one bank, optionally
+    with accumulators built from them, maximising the expected log growth of the bank.
+
+    With few selections every joint outcome is enumerated, otherwise outcomes are sampled, and stakes are found
+    by projected Newton ascent. The random draws for each selection are made once and reused, so the same
+    selections are always staked the same and stakes move smoothly with prices. The solution for each selection
+    is kept and used as the starting point of the next call, so re-solving after small price moves takes few
+    iterations.
+
+    Attributes:
+        iterations: The number of iterations taken by the last call to stakes.
+
+    Example:
+        >>> optimiser = PortfolioKelly(seed=1)
+        >>> optimiser.stakes({'Frankel': (Odds(4), Odds(5)), 'Shergar': (Odds(3), Odds(3.5))}, 100)
+        {'Frankel': Decimal('6.19'), 'Shergar': Decimal('6.58')}
+    """
+
+    def __init__(
+        self,
+        *,
+        exact_limit: int = 12,
+        samples: int = 10_000,
+        seed: int | None = None,
+        tolerance: float = 1e-7,
+        max_iterations: int = 1000,
+    ) -> None:
+        """Initialises the optimiser
+
+        :param exact_limit: The most selections for which every joint outcome is enumerated, defaults to 12
+        :type exact_limit: int, optional
+        :param samples: The number of joint outcomes sampled when there are more selections, defaults to 10,000
+        :type samples: int, optional
+        :param seed: A seed for sampling outcomes, defaults to None
+        :type seed: int, optional
+        :param tolerance: The largest change in any stake fraction at convergence, defaults to 1e-7
+        :type tolerance: float, optional
+        :param max_iterations: The most iterations to take, defaults to 1000
+        :type max_iterations: int, optional
+        """
+        self.exact_limit = exact_limit
+        self.samples = samples
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self._rng = random.Random(seed)
+        self._draws: dict[Hashable, array] = {}
+        self._fractions: dict[Hashable, float] = {}
+
+    def stakes(
+        self,
+        selections: Mapping[Hashable, tuple[Odds, Odds]],
+        bank: Decimal,
+        percentage_commission: Decimal = Decimal(0),
+        *,
+        accumulators: Iterable[tuple[Hashable, ...]] = (),
+        fraction: Decimal = Decimal(1),
+    ) -> dict[Hashable, Decimal]:
+        """Calculates the stakes that maximise the expected log growth of the bank across all selections
+
+        :param selections: The true odds and available odds of each selection
+        :type selections: Mapping[Hashable, tuple[Odds, Odds]]
+        :param bank: The bank available
+        :type bank: Decimal
+        :param percentage_commission: The percentage commission applied to winnings
+        :type percentage_commission: Decimal
+        :param accumulators: Accumulators to consider, each as a tuple of selections, defaults to none
+        :type accumulators: Iterable[tuple[Hashable, ...]], optional
+        :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+        :type fraction: Decimal, optional
+        :raises ValueError: If commission is not between 0 and 100
+        :raises ValueError: If fraction is not > 0 and <= 1
+        :raises ValueError: If there are no selections, or an accumulator is invalid
+        :return: The stake on each selection, and on each accumulator keyed by its tuple of selections, rounded down
+            to the penny so they never total more than the bank staked
+        :rtype: dict[Hashable, Decimal]
+        """
+        if not 0 <= percentage_commission <= 100:
+            raise ValueError("Commission must be between 0 and 100")
+
+        if not 0 < fraction <= 1:
+            raise ValueError("Fraction must be > 0 and <= 1")
+
+        if not selections:
+            raise ValueError("There must be at least one selection")
+
+        legs = list(selections)
+        index = {leg: i for i, leg in enumerate(legs)}
+        combinations = [tuple(acc) for acc in accumulators]
+        if any(len(acc) < 2 or not set(acc) <= index.keys() for acc in combinations):
+            raise ValueError("Accumulators must have at least two known selections")
+
+        retained = 1 - float(percentage_commission) / 100
+        probabilities = [1 / float(selections[leg][0]) for leg in legs]
+        odds = [float(selections[leg][1]) for leg in legs]
+        keys: list[Hashable] = [*legs, *combinations]
+        members = [(i,) for i in range(len(legs))] + [
+            tuple(index[leg] for leg in acc) for acc in combinations
+        ]
+        payouts = [(prod(odds[i] for i in m) - 1) * retained + 1 for m in members]
+
+        scenarios = self._scenarios(legs, probabilities, members)
+        start = [self._fractions.get(key, -1.0) for key in keys]
+        fractions = self._solve(scenarios, payouts, probabilities, members, start)
+        self._fractions.update(zip(keys, fractions))
+
+        scale = Decimal(bank) * Decimal(fraction)
+        return {
+            key: (scale * Decimal(f)).quantize(Decimal("0.01"), ROUND_DOWN)
+            for key, f in zip(keys, fractions)
+        }
+
+    def _scenarios(
+        self,
+        legs: list[Hashable],
+        probabilities: list[float],
+        members: list[tuple[int, ...]],
+    ) -> list[tuple[float, list[int]]]:
+        """Returns each joint outcome as its weight and the bets that win in it"""
+        count = len(probabilities)
+        if count <= self.exact_limit:
+            outcomes = (
+                (prod(p if w else 1 - p for p, w in zip(probabilities, won)), won)
+                for won in product((False, True), repeat=count)
+            )
+        else:
+            draws = [self._uniforms(leg) for leg in legs]
+            outcomes = (
+                (
+                    1 / self.samples,
+                    tuple(d[s] < p for d, p in zip(draws, probabilities)),
+                )
+                for s in range(self.samples)
+            )
+
+        return [
+            (weight, [b for b, m in enumerate(members) if all(won[i] for i in m)])
+            for weight, won in outcomes
+            if weight > 0
+        ]
+
+    def _uniforms(self, leg: Hashable) -> array:
+        """The random draws deciding whether a selection wins in each sampled outcome, made once per selection"""
+        draws = self._draws.get(leg)
+        if draws is None or len(draws) != self.samples:
+            draws = array("d", (self._rng.random() for _ in range(self.samples)))
+            self._draws[leg] = draws
+
+        return draws
+
+    def _solve(
+        self,
+        scenarios: list[tuple[float, list[int]]],
+        payouts: list[float],
+        probabilities: list[float],
+        members: list[tuple[int, ...]],
+        start: list[float],
+    ) -> list[float]:
+        """Maximises expected log growth by projected Newton ascent with backtracking, keeping bets with no stake
+        and no gain from staking out of each Newton step"""
+        cap = 1 - 1e-9
+        fractions = _project(
+            [
+                f
+                if f >= 0
+                else max(prod(probabilities[i] for i in m) - 1 / payout, 0.0)
+                for f, m, payout in zip(start, members, payouts)
+            ],
+            cap,
+        )
+        value, gradient, curvature = _evaluate(scenarios, payouts, fractions)
+        self.iterations = 0
+        while self.iterations < self.max_iterations:
+            self.iterations += 1
+            free = [
+                i for i, (f, g) in enumerate(zip(fractions, gradient)) if f > 0 or g > 0
+            ]
+            direction = [0.0] * len(fractions)
+            steps = _linear_solve(
+                [[curvature[i][j] for j in free] for i in free],
+                [gradient[i] for i in free],
+            )
+            for i, d in zip(free, steps or (gradient[i] for i in free)):
+                direction[i] = d
+
+            step = 1.0
+            while True:
+                candidate = _project(
+                    [f + step * d for f, d in zip(fractions, direction)], cap
+                )
+                candidate_value, candidate_gradient, candidate_curvature = _evaluate(
+                    scenarios, payouts, candidate
+                )
+                if candidate_value > value:
+                    break
+                step /= 2
+                if step < 1e-12:
+                    return fractions
+
+            change = max(abs(c - f) for c, f in zip(candidate, fractions))
+            fractions, value, gradient, curvature = (
+                candidate,
+                candidate_value,
+                candidate_gradient,
+                candidate_curvature,
+            )
+            if change < self.tolerance:
+                break
+
+        return fractions
+
+
+def portfolio_kelly(
+    selections: Mapping[Hashable, tuple[Odds, Odds]],
+    bank: Decimal,
+    percentage_commission: Decimal = Decimal(0),
+    *,
+    accumulators: Iterable[tuple[Hashable, ...]] = (),
+    fraction: Decimal = Decimal(1),
+    seed: int | None = None,
+) -> dict[Hashable, Decimal]:
+    """Calculates Kelly stakes for simultaneous independent bets sharing one bank, see PortfolioKelly
+
+    :param selections: The true odds and available odds of each selection
+    :type selections: Mapping[Hashable, tuple[Odds, Odds]]
+    :param bank: The bank available
+    :type bank: Decimal
+    :param percentage_commission: The percentage commission applied to winnings
+    :type percentage_commission: Decimal
+    :param accumulators: Accumulators to consider, each as a tuple of selections, defaults to none
+    :type accumulators: Iterable[tuple[Hashable, ...]], optional
+    :param fraction: The fraction of full Kelly stakes to place, defaults to 1
+    :type fraction: Decimal, optional
+    :param seed: A seed for sampling outcomes, defaults to None
+    :type seed: int, optional
+    :return: The stake on each selection, and on each accumulator keyed by its tuple of selections, rounded down
+        to the penny so they never total more than the bank staked
+    :rtype: dict[Hashable, Decimal]
+
+    :Example:
+        >>> portfolio_kelly({'Frankel': (Odds(4), Odds(5)), 'Shergar': (Odds(3), Odds(3.5))}, 100)
+        {'Frankel': Decimal('6.19'), 'Shergar': Decimal('6.58')}
+    """
+
+    return PortfolioKelly(seed=seed).stakes(
+        selections,
+        bank,
+        percentage_commission,
+        accumulators=accumulators,
+        fraction=fraction,
+    )
+
+
+def _evaluate(
+    scenarios: list[tuple[float, list[int]]],
+    payouts: list[float],
+    fractions: list[float],
+) -> tuple[float, list[float], list[list[float]]]:
+    """Returns the expected log growth, its gradient with respect to each stake fraction, and its curvature,
+    i.e. the negated second derivatives"""
+    size = len(fractions)
+    base = 1 - sum(fractions)
+    value = 0.0
+    inverse_total = square_total = 0.0
+    winning = [0.0] * size
+    squares = [0.0] * size
+    joint = [[0.0] * size for _ in range(size)]
+    for weight, winners in scenarios:
+        wealth = base + sum(fractions[b] * payouts[b] for b in winners)
+        value += weight * log(wealth)
+        inverse = weight / wealth
+        square = inverse / wealth
+        inverse_total += inverse
+        square_total += square
+        for b in winners:
+            winning[b] += inverse
+            squares[b] += square
+            row = joint[b]
+            for c in winners:
+                row[c] += square
+
+    gradient = [payout * w - inverse_total for payout, w in zip(payouts, winning)]
+    curvature = [
+        [
+            payouts[j] * payouts[k] * joint[j][k]
+            - payouts[j] * squares[j]
+            - payouts[k] * squares[k]
+            + square_total
+            for k in range(size)
+        ]
+        for j in range(size)
+    ]
+    return value, gradient, curvature
+
+
+def _linear_solve(matrix: list[list[float]], vector: list[float]) -> list[float] | None:
+    """Solves a square linear system by Gaussian elimination with partial pivoting, or returns None if singular"""
+    size = len(vector)
+    rows = [[*row, v] for row, v in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda r: abs(rows[r][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            return None
+
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        leading = rows[column]
+        for row in rows[column + 1 :]:
+            factor = row[column] / leading[column]
+            row[:] = [x - factor * y for x, y in zip(row, leading)]
+
+    solution = [0.0] * size
+    for i in reversed(range(size)):
+        known = sum(rows[i][j] * solution[j] for j in range(i + 1, size))
+        solution[i] = (rows[i][size] - known) / rows[i][i]
+
+    return solution
+
+
+def _project(fractions: list[float], cap: float) -> list[float]:
+    """Projects stake fractions onto the set where each is non-negative and their total is at most the cap"""
+    clipped = [max(f, 0.0) for f in fractions]
+    if sum(clipped) <= cap:
+        return clipped
+
+    ordered = sorted(fractions, reverse=True)
+    total = 0.0
+    threshold = 0.0
+    for i, f in enumerate(ordered, 1):
+        total += f
+        if f - (total - cap) / i > 0:
+            threshold = (total - cap) / i
+
+    return [max(f - threshold, 0.0) for f in fractions]
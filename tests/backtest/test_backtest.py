@@ -0,0 +1,124 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.backtest import Backtest, Race, SimulationReport, Strategy
+from pybet.backtest.engine import _initialise, _simulate, _simulate_in_worker
+
+
+class TestBacktest(TestCase):
+    def setUp(self):
+        true_market = Market({"Frankel": Odds(4), "Shergar": Odds(4)})
+        market = Market({"Frankel": Odds(5), "Shergar": Odds(3)})
+        self.races = [
+            Race("2:30 Ascot", market, true_market, frozenset({"Frankel"})),
+            Race("3:05 Ascot", market, true_market, frozenset({"Shergar"})),
+        ]
+
+    def test_backtest_counts_races_and_bets(self):
+        backtest = Backtest(self.races, Strategy.level(10))
+        self.assertEqual(len(backtest), 2)
+        self.assertEqual(backtest.bets, 2)
+
+    def test_backtest_run_with_level_stakes(self):
+        result = Backtest(self.races, Strategy.level(10), bank=100).run()
+        self.assertEqual(result.final_bank, Decimal("130.00"))
+        self.assertEqual(list(result.path), [140, 130])
+        self.assertAlmostEqual(result.max_drawdown, 10 / 140)
+        self.assertFalse(result.ruined)
+
+    def test_backtest_run_with_kelly_stakes(self):
+        result = Backtest(self.races, Strategy.kelly(), bank=100).run()
+        self.assertEqual(result.final_bank, Decimal("117.19"))
+        self.assertEqual(list(result.path), [125, 117.1875])
+
+    def test_backtest_run_applies_max_stake(self):
+        result = Backtest(self.races, Strategy.kelly(max_stake=5), bank=100).run()
+        self.assertEqual(result.final_bank, Decimal("115.00"))
+
+    def test_backtest_run_applies_commission(self):
+        strategy = Strategy.level(10, percentage_commission=20)
+        backtest = Backtest(self.races, strategy, bank=100)
+        self.assertEqual(backtest.run().final_bank, Decimal("122.00"))
+
+    def test_backtest_run_without_races(self):
+        result = Backtest([], Strategy.level(10), bank=100).run()
+        self.assertEqual((result.final_bank, result.growth_rate), (100, 0))
+
+    def test_backtest_run_stops_when_ruined(self):
+        races = list(reversed(self.races)) * 3
+        result = Backtest(races, Strategy.level(10), bank=15, ruin=5).run()
+        self.assertTrue(result.ruined)
+        self.assertEqual(list(result.path), [5])
+
+    def test_backtest_run_scales_stakes_to_bank(self):
+        races = [self.races[1]] * 2
+        result = Backtest(races, Strategy.level(10), bank=15).run()
+        self.assertEqual(list(result.path), [5, 0])
+        self.assertEqual(result.growth_rate, float("-inf"))
+
+    def test_backtest_simulate_is_reproducible_across_processes(self):
+        backtest = Backtest(self.races * 10, Strategy.kelly(), bank=100)
+        local = backtest.simulate(100, processes=1, seed=1)
+        pooled = backtest.simulate(100, processes=2, seed=1)
+        self.assertEqual(len(local), 100)
+        self.assertEqual(list(local.final_banks), list(pooled.final_banks))
+
+    def test_backtest_simulate_in_worker_matches_local(self):
+        backtest = Backtest(self.races * 10, Strategy.kelly(), bank=100)
+        _initialise(backtest._columns)
+        self.addCleanup(_initialise, None)
+        self.assertEqual(_simulate_in_worker(1, 5), _simulate(backtest._columns, 1, 5))
+
+    def test_backtest_simulate_reports_ruin_probability(self):
+        backtest = Backtest(self.races, Strategy.level(10), bank=15, ruin=5)
+        report = backtest.simulate(200, processes=1, seed=1)
+        self.assertGreater(report.ruin_probability, 0)
+        self.assertLess(report.ruin_probability, 1)
+
+    def test_backtest_simulate_raises_value_error_if_simulations_invalid(self):
+        with self.assertRaises(ValueError):
+            Backtest(self.races, Strategy.level(10)).simulate(0)
+
+    def test_backtest_simulate_raises_value_error_if_no_races(self):
+        with self.assertRaises(ValueError):
+            Backtest([], Strategy.level(10)).simulate(1)
+
+    def test_backtest_raises_value_error_if_bank_invalid(self):
+        with self.assertRaises(ValueError):
+            Backtest(self.races, Strategy.level(10), bank=10, ruin=10)
+
+
+class TestSimulationReport(TestCase):
+    def setUp(self):
+        self.report = SimulationReport(
+            [
+                (120, 0.1, 0.2, False),
+                (80, -0.1, 0.4, False),
+                (0, float("-inf"), 1, True),
+            ]
+        )
+
+    def test_simulation_report_ruin_probability(self):
+        self.assertAlmostEqual(self.report.ruin_probability, 1 / 3)
+
+    def test_simulation_report_medians(self):
+        self.assertEqual(self.report.growth_rate, -0.1)
+        self.assertEqual(self.report.max_drawdown, 0.4)
+
+    def test_simulation_report_drawdown_at_risk(self):
+        self.assertAlmostEqual(self.report.drawdown_at_risk(0.5), 0.4, places=2)
+        self.assertGreater(self.report.drawdown_at_risk(0.95), 0.9)
+        self.assertAlmostEqual(self.report.drawdown_at_risk(0.0001), 0.2, places=2)
+
+    def test_simulation_report_drawdown_at_risk_of_one_simulation(self):
+        report = SimulationReport([(120, 0.1, 0.2, False)])
+        self.assertEqual(report.drawdown_at_risk(), 0.2)
+
+    def test_simulation_report_raises_value_error_if_level_invalid(self):
+        with self.assertRaises(ValueError):
+            self.report.drawdown_at_risk(1)
+
+    def test_simulation_report_raises_value_error_if_empty(self):
+        with self.assertRaises(ValueError):
+            SimulationReport([])
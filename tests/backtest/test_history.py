@@ -0,0 +1,42 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from pybet import Odds
+from pybet.backtest import read_races
+
+
+class TestReadRaces(TestCase):
+    def setUp(self):
+        file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        file.write(
+            "event,runner,odds,true_odds,won\n"
+            "2:30 Ascot,Frankel,5,4,1\n"
+            "2:30 Ascot,Shergar,3,4,0\n"
+            "3:05 Ascot,Frankel,2,2.5,0\n"
+        )
+        file.close()
+        self.path = file.name
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_read_races_groups_rows_by_event(self):
+        races = list(read_races(self.path))
+        self.assertEqual([race.event for race in races], ["2:30 Ascot", "3:05 Ascot"])
+
+    def test_read_races_reads_markets(self):
+        race = next(read_races(self.path))
+        self.assertEqual(race.market, {"Frankel": Odds(5), "Shergar": Odds(3)})
+        self.assertEqual(race.true_market, {"Frankel": Odds(4), "Shergar": Odds(4)})
+
+    def test_read_races_reads_winners(self):
+        races = list(read_races(self.path))
+        self.assertEqual(races[0].winners, {"Frankel"})
+        self.assertEqual(races[1].winners, set())
+
+    def test_read_races_raises_value_error_if_row_incomplete(self):
+        with open(self.path, "a") as file:
+            file.write("3:40 Ascot,Shergar,3\n")
+        with self.assertRaises(ValueError):
+            list(read_races(self.path))
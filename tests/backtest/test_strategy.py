@@ -0,0 +1,51 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.backtest import Strategy
+
+
+class TestStrategy(TestCase):
+    def setUp(self):
+        self.true_market = Market({"Frankel": Odds(4), "Shergar": Odds(4)})
+        self.market = Market({"Frankel": Odds(5), "Shergar": Odds(3)})
+
+    def test_level_stakes_runners_with_edge(self):
+        strategy = Strategy.level(10)
+        self.assertFalse(strategy.proportional)
+        self.assertEqual(
+            strategy.stakes(self.true_market, self.market), {"Frankel": 10}
+        )
+
+    def test_level_stakes_runners_with_edge_after_commission(self):
+        strategy = Strategy.level(10, percentage_commission=50)
+        self.assertEqual(strategy.percentage_commission, 50)
+        self.assertEqual(strategy.stakes(self.true_market, self.market), {})
+
+    def test_level_raises_value_error_if_amount_invalid(self):
+        with self.assertRaises(ValueError):
+            Strategy.level(0)
+
+    def test_kelly_stakes_proportion_of_bank(self):
+        strategy = Strategy.kelly()
+        self.assertTrue(strategy.proportional)
+        self.assertEqual(
+            strategy.stakes(self.true_market, self.market),
+            {"Frankel": Decimal("0.0625"), "Shergar": 0},
+        )
+
+    def test_kelly_applies_fraction(self):
+        stakes = Strategy.kelly(fraction=0.5).stakes(self.true_market, self.market)
+        self.assertEqual(stakes["Frankel"], Decimal("0.03125"))
+
+    def test_simultaneous_kelly_stakes_proportion_of_bank(self):
+        stakes = Strategy.simultaneous_kelly().stakes(self.true_market, self.market)
+        self.assertEqual(stakes["Frankel"], Decimal("0.0625"))
+
+    def test_strategy_raises_value_error_if_max_stake_invalid(self):
+        with self.assertRaises(ValueError):
+            Strategy.kelly(max_stake=0)
+
+    def test_strategy_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            Strategy.kelly(percentage_commission=101)
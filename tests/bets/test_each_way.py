@@ -0,0 +1,264 @@
+from decimal import Decimal
+from fractions import Fraction
+from unittest import TestCase
+
+from pybet import Odds
+from pybet.bets import EachWay, EachWayAccumulator, PlaceTerms, settle_each_way
+
+
+class TestPlaceTerms(TestCase):
+    def test_place_terms_can_be_initialised_with_string_fraction(self):
+        self.assertEqual(PlaceTerms("1/4", 3).fraction, Fraction(1, 4))
+
+    def test_place_terms_raises_value_error_if_fraction_greater_than_one(self):
+        with self.assertRaises(ValueError):
+            PlaceTerms("5/4", 3)
+
+    def test_place_terms_raises_value_error_if_places_less_than_one(self):
+        with self.assertRaises(ValueError):
+            PlaceTerms("1/4", 0)
+
+    def test_place_terms_apply_returns_place_odds(self):
+        self.assertEqual(PlaceTerms("1/4", 3).apply(Odds(9)), Odds(3))
+
+    def test_place_terms_repr(self):
+        self.assertEqual(repr(PlaceTerms("1/5", 4)), "PlaceTerms('1/5', 4)")
+
+
+class TestEachWay(TestCase):
+    def setUp(self):
+        self.terms = PlaceTerms("1/4", 3)
+
+    def test_each_way_total_stake_is_double_stake(self):
+        bet = EachWay(5, Odds(9), lambda: True, lambda: True, terms=self.terms)
+        self.assertEqual(bet.total_stake, 10)
+
+    def test_each_way_settle_returns_both_parts_if_won(self):
+        bet = EachWay(5, Odds(9), lambda: True, lambda: True, terms=self.terms)
+        self.assertEqual(bet.settle(), 60)
+
+    def test_each_way_settle_returns_place_part_if_placed(self):
+        bet = EachWay(5, Odds(9), lambda: False, lambda: True, terms=self.terms)
+        self.assertEqual(bet.settle(), 15)
+
+    def test_each_way_settle_returns_zero_if_unplaced(self):
+        bet = EachWay(5, Odds(9), lambda: False, lambda: False, terms=self.terms)
+        self.assertEqual(bet.settle(), 0)
+
+    def test_each_way_settle_returns_total_stake_if_void(self):
+        bet = EachWay(5, Odds(9), lambda: False, lambda: False, terms=self.terms)
+        bet.void()
+        self.assertEqual(bet.settle(), 10)
+
+    def test_each_way_settle_applies_reduction_to_both_parts(self):
+        bet = EachWay(5, Odds(9), lambda: True, lambda: True, terms=self.terms)
+        self.assertEqual(bet.settle(rf=25), Decimal("47.50"))
+
+    def test_each_way_settle_applies_bog_to_both_parts(self):
+        bet = EachWay(
+            5, Odds(9), lambda: True, lambda: True, terms=self.terms, bog=True
+        )
+        self.assertEqual(bet.settle(sp=Odds(13)), 85)
+
+    def test_each_way_settle_raises_error_if_still_open(self):
+        bet = EachWay(
+            5, Odds(9), lambda: True, lambda: True, lambda: False, terms=self.terms
+        )
+        with self.assertRaises(ValueError):
+            bet.settle()
+
+    def test_each_way_status_returns_placed_if_placed_but_not_won(self):
+        bet = EachWay(5, Odds(9), lambda: False, lambda: True, terms=self.terms)
+        self.assertEqual(str(bet.status), "PLACED")
+
+    def test_each_way_status_returns_won_if_won(self):
+        bet = EachWay(5, Odds(9), lambda: True, lambda: True, terms=self.terms)
+        self.assertEqual(str(bet.status), "WON")
+
+    def test_each_way_status_returns_lost_if_unplaced(self):
+        bet = EachWay(5, Odds(9), lambda: False, lambda: False, terms=self.terms)
+        self.assertEqual(str(bet.status), "LOST")
+
+
+class TestEachWayAccumulator(TestCase):
+    def setUp(self):
+        self.quarter = PlaceTerms("1/4", 3)
+        self.fifth = PlaceTerms("1/5", 4)
+
+    def test_each_way_accumulator_settles_both_parts_if_all_win(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True),
+                (Odds(11), self.fifth, lambda: True, lambda: True),
+            ],
+        )
+        self.assertEqual(acc.settle(), 55 + 6)
+
+    def test_each_way_accumulator_settles_place_part_if_all_placed(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True),
+                (Odds(11), self.fifth, lambda: False, lambda: True),
+            ],
+        )
+        self.assertEqual(acc.settle(), 6)
+
+    def test_each_way_accumulator_settles_as_loss_if_any_unplaced(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True),
+                (Odds(11), self.fifth, lambda: False, lambda: False),
+            ],
+        )
+        self.assertEqual(acc.settle(), 0)
+
+    def test_each_way_accumulator_is_open_until_all_legs_end(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True, lambda: True),
+                (Odds(11), self.fifth, lambda: True, lambda: True, lambda: False),
+            ],
+        )
+        self.assertEqual(str(acc.status), "OPEN")
+        with self.assertRaises(ValueError):
+            acc.settle()
+
+    def test_each_way_accumulator_applies_bog_to_each_leg_of_both_parts(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: False, lambda: True),
+                (Odds(9), self.fifth, lambda: False, lambda: True),
+            ],
+            bog=True,
+        )
+        self.assertEqual([(p, t.places) for p, t in acc.legs], [(5, 3), (9, 4)])
+        self.assertEqual(acc.settle(sp=[Odds(6), Odds(8)]), Decimal("5.85"))
+        with self.assertRaises(ValueError):
+            acc.settle()
+
+    def test_each_way_accumulator_terms_and_place_odds(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True),
+                (Odds(11), self.fifth, lambda: True, lambda: True),
+            ],
+        )
+        self.assertEqual(acc.terms, [self.quarter, self.fifth])
+        self.assertEqual(acc.odds, 55)
+        self.assertEqual(acc.place_odds, 6)
+
+    def test_each_way_accumulator_settles_sp_leg_at_starting_price(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True),
+                ("SP", self.fifth, lambda: True, lambda: True),
+            ],
+        )
+        self.assertEqual((acc.odds, acc.place_odds), ("SP", None))
+        self.assertEqual(acc.settle(sp=[None, Odds(11)]), 55 + 6)
+        with self.assertRaises(ValueError):
+            acc.settle()
+
+    def test_each_way_accumulator_single_leg_matches_each_way(self):
+        won, placed = lambda: False, lambda: True
+        acc = EachWayAccumulator(2, [(Odds(9), self.quarter, won, placed)], bog=True)
+        single = EachWay(2, Odds(9), won, placed, terms=self.quarter, bog=True)
+        self.assertEqual(acc.settle(sp=Odds(11)), single.settle(sp=Odds(11)))
+
+    def test_each_way_accumulator_settles_void_and_deductions(self):
+        legs = [
+            (Odds(5), self.quarter, lambda: True, lambda: True),
+            (Odds(11), self.fifth, lambda: True, lambda: True),
+        ]
+        acc = EachWayAccumulator(1, legs)
+        self.assertEqual(acc.settle(rf=50), Decimal("31.50"))
+        with self.assertRaises(ValueError):
+            acc.settle(rf=100)
+        acc.void()
+        self.assertEqual(acc.settle(), 2)
+
+    def test_each_way_accumulator_raises_value_error_if_starting_prices_invalid(self):
+        acc = EachWayAccumulator(
+            1,
+            [
+                (Odds(5), self.quarter, lambda: True, lambda: True),
+                (Odds(11), self.fifth, lambda: True, lambda: True),
+            ],
+        )
+        for sp in (Odds(6), [Odds(6)]):
+            with self.assertRaises(ValueError):
+                acc.settle(sp=sp)
+
+
+class TestSettleEachWay(TestCase):
+    def setUp(self):
+        self.terms = PlaceTerms("1/4", 3)
+        self.odds = [Odds(9), Odds(5), Odds(21), Odds(3)]
+        self.positions = [1, 3, 0, 4]
+
+    def test_settle_each_way_matches_individual_settlement(self):
+        bets = [
+            EachWay(
+                2.5,
+                odds,
+                lambda pos=pos: pos == 1,
+                lambda pos=pos: 1 <= pos <= 3,
+                terms=self.terms,
+                bog=True,
+            )
+            for odds, pos in zip(self.odds, self.positions)
+        ]
+        sps = [Odds(11), Odds(4), Odds(26), Odds(3)]
+        expected = [bet.settle(sp=sp, rf=15) for bet, sp in zip(bets, sps)]
+        self.assertEqual(
+            settle_each_way(
+                [2.5] * 4,
+                self.odds,
+                self.positions,
+                self.terms,
+                sps=sps,
+                rf=15,
+                bog=True,
+            ),
+            expected,
+        )
+
+    def test_settle_each_way_returns_total_stake_for_void(self):
+        self.assertEqual(settle_each_way([5], [Odds(9)], [None], self.terms), [10])
+
+    def test_settle_each_way_accepts_per_bet_terms(self):
+        terms = [self.terms, PlaceTerms("1/5", 2)]
+        self.assertEqual(
+            settle_each_way([5, 5], [Odds(9), Odds(9)], [3, 3], terms), [15, 0]
+        )
+
+    def test_settle_each_way_raises_value_error_if_lengths_differ(self):
+        with self.assertRaises(ValueError):
+            settle_each_way([5, 5], [Odds(9)], [1], self.terms)
+
+    def test_settle_each_way_raises_value_error_if_per_bet_lengths_differ(self):
+        with self.assertRaises(ValueError):
+            settle_each_way([5, 5], [Odds(9)] * 2, [1, 2], self.terms, rf=[0])
+
+    def test_settle_each_way_raises_value_error_if_sps_length_differs(self):
+        with self.assertRaises(ValueError):
+            settle_each_way([5, 5], [Odds(9)] * 2, [1, 2], self.terms, sps=[Odds(9)])
+
+    def test_settle_each_way_raises_value_error_if_reduction_invalid(self):
+        with self.assertRaises(ValueError):
+            settle_each_way([5], [Odds(9)], [1], self.terms, rf=100)
+
+    def test_settle_each_way_raises_value_error_if_sp_bet_has_no_sp(self):
+        with self.assertRaises(ValueError):
+            settle_each_way([5], ["SP"], [1], self.terms)
+
+    def test_settle_each_way_raises_value_error_if_bog_without_sp(self):
+        with self.assertRaises(ValueError):
+            settle_each_way([5], [Odds(9)], [1], self.terms, bog=True)
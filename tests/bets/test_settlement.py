@@ -0,0 +1,217 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from pybet import Odds
+from pybet.bets import Bet, Double, MemorySink, ResultEvent, SettlementPipeline
+
+
+async def stream(*events):
+    for event in events:
+        yield event
+
+
+class FailingSink:
+    async def write(self, record):
+        raise OSError("Sink unavailable")
+
+
+class SlowSink(MemorySink):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def write(self, record):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        await super().write(record)
+
+
+class TestSettlementPipeline(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.race = {"winner": None}
+        self.sink = MemorySink()
+        self.pipeline = SettlementPipeline(self.sink, concurrency=2, queue_size=1)
+        self.frankel = Bet(10, Odds(3), lambda: self.race["winner"] == "Frankel")
+        self.nijinsky = Bet(10, "SP", lambda: self.race["winner"] == "Nijinsky")
+        self.pipeline.register(self.frankel, "Ascot", "Frankel")
+        self.pipeline.register(self.nijinsky, "Ascot", "Nijinsky")
+
+    def test_result_event_repr(self):
+        self.assertEqual(
+            repr(ResultEvent.void("Ascot", "Shergar")),
+            "ResultEvent(VOID, 'Ascot', 'Shergar')",
+        )
+
+    def test_settlement_pipeline_raises_value_error_if_concurrency_invalid(self):
+        with self.assertRaises(ValueError):
+            SettlementPipeline(self.sink, concurrency=0)
+
+    async def test_settlement_pipeline_settles_bets_on_result(self):
+        self.race["winner"] = "Frankel"
+        await self.pipeline.run(
+            stream(
+                ResultEvent.price("Ascot", "Nijinsky", Odds(4)),
+                ResultEvent.result("Ascot"),
+            )
+        )
+        returns = {record.runner: record.returns for record in self.sink.records}
+        self.assertEqual(returns, {"Frankel": 30, "Nijinsky": 0})
+        self.assertEqual(self.pipeline.open_bets, 0)
+
+    async def test_settlement_pipeline_applies_deductions_and_sp(self):
+        self.race["winner"] = "Nijinsky"
+        await self.pipeline.run(
+            stream(
+                ResultEvent.deduction("Ascot", 10),
+                ResultEvent.deduction("Ascot", 5),
+                ResultEvent.price("Ascot", "Nijinsky", Odds(5)),
+                ResultEvent.result("Ascot"),
+            )
+        )
+        record = next(r for r in self.sink.records if r.runner == "Nijinsky")
+        self.assertEqual((str(record.status), record.returns), ("WON", 44))
+
+    async def test_settlement_pipeline_voids_bets_on_non_runner(self):
+        await self.pipeline.run(stream(ResultEvent.void("Ascot", "Frankel")))
+        [record] = self.sink.records
+        self.assertEqual((str(record.status), record.returns), ("VOID", 10))
+        self.assertEqual(self.pipeline.open_bets, 1)
+
+    async def test_settlement_pipeline_voids_whole_event(self):
+        await self.pipeline.run(stream(ResultEvent.void("Ascot")))
+        self.assertEqual(len(self.sink.records), 2)
+
+    async def test_settlement_pipeline_keeps_unsettleable_bets_registered(self):
+        await self.pipeline.run(stream(ResultEvent.result("Ascot")))
+        self.assertEqual(len(self.sink.records), 1)
+        self.assertEqual(self.pipeline.open_bets, 1)
+
+    async def test_settlement_pipeline_bounds_concurrent_writes(self):
+        sink = SlowSink()
+        pipeline = SettlementPipeline(sink, concurrency=3, queue_size=2)
+        for i in range(20):
+            pipeline.register(Bet(1, Odds(2), lambda: True), "Ascot", i)
+        await pipeline.run(stream(ResultEvent.result("Ascot")))
+        self.assertEqual(len(sink.records), 20)
+        self.assertEqual(sink.max_in_flight, 3)
+
+    async def test_settlement_pipeline_raises_sink_errors(self):
+        pipeline = SettlementPipeline(FailingSink())
+        pipeline.register(Bet(1, Odds(2), lambda: True), "Ascot", "Frankel")
+        pipeline.register(Bet(1, Odds(2), lambda: True), "York", "Shergar")
+        with self.assertRaises(OSError):
+            await pipeline.run(
+                stream(ResultEvent.result("Ascot"), ResultEvent.result("York"))
+            )
+
+    async def test_settlement_pipeline_raises_settlement_errors(self):
+        self.race["winner"] = "Frankel"
+        with self.assertRaisesRegex(ValueError, "Reduction factor"):
+            await self.pipeline.run(
+                stream(
+                    ResultEvent.deduction("Ascot", 60),
+                    ResultEvent.deduction("Ascot", 50),
+                    ResultEvent.price("Ascot", "Nijinsky", Odds(4)),
+                    ResultEvent.result("Ascot"),
+                )
+            )
+        self.assertEqual(self.pipeline.open_bets, 0)
+
+    async def test_settlement_pipeline_discards_prices_once_event_settled(self):
+        self.race["winner"] = "Frankel"
+        await self.pipeline.run(
+            stream(
+                ResultEvent.deduction("Ascot", 10),
+                ResultEvent.price("Ascot", "Nijinsky", Odds(4)),
+                ResultEvent.result("Ascot"),
+            )
+        )
+        self.assertEqual((self.pipeline._sps, self.pipeline._deductions), ({}, {}))
+
+    async def test_settlement_pipeline_keeps_prices_for_unsettled_bets(self):
+        self.race["winner"] = "Frankel"
+        await self.pipeline.run(
+            stream(ResultEvent.deduction("Ascot", 10), ResultEvent.result("Ascot"))
+        )
+        self.assertEqual(self.pipeline._deductions, {"Ascot": 10})
+        await self.pipeline.run(
+            stream(
+                ResultEvent.price("Ascot", "Nijinsky", Odds(4)),
+                ResultEvent.result("Ascot"),
+            )
+        )
+        self.assertEqual(self.pipeline.open_bets, 0)
+        self.assertEqual((self.pipeline._sps, self.pipeline._deductions), ({}, {}))
+
+    async def test_settlement_pipeline_settles_sp_bet_when_price_follows_result(self):
+        self.race["winner"] = "Nijinsky"
+        await self.pipeline.run(
+            stream(
+                ResultEvent.deduction("Ascot", 10),
+                ResultEvent.result("Ascot"),
+                ResultEvent.price("Ascot", "Nijinsky", Odds(5)),
+            )
+        )
+        record = next(r for r in self.sink.records if r.runner == "Nijinsky")
+        self.assertEqual((str(record.status), record.returns), ("WON", 46))
+        self.assertEqual(self.pipeline.open_bets, 0)
+        self.assertEqual((self.pipeline._sps, self.pipeline._deductions), ({}, {}))
+
+    async def test_settlement_pipeline_settles_multiple_when_other_leg_finishes(self):
+        york = {"winner": None}
+        double = Double(
+            10,
+            [
+                (Odds(3), lambda: self.race["winner"] == "Frankel", lambda: True),
+                (
+                    Odds(2),
+                    lambda: york["winner"] == "Shergar",
+                    lambda: york["winner"] is not None,
+                ),
+            ],
+        )
+        self.pipeline.register(double, "Ascot", "Frankel", depends=["York"])
+        self.race["winner"] = "Frankel"
+
+        async def events():
+            yield ResultEvent.price("Ascot", "Nijinsky", Odds(4))
+            yield ResultEvent.deduction("Ascot", 10)
+            yield ResultEvent.result("Ascot")
+            york["winner"] = "Shergar"
+            yield ResultEvent.void("York", "Dancing Brave")
+            yield ResultEvent.result("York")
+
+        await self.pipeline.run(events())
+        record = self.sink.records[-1]
+        self.assertIs(record.bet, double)
+        self.assertEqual((record.event, record.returns), ("Ascot", 55))
+        self.assertEqual(self.pipeline.open_bets, 0)
+        self.assertEqual(self.pipeline._dependents, {})
+
+    async def test_settlement_pipeline_keeps_multiple_until_own_event_resulted(self):
+        double = Double(
+            10, [(Odds(3), lambda: True, lambda: True), (Odds(2), lambda: True)]
+        )
+        self.pipeline.register(double, "Ascot", "Frankel", depends=["York"])
+        await self.pipeline.run(stream(ResultEvent.result("York")))
+        self.assertEqual(self.sink.records, [])
+        await self.pipeline.run(stream(ResultEvent.result("Ascot")))
+        self.assertIn(double, [record.bet for record in self.sink.records])
+
+    async def test_settlement_pipeline_stops_consuming_events_after_error(self):
+        pipeline = SettlementPipeline(FailingSink(), queue_size=1)
+        consumed = []
+
+        async def events():
+            for i in range(100):
+                consumed.append(i)
+                pipeline.register(Bet(1, Odds(2), lambda: True), i, "Frankel")
+                yield ResultEvent.result(i)
+                await asyncio.sleep(0)
+
+        with self.assertRaises(OSError):
+            await pipeline.run(events())
+        self.assertLess(len(consumed), 100)
@@ -0,0 +1,97 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Odds
+from pybet.bets import Bet, BetStore, EachWay, PlaceTerms
+
+
+class TestBetStore(TestCase):
+    def setUp(self):
+        self.store = BetStore()
+        self.bet = self.store.append(2.50, Odds(2))
+
+    def test_bet_store_append_stores_stake_and_odds(self):
+        self.assertEqual((self.bet.stake, self.bet.odds), (Decimal("2.50"), Odds(2)))
+
+    def test_bet_store_append_stores_sp(self):
+        self.assertEqual(self.store.append(2.50, "SP").odds, "SP")
+
+    def test_bet_store_append_stores_bog(self):
+        self.assertTrue(self.store.append(2.50, Odds(2), bog=True).bog)
+
+    def test_bet_store_append_raises_value_error_if_odds_invalid(self):
+        with self.assertRaises(ValueError):
+            self.store.append(2.50, "foobar")
+
+    def test_bet_store_append_raises_value_error_if_stake_not_whole_pence(self):
+        with self.assertRaises(ValueError):
+            self.store.append(2.505, Odds(2))
+
+    def test_bet_store_add_copies_bet(self):
+        view = self.store.add(Bet(5, Odds(3), lambda: True, bog=True))
+        self.assertEqual((view.stake, view.odds, view.bog), (5, Odds(3), True))
+
+    def test_bet_store_add_copies_voided_bet_as_void(self):
+        bet = Bet(5, Odds(3), lambda: True)
+        bet.void()
+        self.assertEqual(str(self.store.add(bet).status), "VOID")
+
+    def test_bet_store_add_raises_value_error_if_each_way(self):
+        bet = EachWay(
+            5, Odds(9), lambda: True, lambda: True, terms=PlaceTerms("1/4", 3)
+        )
+        with self.assertRaises(ValueError):
+            self.store.add(bet)
+
+    def test_bet_store_length_and_iteration(self):
+        self.store.append(1, Odds(3))
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual([bet.odds for bet in self.store], [Odds(2), Odds(3)])
+
+    def test_bet_store_getitem_supports_negative_index(self):
+        self.assertEqual(self.store[-1].stake, Decimal("2.50"))
+
+    def test_bet_store_getitem_raises_index_error_if_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.store[1]
+
+    def test_bet_store_nbytes(self):
+        self.assertEqual(self.store.nbytes, 18)
+
+    def test_bet_view_repr(self):
+        self.assertEqual(repr(self.bet), "BetView(0)")
+
+    def test_bet_view_status_is_open_until_resolved(self):
+        self.assertEqual(str(self.bet.status), "OPEN")
+
+    def test_bet_view_settle_raises_value_error_if_open(self):
+        with self.assertRaises(ValueError):
+            self.bet.settle()
+
+    def test_bet_view_settle_returns_stake_times_odds_if_won(self):
+        self.bet.resolve(won=True)
+        self.assertEqual(self.bet.settle(), 5)
+
+    def test_bet_view_settle_returns_zero_if_lost(self):
+        self.bet.resolve(won=False)
+        self.assertEqual(self.bet.settle(), 0)
+
+    def test_bet_view_settle_returns_stake_if_void(self):
+        self.bet.void()
+        self.assertEqual(self.bet.settle(), 2.50)
+
+    def test_bet_view_settle_matches_bet_with_reduction_and_bog(self):
+        bet = Bet(2.50, Odds(3), lambda: True, bog=True)
+        view = self.store.add(bet)
+        view.resolve(won=True)
+        self.assertEqual(view.settle(sp=Odds(4), rf=15), bet.settle(sp=Odds(4), rf=15))
+
+    def test_bet_view_settle_raises_value_error_if_reduction_invalid(self):
+        self.bet.resolve(won=True)
+        with self.assertRaises(ValueError):
+            self.bet.settle(rf=100)
+
+    def test_bet_view_resolve_raises_value_error_if_void(self):
+        self.bet.void()
+        with self.assertRaises(ValueError):
+            self.bet.resolve(won=True)
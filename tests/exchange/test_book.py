@@ -0,0 +1,196 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Odds
+from pybet.exchange import Exchange, Fill, OrderBook, Side
+
+
+class TestOrderBook(TestCase):
+    def setUp(self):
+        self.book = OrderBook()
+
+    def test_side_str(self):
+        self.assertEqual(str(Side.BACK), "BACK")
+
+    def test_order_book_rests_unmatched_orders(self):
+        self.assertEqual(self.book.place(Side.LAY, Odds(3), 10), (1, []))
+        self.assertEqual(self.book.place(Side.BACK, Odds(4), 10), (2, []))
+        self.assertEqual(self.book.best_back, Odds(3))
+        self.assertEqual(self.book.best_lay, Odds(4))
+        self.assertEqual(len(self.book), 2)
+
+    def test_order_book_back_matches_longest_lay_first(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.book.place(Side.LAY, Odds("3.1"), 10)
+        _, fills = self.book.place(Side.BACK, Odds(3), 15)
+        self.assertEqual(
+            fills,
+            [
+                Fill(3, 2, Odds("3.1"), Decimal(10)),
+                Fill(3, 1, Odds(3), Decimal(5)),
+            ],
+        )
+        self.assertEqual(self.book.remaining(1), Decimal(5))
+
+    def test_order_book_lay_matches_shortest_back_first(self):
+        self.book.place(Side.BACK, Odds("2.5"), 10)
+        self.book.place(Side.BACK, Odds("2.4"), 10)
+        _, fills = self.book.place(Side.LAY, Odds("2.5"), 12)
+        self.assertEqual([f.odds for f in fills], [Odds("2.4"), Odds("2.5")])
+        self.assertEqual([f.size for f in fills], [Decimal(10), Decimal(2)])
+
+    def test_order_book_matches_in_time_priority(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.book.place(Side.LAY, Odds(3), 10)
+        _, fills = self.book.place(Side.BACK, Odds(3), 15)
+        self.assertEqual([(f.maker, f.size) for f in fills], [(1, 10), (2, 5)])
+
+    def test_order_book_does_not_match_uncrossed_orders(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        _, fills = self.book.place(Side.BACK, Odds("3.05"), 10)
+        self.assertEqual(fills, [])
+
+    def test_order_book_rests_remainder_after_partial_fill(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        order_id, _ = self.book.place(Side.BACK, Odds("2.9"), 25)
+        self.assertEqual(self.book.remaining(order_id), Decimal(15))
+        self.assertEqual(self.book.best_lay, Odds("2.9"))
+        self.assertIsNone(self.book.best_back)
+
+    def test_order_book_lapses_remainder_if_not_persisted(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        order_id, fills = self.book.place(Side.BACK, Odds(3), 25, persist=False)
+        self.assertEqual(len(fills), 1)
+        self.assertNotIn(order_id, self.book)
+
+    def test_order_book_cancel(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.book.place(Side.LAY, Odds("2.9"), 10)
+        self.assertEqual(self.book.cancel(1), Decimal(10))
+        self.assertEqual(self.book.best_back, Odds("2.9"))
+        self.assertEqual(self.book.cancel(1), Decimal(0))
+
+    def test_order_book_partial_cancel_keeps_priority(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.assertEqual(self.book.cancel(1, 4), Decimal(4))
+        _, fills = self.book.place(Side.BACK, Odds(3), 8)
+        self.assertEqual([(f.maker, f.size) for f in fills], [(1, 6), (2, 2)])
+
+    def test_order_book_skips_cancelled_orders(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.book.place(Side.LAY, Odds(3), 10)
+        self.book.cancel(1)
+        _, fills = self.book.place(Side.BACK, Odds(3), 5)
+        self.assertEqual([f.maker for f in fills], [2])
+
+    def test_order_book_replaced_order_joins_back_of_queue(self):
+        self.book.place(Side.LAY, Odds(3), 10, order_id=1)
+        self.book.place(Side.LAY, Odds(3), 10, order_id=2)
+        self.book.cancel(1)
+        self.book.place(Side.LAY, Odds(3), 10, order_id=1)
+        _, fills = self.book.place(Side.BACK, Odds(3), 15)
+        self.assertEqual([(f.maker, f.size) for f in fills], [(2, 10), (1, 5)])
+
+    def test_order_book_lay_does_not_match_longer_backs(self):
+        self.book.place(Side.BACK, Odds(3), 10)
+        _, fills = self.book.place(Side.LAY, Odds("2.9"), 10)
+        self.assertEqual(fills, [])
+        self.assertEqual(self.book.best_lay, Odds(3))
+
+    def test_order_book_cancel_raises_value_error_if_size_not_positive(self):
+        self.book.place(Side.LAY, Odds(3), 10)
+        for size in (0, -5):
+            with self.assertRaises(ValueError):
+                self.book.cancel(1, size)
+        self.assertEqual(self.book.depth(Side.BACK), [(Odds(3), Decimal(10))])
+
+    def test_order_book_depth(self):
+        for odds, size in [(3, 10), (3, 5), ("2.9", 7), ("2.8", 1), ("2.7", 1)]:
+            self.book.place(Side.LAY, Odds(odds), size)
+        self.assertEqual(
+            self.book.depth(Side.BACK, 2),
+            [(Odds(3), Decimal(15)), (Odds("2.9"), Decimal(7))],
+        )
+        self.assertEqual(self.book.depth(Side.LAY), [])
+
+    def test_order_book_raises_value_error_if_off_ladder(self):
+        with self.assertRaises(ValueError):
+            self.book.place(Side.BACK, Odds("3.01"), 10)
+
+    def test_order_book_raises_value_error_if_size_not_positive(self):
+        with self.assertRaises(ValueError):
+            self.book.place(Side.BACK, Odds(3), 0)
+
+    def test_order_book_raises_value_error_if_order_id_repeated(self):
+        self.book.place(Side.BACK, Odds(3), 10, order_id=7)
+        with self.assertRaises(ValueError):
+            self.book.place(Side.BACK, Odds(3), 10, order_id=7)
+
+    def test_order_book_skips_order_ids_already_in_use(self):
+        self.book.place(Side.BACK, Odds(3), 10, order_id=1)
+        order_id, _ = self.book.place(Side.BACK, Odds(3), 10)
+        self.assertEqual(order_id, 2)
+        self.assertEqual(self.book.remaining(1), Decimal(10))
+
+
+class TestExchange(TestCase):
+    def setUp(self):
+        self.exchange = Exchange(["Frankel", "Shergar"])
+
+    def test_exchange_markets(self):
+        self.exchange.place("Frankel", Side.LAY, Odds(2), 100)
+        self.exchange.place("Frankel", Side.BACK, Odds("2.1"), 100)
+        self.exchange.place("Shergar", Side.LAY, Odds("1.9"), 100)
+        self.assertEqual(
+            self.exchange.back_market(), {"Frankel": Odds(2), "Shergar": Odds("1.9")}
+        )
+        self.assertEqual(
+            self.exchange.lay_market(), {"Frankel": Odds("2.1"), "Shergar": None}
+        )
+
+    def test_exchange_order_ids_are_market_wide(self):
+        first, _ = self.exchange.place("Frankel", Side.LAY, Odds(2), 10)
+        second, _ = self.exchange.place("Shergar", Side.LAY, Odds(2), 10)
+        self.assertEqual((first, second), (1, 2))
+        self.assertEqual(self.exchange.cancel(second), Decimal(10))
+        self.assertIsNone(self.exchange.back_market()["Shergar"])
+
+    def test_exchange_raises_value_error_if_order_id_repeated(self):
+        self.exchange.place("Frankel", Side.LAY, Odds(2), 10, order_id=7)
+        with self.assertRaises(ValueError):
+            self.exchange.place("Shergar", Side.LAY, Odds(2), 10, order_id=7)
+
+    def test_exchange_skips_order_ids_already_in_use(self):
+        self.exchange.place("Shergar", Side.LAY, Odds(2), 10, order_id=1)
+        order_id, _ = self.exchange.place("Frankel", Side.LAY, Odds(2), 10)
+        self.assertEqual(order_id, 2)
+        self.assertEqual(self.exchange.cancel(1), Decimal(10))
+        self.assertIsNone(self.exchange.back_market()["Shergar"])
+
+    def test_exchange_cancel_raises_value_error_if_size_not_positive(self):
+        with self.assertRaises(ValueError):
+            self.exchange.cancel(1, -5)
+
+    def test_exchange_raises_value_error_if_unknown_runner(self):
+        with self.assertRaises(ValueError):
+            self.exchange.place("Nijinsky", Side.BACK, Odds(2), 10)
+
+    def test_exchange_replay(self):
+        fills = self.exchange.replay(
+            [
+                ("place", 10, "Frankel", Side.LAY, Odds(3), 20),
+                ("place", 11, "Frankel", Side.LAY, Odds(3), 20),
+                ("cancel", 10, 5),
+                ("place", 12, "Frankel", Side.BACK, Odds(3), 30),
+            ]
+        )
+        self.assertEqual(
+            [(f.maker, f.size) for f in fills], [(10, Decimal(15)), (11, Decimal(15))]
+        )
+        self.assertEqual(self.exchange.cancel(10), Decimal(0))
+        self.assertEqual(self.exchange.cancel(11), Decimal(5))
+
+    def test_exchange_replay_raises_value_error_if_unknown_instruction(self):
+        with self.assertRaises(ValueError):
+            self.exchange.replay([("amend", 1)])
@@ -0,0 +1,117 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.exchange import Position, Side, hedge, hedge_many
+
+
+class TestHedge(TestCase):
+    def setUp(self):
+        self.back = Market(
+            {
+                "Frankel": Odds("2.9"),
+                "Shergar": Odds("3.5"),
+                "Nijinsky": Odds(5),
+            }
+        )
+        self.lay = Market(
+            {
+                "Frankel": Odds(3),
+                "Shergar": Odds("3.6"),
+                "Nijinsky": Odds("5.2"),
+            }
+        )
+
+    def test_hedge_lays_a_back_position_that_has_shortened(self):
+        positions = [Position("Frankel", Side.BACK, Odds(4), Decimal(10))]
+        result = hedge(positions, self.back, self.lay)
+        self.assertEqual(
+            result.bets,
+            [Position("Frankel", Side.LAY, Odds(3), Decimal("13.33"))],
+        )
+        self.assertEqual(
+            result.profits,
+            {
+                "Frankel": Decimal("3.34"),
+                "Shergar": Decimal("3.33"),
+                "Nijinsky": Decimal("3.33"),
+            },
+        )
+
+    def test_hedge_backs_a_lay_position_that_has_drifted(self):
+        positions = [Position("Shergar", Side.LAY, Odds(3), Decimal(20))]
+        result = hedge(positions, self.back, self.lay)
+        self.assertEqual(
+            result.bets,
+            [Position("Shergar", Side.BACK, Odds("3.5"), Decimal("17.14"))],
+        )
+        self.assertEqual(
+            set(result.profits.values()), {Decimal("2.85"), Decimal("2.86")}
+        )
+
+    def test_hedge_equalises_many_positions(self):
+        positions = [
+            Position("Frankel", Side.BACK, Odds(4), Decimal(10)),
+            Position("Frankel", Side.LAY, Odds("3.5"), Decimal(5)),
+            Position("Shergar", Side.LAY, Odds(3), Decimal(20)),
+            Position("Nijinsky", Side.BACK, Odds(6), Decimal(4)),
+        ]
+        profits = hedge(positions, self.back, self.lay).profits
+        self.assertLessEqual(
+            max(profits.values()) - min(profits.values()), Decimal("0.05")
+        )
+
+    def test_hedge_applies_commission_to_winnings(self):
+        positions = [Position("Frankel", Side.BACK, Odds(4), Decimal(10))]
+        result = hedge(positions, self.back, self.lay, 5)
+        self.assertEqual(result.profits["Shergar"], Decimal("3.16"))
+
+    def test_hedge_only_chosen_runners(self):
+        positions = [
+            Position("Frankel", Side.BACK, Odds(4), Decimal(10)),
+            Position("Shergar", Side.BACK, Odds(4), Decimal(10)),
+        ]
+        result = hedge(positions, self.back, self.lay, runners=["Shergar"])
+        self.assertEqual([bet.runner for bet in result.bets], ["Shergar"])
+
+    def test_hedge_leaves_target_on_runner(self):
+        positions = [Position("Frankel", Side.BACK, Odds(4), Decimal(10))]
+        result = hedge(positions, self.back, self.lay, targets={"Frankel": 12})
+        self.assertAlmostEqual(
+            result.profits["Frankel"] - result.profits["Shergar"],
+            Decimal(12),
+            delta=Decimal("0.02"),
+        )
+
+    def test_hedge_snaps_prices_to_ladder(self):
+        positions = [Position("Frankel", Side.BACK, Odds(4), Decimal(10))]
+        lay = Market({"Frankel": Odds("3.03")})
+        self.assertEqual(hedge(positions, self.back, lay).bets[0].odds, Odds("3.05"))
+        self.assertEqual(
+            hedge(positions, self.back, lay, ladder=False).bets[0].odds, Odds("3.03")
+        )
+
+    def test_hedge_skips_stakes_below_minimum(self):
+        positions = [Position("Frankel", Side.BACK, Odds("3.1"), Decimal(2))]
+        result = hedge(positions, self.back, self.lay, min_stake=Decimal(5))
+        self.assertEqual(result.bets, [])
+        self.assertEqual(result.profits["Frankel"], Decimal("4.20"))
+
+    def test_hedge_rounds_stakes_to_increment(self):
+        positions = [Position("Frankel", Side.BACK, Odds(4), Decimal(10))]
+        result = hedge(positions, self.back, self.lay, increment=Decimal(1))
+        self.assertEqual(result.bets[0].stake, Decimal(13))
+
+    def test_hedge_skips_runners_without_price(self):
+        positions = [Position("Sea Bird", Side.BACK, Odds(4), Decimal(10))]
+        self.assertEqual(hedge(positions, self.back, self.lay).bets, [])
+
+    def test_hedge_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            hedge([], self.back, self.lay, 101)
+
+    def test_hedge_many(self):
+        positions = [Position("Frankel", Side.BACK, Odds(4), Decimal(10))]
+        results = hedge_many([(positions, self.back, self.lay), ([], self.back, None)])
+        self.assertEqual(len(results[0].bets), 1)
+        self.assertEqual(results[1].bets, [])
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from pybet import Odds
+from pybet.exchange import TICKS, offset, snap, tick_index, ticks_between
+
+
+class TestLadder(TestCase):
+    def test_ticks(self):
+        self.assertEqual(len(TICKS), 350)
+        self.assertEqual((TICKS[0], TICKS[-1]), (Odds("1.01"), Odds(1000)))
+        self.assertEqual(TICKS[99:102], (Odds("2"), Odds("2.02"), Odds("2.04")))
+        self.assertEqual(list(TICKS), sorted(TICKS))
+
+    def test_tick_index(self):
+        self.assertEqual(tick_index(Odds("2.02")), 100)
+        self.assertEqual(tick_index(2.02), 100)
+
+    def test_tick_index_raises_value_error_if_off_ladder(self):
+        with self.assertRaises(ValueError):
+            tick_index(Odds("2.01"))
+
+    def test_snap(self):
+        self.assertEqual(snap(Odds("3.33")), Odds("3.35"))
+        self.assertEqual(snap(Odds("3.33"), "down"), Odds("3.3"))
+        self.assertEqual(snap(Odds("3.31"), "up"), Odds("3.35"))
+        self.assertEqual(snap(Odds("3.3"), "up"), Odds("3.3"))
+
+    def test_snap_limits_to_ladder(self):
+        self.assertEqual(snap(1), Odds("1.01"))
+        self.assertEqual(snap(5000, "up"), Odds(1000))
+
+    def test_offset(self):
+        self.assertEqual(offset(Odds("1.99"), 2), Odds("2.02"))
+        self.assertEqual(offset(Odds("1.02"), -5), Odds("1.01"))
+
+    def test_ticks_between(self):
+        self.assertEqual(ticks_between(Odds("1.98"), Odds("2.04")), 4)
+        self.assertEqual(ticks_between(Odds("2.04"), Odds("1.98")), -4)
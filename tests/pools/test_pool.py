@@ -0,0 +1,214 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Odds
+from pybet.pools import ExactaPool, PlacePool, TrifectaPool, WinPool
+
+RUNNERS = ["Frankel", "Shergar", "Nijinsky", "Mill Reef"]
+
+
+class TestWinPool(TestCase):
+    def setUp(self):
+        self.pool = WinPool(RUNNERS, deduction=20)
+        self.pool.add_many(
+            [
+                ("Frankel", 50),
+                ("Shergar", 30),
+                ("Nijinsky", 15),
+                ("Mill Reef", 5),
+                ("Frankel", 0.5),
+            ]
+        )
+
+    def test_win_pool_totals(self):
+        self.assertEqual(self.pool.total, Decimal("100.50"))
+        self.assertEqual(self.pool.net, Decimal("80.40"))
+        self.assertEqual(self.pool.stake("Frankel"), Decimal("50.50"))
+
+    def test_win_pool_dividends(self):
+        self.assertEqual(self.pool.dividends(["Shergar"]), {"Shergar": Decimal("2.68")})
+
+    def test_win_pool_dividends_on_dead_heat(self):
+        self.assertEqual(
+            self.pool.dividends([{"Shergar", "Nijinsky"}]),
+            {"Shergar": Decimal("1.34"), "Nijinsky": Decimal("2.68")},
+        )
+
+    def test_win_pool_dividends_empty_if_winner_unbacked(self):
+        pool = WinPool(RUNNERS)
+        pool.add("Frankel", 10)
+        self.assertEqual(pool.dividends(["Shergar"]), {})
+
+    def test_win_pool_market(self):
+        market = self.pool.market()
+        self.assertEqual(market["Mill Reef"], Odds("16.08"))
+        self.assertAlmostEqual(market.percentage, 125, places=0)
+
+    def test_win_pool_market_leaves_unbacked_runners_unpriced(self):
+        pool = WinPool(RUNNERS)
+        pool.add("Frankel", 10)
+        self.assertEqual(
+            pool.market(),
+            {"Frankel": Odds(1), "Shergar": None, "Nijinsky": None, "Mill Reef": None},
+        )
+
+    def test_win_pool_market_prices_dividends_below_one_at_one(self):
+        pool = WinPool(RUNNERS, deduction=20)
+        pool.add("Frankel", 10)
+        self.assertEqual(pool.approximates(), {"Frankel": Decimal("0.80")})
+        self.assertEqual(pool.market()["Frankel"], Odds(1))
+
+    def test_win_pool_scratch_refunds_bets(self):
+        self.assertEqual(self.pool.scratch("Mill Reef"), Decimal(5))
+        self.assertEqual(self.pool.total, Decimal("95.50"))
+        self.assertEqual(self.pool.refunds, Decimal(5))
+        self.assertNotIn("Mill Reef", self.pool.market())
+
+    def test_win_pool_raises_value_error_if_scratched_runner_backed(self):
+        self.pool.scratch("Mill Reef")
+        with self.assertRaises(ValueError):
+            self.pool.add("Mill Reef", 5)
+
+    def test_win_pool_raises_value_error_if_scratched_runner_in_result(self):
+        self.pool.scratch("Mill Reef")
+        with self.assertRaises(ValueError):
+            self.pool.dividends(["Mill Reef"])
+
+    def test_win_pool_raises_value_error_if_result_invalid(self):
+        with self.assertRaises(ValueError):
+            self.pool.dividends(["Frankel", "Frankel"])
+        with self.assertRaises(ValueError):
+            self.pool.dividends(["Sea Bird"])
+
+    def test_win_pool_raises_value_error_if_stake_invalid(self):
+        for stake in (0, -1, "0.001"):
+            with self.assertRaises(ValueError):
+                self.pool.add("Frankel", stake)
+
+    def test_win_pool_raises_value_error_if_unknown_runner(self):
+        with self.assertRaises(ValueError):
+            self.pool.add("Sea Bird", 5)
+        with self.assertRaises(ValueError):
+            self.pool.scratch("Sea Bird")
+
+    def test_win_pool_raises_value_error_if_deduction_invalid(self):
+        with self.assertRaises(ValueError):
+            WinPool(RUNNERS, deduction=100)
+
+    def test_win_pool_raises_value_error_if_runners_repeated(self):
+        with self.assertRaises(ValueError):
+            WinPool(["Frankel", "Frankel"])
+
+
+class TestPlacePool(TestCase):
+    def setUp(self):
+        self.pool = PlacePool(RUNNERS, places=2)
+        self.pool.add_many(
+            [
+                ("Frankel", 50),
+                ("Shergar", 30),
+                ("Nijinsky", 15),
+                ("Mill Reef", 5),
+            ]
+        )
+
+    def test_place_pool_dividends(self):
+        self.assertEqual(
+            self.pool.dividends(["Nijinsky", "Shergar", "Frankel"]),
+            {"Nijinsky": Decimal("2.83"), "Shergar": Decimal("1.91")},
+        )
+
+    def test_place_pool_dividends_on_dead_heat_for_last_place(self):
+        # Profit 100 - 95 = 5, Shergar's half of it, Frankel and Nijinsky sharing the other half
+        self.assertEqual(
+            self.pool.dividends(["Shergar", {"Frankel", "Nijinsky"}]),
+            {
+                "Shergar": Decimal("1.08"),
+                "Frankel": Decimal("1.02"),
+                "Nijinsky": Decimal("1.08"),
+            },
+        )
+
+    def test_place_pool_returns_stakes_if_pool_short(self):
+        pool = PlacePool(RUNNERS, places=2, deduction=20)
+        pool.add_many([("Frankel", 60), ("Shergar", 30), ("Nijinsky", 10)])
+        self.assertEqual(
+            pool.dividends(["Frankel", "Shergar"]),
+            {"Frankel": Decimal(1), "Shergar": Decimal(1)},
+        )
+
+    def test_place_pool_approximates_assume_most_backed_others_placed(self):
+        self.assertEqual(self.pool.approximates()["Mill Reef"], Decimal("5.50"))
+
+    def test_place_pool_dividends_empty_if_placed_runners_unbacked(self):
+        pool = PlacePool(RUNNERS, places=2)
+        pool.add("Frankel", 10)
+        self.assertEqual(pool.dividends(["Shergar", "Nijinsky"]), {})
+
+    def test_place_pool_market_has_places(self):
+        self.assertEqual(self.pool.market().places, 2)
+
+    def test_place_pool_raises_value_error_if_places_invalid(self):
+        with self.assertRaises(ValueError):
+            PlacePool(RUNNERS, places=0)
+
+
+class TestExoticPools(TestCase):
+    def test_exacta_pool_dividends(self):
+        pool = ExactaPool(RUNNERS, deduction=20)
+        pool.add(("Frankel", "Shergar"), 10)
+        pool.add(("Shergar", "Frankel"), 30)
+        self.assertEqual(
+            pool.dividends(["Frankel", "Shergar", "Nijinsky"]),
+            {("Frankel", "Shergar"): Decimal("3.20")},
+        )
+
+    def test_exacta_pool_dividends_on_dead_heat_for_first(self):
+        pool = ExactaPool(RUNNERS)
+        pool.add(("Frankel", "Shergar"), 10)
+        pool.add(("Shergar", "Frankel"), 30)
+        pool.add(("Nijinsky", "Frankel"), 40)
+        self.assertEqual(
+            pool.dividends([{"Frankel", "Shergar"}, "Nijinsky"]),
+            {
+                ("Frankel", "Shergar"): Decimal(4),
+                ("Shergar", "Frankel"): Decimal("1.33"),
+            },
+        )
+
+    def test_exacta_pool_raises_value_error_if_selection_invalid(self):
+        pool = ExactaPool(RUNNERS)
+        for selection in [("Frankel",), ("Frankel", "Frankel"), "Frankel"]:
+            with self.assertRaises(ValueError):
+                pool.add(selection, 5)
+
+    def test_exacta_pool_scratch_refunds_every_combination(self):
+        pool = ExactaPool(RUNNERS)
+        pool.add_many(
+            [
+                (("Frankel", "Shergar"), 10),
+                (("Shergar", "Frankel"), 20),
+                (("Nijinsky", "Mill Reef"), 5),
+            ]
+        )
+        self.assertEqual(pool.scratch("Frankel"), Decimal(30))
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.scratch("Frankel"), Decimal(0))
+
+    def test_trifecta_pool_dividends(self):
+        pool = TrifectaPool(RUNNERS, deduction=10)
+        pool.add(("Frankel", "Shergar", "Nijinsky"), 2)
+        pool.add(("Frankel", "Nijinsky", "Shergar"), 8)
+        self.assertEqual(
+            pool.dividends(["Frankel", "Shergar", "Nijinsky", "Mill Reef"]),
+            {("Frankel", "Shergar", "Nijinsky"): Decimal("4.50")},
+        )
+
+    def test_trifecta_pool_market_keyed_by_combination(self):
+        pool = TrifectaPool(RUNNERS)
+        pool.add(("Frankel", "Shergar", "Nijinsky"), 2)
+        self.assertEqual(pool.market(), {("Frankel", "Shergar", "Nijinsky"): Odds(1)})
+
+    def test_trifecta_pool_raises_value_error_if_result_too_short(self):
+        with self.assertRaises(ValueError):
+            TrifectaPool(RUNNERS).dividends(["Frankel", "Shergar"])
@@ -0,0 +1,126 @@
+import os
+import tempfile
+from math import isnan
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.prices import MarketFileReader, MarketFileWriter
+
+
+class TestMarketFile(TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "season.markets")
+        place_market = Market(
+            {"Frankel": Odds(1.5), "Shergar": None, "Nijinsky": Odds(2)}
+        )
+        place_market.places = 2
+        with MarketFileWriter(self.path) as writer:
+            writer.write(
+                0, "2:30 Ascot", Market({"Frankel": Odds(3), "Shergar": Odds(4)})
+            )
+            writer.write(60, "3:05 Ascot", place_market)
+            self.assertEqual(len(writer), 2)
+        self.reader = MarketFileReader(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        os.remove(self.path)
+
+    def test_market_file_reads_snapshots(self):
+        time, event, market = self.reader[0]
+        self.assertEqual((time, event), (0, "2:30 Ascot"))
+        self.assertEqual(market, {"Frankel": Odds(3), "Shergar": Odds(4)})
+        self.assertEqual(market.places, 1)
+
+    def test_market_file_keeps_places_and_unpriced_runners(self):
+        market = self.reader[-1].market
+        self.assertEqual(market, {"Frankel": Odds(1.5), "Shergar": None, "Nijinsky": 2})
+        self.assertEqual(market.places, 2)
+
+    def test_market_file_iterates_snapshots(self):
+        self.assertEqual(
+            [event for _, event, _ in self.reader], ["2:30 Ascot", "3:05 Ascot"]
+        )
+
+    def test_market_file_exposes_columns(self):
+        self.assertEqual(len(self.reader), 2)
+        self.assertEqual(list(self.reader.times), [0, 60])
+        self.assertEqual(list(self.reader.places), [1, 2])
+        self.assertEqual(list(self.reader.event_ids), [0, 1])
+        self.assertEqual(self.reader.runners, ["Frankel", "Shergar", "Nijinsky"])
+
+    def test_market_file_arrays(self):
+        ids, prices = self.reader.arrays(1)
+        self.assertEqual(list(ids), [0, 1, 2])
+        self.assertEqual(prices[0], 1.5)
+        self.assertTrue(isnan(prices[1]))
+        ids.release()
+        prices.release()
+
+    def test_market_file_close_raises_value_error_if_arrays_held(self):
+        ids, prices = self.reader.arrays(0)
+        with self.assertRaises(ValueError):
+            self.reader.close()
+        ids.release()
+        prices.release()
+        self.reader.close()
+
+    def test_market_file_raises_index_error_if_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.reader[2]
+
+    def test_market_file_reader_context_manager(self):
+        with MarketFileReader(self.path) as reader:
+            self.assertEqual(reader[0].event, "2:30 Ascot")
+        with self.assertRaises(ValueError):
+            reader.times[0]
+
+    def test_market_file_reads_file_without_footer(self):
+        path = os.path.join(tempfile.mkdtemp(), "crashed.markets")
+        writer = MarketFileWriter(path)
+        writer.write(0, "2:30 Ascot", Market({"Frankel": Odds(3), "Shergar": Odds(4)}))
+        writer.write(60, "2:30 Ascot", Market({"Frankel": Odds(2.5), "Nijinsky": None}))
+        writer._file.flush()
+        with MarketFileReader(path) as reader:
+            self.assertEqual(list(reader.times), [0, 60])
+            self.assertEqual(reader.runners, ["Frankel", "Shergar", "Nijinsky"])
+            self.assertEqual(reader.events, ["2:30 Ascot"])
+            self.assertEqual(reader[1].market, {"Frankel": Odds(2.5), "Nijinsky": None})
+        writer._file.close()
+
+    def test_market_file_reads_file_without_footer_up_to_last_full_snapshot(self):
+        path = os.path.join(tempfile.mkdtemp(), "truncated.markets")
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(path, "wb") as file:
+            file.write(data[: self.reader._offsets[1] + 4])
+        with MarketFileReader(path) as reader:
+            self.assertEqual([event for _, event, _ in reader], ["2:30 Ascot"])
+
+    def test_market_file_reads_empty_file_without_footer(self):
+        path = os.path.join(tempfile.mkdtemp(), "empty.markets")
+        writer = MarketFileWriter(path)
+        writer._file.flush()
+        with MarketFileReader(path) as reader:
+            self.assertEqual(len(reader), 0)
+        writer.close()
+        writer.close()
+        with MarketFileReader(path) as reader:
+            self.assertEqual(len(reader), 0)
+
+    def test_market_file_writer_raises_value_error_if_closed(self):
+        writer = MarketFileWriter(os.path.join(tempfile.mkdtemp(), "closed.markets"))
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.write(0, "2:30 Ascot", Market({"Frankel": Odds(3)}))
+
+    def test_market_file_reader_raises_value_error_if_not_market_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "other.bin")
+        with open(path, "wb") as file:
+            file.write(b"not a market file at all, just some bytes")
+        with self.assertRaises(ValueError):
+            MarketFileReader(path)
+        with open(path, "wb") as file:
+            file.write(b"PYBET")
+        with self.assertRaises(ValueError):
+            MarketFileReader(path)
@@ -0,0 +1,89 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.prices import BestPriceIndex
+
+
+class TestBestPriceIndex(TestCase):
+    def setUp(self):
+        self.index = BestPriceIndex()
+        self.index.update(
+            "2:30 Ascot", "Bet365", Market({"Frankel": Odds(2), "Shergar": Odds(4)})
+        )
+        self.index.update(
+            "2:30 Ascot", "Coral", Market({"Frankel": Odds(1.25), "Shergar": Odds(5)})
+        )
+
+    def test_best_price_index_keeps_best_price_and_bookmaker(self):
+        self.assertEqual(self.index.best_price("2:30 Ascot", "Frankel"), (2, "Bet365"))
+        self.assertEqual(self.index.best_price("2:30 Ascot", "Shergar"), (5, "Coral"))
+
+    def test_best_price_index_percentage(self):
+        self.assertEqual(self.index.percentage("2:30 Ascot"), 70)
+
+    def test_best_price_index_flags_arbitrage(self):
+        self.assertEqual(self.index.arbitrages, {"2:30 Ascot"})
+
+    def test_best_price_index_unflags_arbitrage_when_best_price_shortens(self):
+        self.index.set_price("2:30 Ascot", "Coral", "Shergar", Odds(2))
+        self.assertEqual(self.index.best_price("2:30 Ascot", "Shergar"), (4, "Bet365"))
+        self.assertEqual(self.index.percentage("2:30 Ascot"), 75)
+        self.index.set_price("2:30 Ascot", "Bet365", "Frankel", Odds(1.2))
+        self.assertEqual(
+            self.index.best_price("2:30 Ascot", "Frankel"), (1.25, "Coral")
+        )
+        self.assertEqual(self.index.arbitrages, set())
+
+    def test_best_price_index_ignores_changes_below_best(self):
+        self.index.set_price("2:30 Ascot", "Coral", "Frankel", Odds(1.2))
+        self.assertEqual(self.index.percentage("2:30 Ascot"), 70)
+
+    def test_best_price_index_withdraws_price(self):
+        self.index.set_price("2:30 Ascot", "Coral", "Shergar", None)
+        self.index.set_price("2:30 Ascot", "Bet365", "Shergar", None)
+        self.assertEqual(self.index.percentage("2:30 Ascot"), 50)
+        with self.assertRaises(ValueError):
+            self.index.best_price("2:30 Ascot", "Shergar")
+
+    def test_best_price_index_uses_places_for_fair_percentage(self):
+        market = Market(
+            {"Frankel": Odds(1.25), "Shergar": Odds(1.25), "Nijinsky": Odds(2)}
+        )
+        market.places = 2
+        self.index.update("3:05 Ascot", "Bet365", market)
+        self.assertNotIn("3:05 Ascot", self.index.arbitrages)
+        market.places = 3
+        self.index.update("3:40 Ascot", "Bet365", market)
+        self.assertIn("3:40 Ascot", self.index.arbitrages)
+        self.assertEqual(self.index.best_market("3:40 Ascot").places, 3)
+
+    def test_best_price_index_raises_value_error_if_places_differ(self):
+        market = Market({"Frankel": Odds(1.5), "Shergar": Odds(1.5)})
+        market.places = 2
+        with self.assertRaises(ValueError):
+            self.index.update("2:30 Ascot", "William Hill", market)
+        self.assertEqual(self.index.best_market("2:30 Ascot").places, 1)
+
+    def test_best_price_index_best_market(self):
+        market = self.index.best_market("2:30 Ascot")
+        self.assertEqual(market, {"Frankel": Odds(2), "Shergar": Odds(5)})
+        self.assertEqual(market.places, 1)
+
+    def test_best_price_index_remove(self):
+        self.assertEqual(len(self.index), 1)
+        self.index.remove("2:30 Ascot")
+        self.assertNotIn("2:30 Ascot", self.index)
+        self.assertEqual(self.index.arbitrages, set())
+        with self.assertRaises(ValueError):
+            self.index.remove("2:30 Ascot")
+
+    def test_best_price_index_raises_value_error_if_event_unknown(self):
+        with self.assertRaises(ValueError):
+            self.index.percentage("3:05 Ascot")
+        with self.assertRaises(ValueError):
+            self.index.best_market("3:05 Ascot")
+
+    def test_best_price_index_raises_value_error_if_odds_invalid(self):
+        with self.assertRaises(ValueError):
+            self.index.set_price("2:30 Ascot", "Coral", "Frankel", Decimal(3))
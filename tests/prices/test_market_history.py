@@ -0,0 +1,123 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.prices import MarketHistory
+
+
+class TestMarketHistory(TestCase):
+    def setUp(self):
+        self.history = MarketHistory()
+        self.history.record(0, Market({"Frankel": Odds(3), "Shergar": Odds(4)}))
+        self.history.record(60, Market({"Frankel": Odds(2.5), "Shergar": Odds(4)}))
+        self.history.record(120, Market({"Frankel": Odds(2.5), "Shergar": Odds(5)}))
+
+    def test_market_history_stores_only_changes(self):
+        self.assertEqual(len(self.history), 4)
+        self.assertEqual(self.history.runners, ["Frankel", "Shergar"])
+        self.assertIn("Frankel", self.history)
+
+    def test_market_history_as_of(self):
+        self.assertEqual(
+            self.history.as_of(90), {"Frankel": Odds(2.5), "Shergar": Odds(4)}
+        )
+        self.assertEqual(self.history.as_of(-1), {})
+
+    def test_market_history_as_of_keeps_places(self):
+        market = Market({"Frankel": Odds(2)})
+        market.places = 2
+        self.history.record(180, market)
+        self.assertEqual(self.history.as_of(180).places, 2)
+
+    def test_market_history_as_of_omits_withdrawn_runners(self):
+        self.history.record_price(150, "Shergar", None)
+        self.assertEqual(self.history.as_of(150), {"Frankel": Odds(2.5)})
+
+    def test_market_history_series(self):
+        self.assertEqual(
+            self.history.series("Frankel"), [(0, Odds(3)), (60, Odds(2.5))]
+        )
+        self.assertEqual(self.history.series("Shergar", 60, 120), [(120, Odds(5))])
+
+    def test_market_history_series_raises_value_error_if_runner_unknown(self):
+        with self.assertRaises(ValueError):
+            self.history.series("Nijinsky")
+
+    def test_market_history_moves(self):
+        self.assertEqual(
+            self.history.moves(120),
+            [("Frankel", Odds(3), Odds(2.5)), ("Shergar", Odds(4), Odds(5))],
+        )
+        self.assertEqual(self.history.moves(30), [("Shergar", Odds(4), Odds(5))])
+        self.assertEqual(self.history.moves(30, now=90), [])
+        self.assertEqual(len(self.history.moves(120, top=1)), 1)
+
+    def test_market_history_raises_value_error_if_time_goes_back(self):
+        with self.assertRaises(ValueError):
+            self.history.record_price(30, "Frankel", Odds(2))
+
+    def test_market_history_unchanged_price_advances_latest_time(self):
+        self.history.record_price(180, "Frankel", Odds(2.5))
+        self.assertEqual(self.history.latest, 180)
+        with self.assertRaises(ValueError):
+            self.history.record_price(150, "Shergar", Odds(6))
+
+    def test_market_history_raises_value_error_if_capacity_invalid(self):
+        with self.assertRaises(ValueError):
+            MarketHistory(capacity=1)
+
+
+class TestMarketHistorySpill(TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "ticks.bin")
+        self.history = MarketHistory(capacity=4, spill=self.path)
+        for time in range(10):
+            self.history.record_price(time, "Frankel", Odds(2 + time))
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_market_history_evicts_oldest_ticks(self):
+        self.assertEqual(len(self.history), 4)
+        self.assertEqual(self.history.series("Frankel")[0], (6, Odds(8)))
+
+    def test_market_history_as_of_uses_last_evicted_tick(self):
+        self.assertEqual(self.history.as_of(5.5), {"Frankel": Odds(7)})
+
+    def test_market_history_as_of_reads_spill_file(self):
+        self.history.record_price(10, "Shergar", Odds(4))
+        self.assertEqual(self.history.as_of(2.5), {"Frankel": Odds(4)})
+        self.assertEqual(self.history.as_of(4), {"Frankel": Odds(6)})
+        self.assertEqual(self.history.as_of(-1), {})
+        self.assertEqual(self.history.moves(7, now=9), [("Frankel", Odds(4), Odds(11))])
+
+    def test_market_history_as_of_raises_value_error_if_evicted_unspilled(self):
+        history = MarketHistory(capacity=2)
+        for time in range(3):
+            history.record_price(time, "Frankel", Odds(2 + time))
+        self.assertEqual(history.as_of(0.5), {"Frankel": Odds(2)})
+        history.record_price(3, "Frankel", Odds(5))
+        with self.assertRaises(ValueError):
+            history.as_of(0.5)
+
+    def test_market_history_spills_evicted_ticks(self):
+        spilled = list(self.history.spilled())
+        self.assertEqual([time for time, _, _ in spilled], [0, 1, 2, 3, 4, 5])
+        self.assertEqual(spilled[0], (0, "Frankel", Odds(2)))
+
+    def test_market_history_spilled_raises_value_error_without_spill_file(self):
+        with self.assertRaises(ValueError):
+            list(MarketHistory().spilled())
+
+    def test_market_history_empties_existing_spill_file(self):
+        history = MarketHistory(capacity=4, spill=self.path)
+        for time in range(50, 53):
+            history.record_price(time, "Shergar", Odds(4))
+        self.assertEqual(list(history.spilled()), [])
+        self.assertEqual(history.as_of(50), {"Shergar": Odds(4)})
+
+    def test_market_history_spilled_is_empty_before_eviction(self):
+        history = MarketHistory(spill=self.path + ".new")
+        self.assertEqual(list(history.spilled()), [])
@@ -0,0 +1,106 @@
+import threading
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.prices import MarketStore
+
+
+class TestMarketStore(TestCase):
+    def setUp(self):
+        self.store = MarketStore(
+            {"Ascot": Market({"Frankel": Odds(3), "Shergar": Odds(4)})}, stripes=4
+        )
+
+    def test_market_store_raises_value_error_if_no_stripes(self):
+        with self.assertRaises(ValueError):
+            MarketStore(stripes=0)
+
+    def test_market_store_get_returns_copy(self):
+        market = self.store["Ascot"]
+        market["Frankel"] = Odds(10)
+        self.assertEqual(self.store["Ascot"]["Frankel"], Odds(3))
+
+    def test_market_store_set_stores_copy_with_places(self):
+        market = Market({"Frankel": Odds(2), "Shergar": Odds(2)})
+        market.places = 2
+        self.store["York"] = market
+        market["Frankel"] = Odds(10)
+        self.assertEqual(self.store["York"]["Frankel"], Odds(2))
+        self.assertEqual(self.store["York"].places, 2)
+
+    def test_market_store_set_price_adds_event(self):
+        self.store.set_price("York", "Mill Reef", 2)
+        self.assertEqual(self.store["York"], {"Mill Reef": Odds(2)})
+        self.assertIsInstance(self.store["York"]["Mill Reef"], Odds)
+
+    def test_market_store_update(self):
+        self.store.update("Ascot", {"Frankel": Odds(2.5), "Nijinsky": None})
+        self.assertEqual(
+            self.store["Ascot"],
+            {"Frankel": Odds(2.5), "Shergar": Odds(4), "Nijinsky": None},
+        )
+
+    def test_market_store_batch(self):
+        self.store.batch(
+            [
+                ("Ascot", "Frankel", Odds(2)),
+                ("York", "Mill Reef", Odds(2)),
+                ("Ascot", "Shergar", Odds(2)),
+            ]
+        )
+        self.assertEqual(self.store.percentage("Ascot"), 100)
+        self.assertEqual(self.store.percentage("York"), 50)
+
+    def test_market_store_modify(self):
+        with self.store.modify("Ascot") as market:
+            market.apply_margin(Decimal(0))
+        self.assertAlmostEqual(self.store.percentage("Ascot"), 100)
+
+    def test_market_store_modify_raises_key_error_if_unknown(self):
+        with self.assertRaises(KeyError), self.store.modify("York"):
+            pass
+
+    def test_market_store_derive(self):
+        self.store.set_price("Ascot", "Nijinsky", Odds(3))
+        self.store.set_price("Ascot", "Shergar", Odds(3))
+        self.assertEqual(self.store.derive("Ascot", 2), self.store["Ascot"].derive(2))
+
+    def test_market_store_snapshot(self):
+        self.store.set_price("York", "Mill Reef", Odds(2))
+        snapshot = self.store.snapshot()
+        self.store.set_price("York", "Mill Reef", Odds(5))
+        self.assertEqual(set(snapshot), {"Ascot", "York"})
+        self.assertEqual(list(self.store), ["Ascot", "York"])
+        self.assertEqual(snapshot["York"]["Mill Reef"], Odds(2))
+
+    def test_market_store_delete(self):
+        del self.store["Ascot"]
+        self.assertNotIn("Ascot", self.store)
+        self.assertEqual(len(self.store), 0)
+
+    def test_market_store_readers_see_whole_updates(self):
+        runners = [f"runner {i}" for i in range(10)]
+        self.store["Epsom"] = Market(dict.fromkeys(runners, Odds(10)))
+        torn = []
+
+        def write():
+            for i in range(2000):
+                odds = Odds(5) if i % 2 else Odds(10)
+                self.store.update("Epsom", dict.fromkeys(runners, odds))
+
+        def read():
+            torn.extend(
+                [
+                    market
+                    for market in (self.store["Epsom"] for _ in range(2000))
+                    if len(set(market.values())) != 1
+                ]
+            )
+
+        threads = [threading.Thread(target=f) for f in (write, read, read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(torn, [])
@@ -0,0 +1,105 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from math import isnan
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.prices import SharedMarketBook
+
+_book = None
+
+
+def _initialise(book):
+    global _book
+    _book = book
+
+
+def _read(event):
+    return dict(_book[event]), _book[event].places
+
+
+class TestSharedMarketBook(TestCase):
+    def setUp(self):
+        place_market = Market(
+            {"Frankel": Odds(1.5), "Shergar": Odds(2), "Nijinsky": None}
+        )
+        place_market.places = 2
+        self.book = SharedMarketBook(
+            {
+                "2:30 Ascot": Market({"Frankel": Odds(3), "Shergar": Odds(4)}),
+                "3:05 Ascot": place_market,
+            }
+        )
+
+    def tearDown(self):
+        self.book.close()
+        self.book.unlink()
+
+    def test_shared_market_book_reads_markets(self):
+        self.assertEqual(len(self.book), 2)
+        self.assertEqual(
+            self.book["2:30 Ascot"], {"Frankel": Odds(3), "Shergar": Odds(4)}
+        )
+        self.assertEqual(self.book["3:05 Ascot"].places, 2)
+        self.assertIsNone(self.book["3:05 Ascot"]["Nijinsky"])
+
+    def test_shared_market_book_set_price(self):
+        self.book.set_price("2:30 Ascot", "Frankel", Odds(2.5))
+        self.assertEqual(self.book["2:30 Ascot"]["Frankel"], Odds(2.5))
+
+    def test_shared_market_book_set_market(self):
+        self.book["2:30 Ascot"] = Market({"Frankel": Odds(5)})
+        self.assertEqual(self.book["2:30 Ascot"], {"Frankel": Odds(5), "Shergar": None})
+
+    def test_shared_market_book_prices_view(self):
+        prices = self.book.prices("3:05 Ascot")
+        self.assertEqual(
+            self.book.runners("3:05 Ascot"), ["Frankel", "Shergar", "Nijinsky"]
+        )
+        self.assertEqual(list(prices[:2]), [1.5, 2])
+        self.assertTrue(isnan(prices[2]))
+        prices.release()
+
+    def test_shared_market_book_pickle_attaches_to_same_memory(self):
+        with pickle.loads(pickle.dumps(self.book)) as attached:
+            self.book.set_price("2:30 Ascot", "Shergar", Odds(6))
+            self.assertEqual(attached.name, self.book.name)
+            self.assertIn("2:30 Ascot", attached)
+            self.assertEqual(attached["2:30 Ascot"]["Shergar"], Odds(6))
+
+    def test_shared_market_book_attached_copy_is_read_only(self):
+        with pickle.loads(pickle.dumps(self.book)) as attached:
+            with self.assertRaises(ValueError):
+                attached.set_price("2:30 Ascot", "Shergar", Odds(6))
+            with self.assertRaises(ValueError):
+                attached["2:30 Ascot"] = Market({"Frankel": Odds(5)})
+        self.assertEqual(self.book["2:30 Ascot"]["Shergar"], Odds(4))
+
+    def test_shared_market_book_raises_runtime_error_if_always_being_written(self):
+        self.book._versions[0] += 1
+        with self.assertRaises(RuntimeError):
+            self.book["2:30 Ascot"]
+        self.book._versions[0] += 1
+
+    def test_shared_market_book_is_read_by_worker_processes(self):
+        with ProcessPoolExecutor(
+            2, initializer=_initialise, initargs=(self.book,)
+        ) as pool:
+            self.book.set_price("2:30 Ascot", "Frankel", Odds(2))
+            results = list(pool.map(_read, ["2:30 Ascot", "3:05 Ascot"]))
+        self.assertEqual(results[0], ({"Frankel": Odds(2), "Shergar": Odds(4)}, 1))
+        self.assertEqual(results[1][1], 2)
+
+    def test_shared_market_book_raises_value_error_if_event_unknown(self):
+        with self.assertRaises(ValueError):
+            self.book["4:15 Ascot"]
+
+    def test_shared_market_book_raises_value_error_if_runner_unknown(self):
+        with self.assertRaises(ValueError):
+            self.book.set_price("2:30 Ascot", "Nijinsky", Odds(3))
+        with self.assertRaises(ValueError):
+            self.book["2:30 Ascot"] = Market({"Nijinsky": Odds(3)})
+
+    def test_shared_market_book_raises_value_error_if_empty(self):
+        with self.assertRaises(ValueError):
+            SharedMarketBook({})
@@ -0,0 +1,102 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.bets import Bet, EachWay, PlaceTerms, Treble
+from pybet.risk import CashOutBook
+
+
+class TestCashOutBook(TestCase):
+    def setUp(self):
+        self.book = CashOutBook()
+        self.book.update("Ascot", Market({"Frankel": Odds(2), "Nijinsky": Odds(2)}))
+        self.book.update(
+            "York", Market({"Shergar": Odds(4), "Mill Reef": Odds(4), "Brigadier": 2})
+        )
+        self.single = Bet(10, Odds(3), lambda: True)
+        self.treble = Treble(
+            1,
+            [(Odds(2), lambda: True), (Odds(3), lambda: True), (Odds(4), lambda: True)],
+        )
+        self.book.add(self.single, ("Ascot", "Frankel"))
+        # First leg already won, so only two legs remain unresolved
+        self.book.add(self.treble, ("Ascot", "Nijinsky"), ("York", "Shergar"))
+
+    def test_cash_out_book_values_single_at_fair_probability(self):
+        self.assertEqual(self.book.value(self.single), 15)
+
+    def test_cash_out_book_values_accumulator_across_unresolved_legs(self):
+        self.assertEqual(self.book.value(self.treble), 3)
+
+    def test_cash_out_book_total(self):
+        self.assertEqual(self.book.total, 18)
+
+    def test_cash_out_book_applies_margin(self):
+        book = CashOutBook(margin=5)
+        book.update("Ascot", Market({"Frankel": Odds(2), "Nijinsky": Odds(2)}))
+        book.add(self.single, ("Ascot", "Frankel"))
+        self.assertEqual(book.value(self.single), Decimal("14.25"))
+
+    def test_cash_out_book_update_revalues_affected_bets(self):
+        self.book.update("Ascot", Market({"Frankel": Odds(1.25), "Nijinsky": Odds(5)}))
+        self.assertEqual(
+            self.book.values(), {self.single: 24, self.treble: Decimal("1.2")}
+        )
+        self.assertEqual(self.book.total, Decimal("25.2"))
+
+    def test_cash_out_book_update_uses_places_for_place_markets(self):
+        market = Market({"Frankel": Odds(2), "Nijinsky": Odds(2), "Shergar": Odds(2)})
+        market.places = 2
+        self.book.update("Ascot", market)
+        self.assertEqual(self.book.value(self.single), 20)
+
+    def test_cash_out_book_update_values_missing_runner_at_zero(self):
+        self.book.update("Ascot", Market({"Nijinsky": Odds(2)}))
+        self.assertEqual(self.book.value(self.single), 0)
+
+    def test_cash_out_book_update_raises_value_error_if_market_unpriced(self):
+        with self.assertRaises(ValueError):
+            self.book.update("Ascot", Market.fromkeys(["Frankel"]))
+
+    def test_cash_out_book_remove(self):
+        self.book.remove(self.single)
+        self.assertNotIn(self.single, self.book)
+        self.assertEqual(len(self.book), 1)
+        self.assertEqual(self.book.total, 3)
+        self.book.update("Ascot", Market({"Frankel": Odds(4), "Nijinsky": Odds(4 / 3)}))
+        self.assertEqual(self.book.value(self.treble), Decimal("4.5"))
+
+    def test_cash_out_book_remove_raises_value_error_if_not_in_book(self):
+        with self.assertRaises(ValueError):
+            self.book.remove(Bet(10, Odds(3), lambda: True))
+
+    def test_cash_out_book_value_raises_value_error_if_not_in_book(self):
+        with self.assertRaises(ValueError):
+            self.book.value(Bet(10, Odds(3), lambda: True))
+
+    def test_cash_out_book_raises_value_error_if_margin_invalid(self):
+        with self.assertRaises(ValueError):
+            CashOutBook(margin=101)
+
+    def test_cash_out_book_add_raises_value_error_if_already_in_book(self):
+        with self.assertRaises(ValueError):
+            self.book.add(self.single, ("Ascot", "Frankel"))
+
+    def test_cash_out_book_add_raises_value_error_if_each_way(self):
+        bet = EachWay(
+            5, Odds(9), lambda: True, lambda: True, terms=PlaceTerms("1/4", 3)
+        )
+        with self.assertRaises(ValueError):
+            self.book.add(bet, ("Ascot", "Frankel"))
+
+    def test_cash_out_book_add_raises_value_error_if_no_legs(self):
+        with self.assertRaises(ValueError):
+            self.book.add(Bet(10, Odds(3), lambda: True))
+
+    def test_cash_out_book_add_raises_value_error_if_sp_without_odds(self):
+        with self.assertRaises(ValueError):
+            self.book.add(Bet(10, "SP", lambda: True), ("Ascot", "Frankel"))
+
+    def test_cash_out_book_add_raises_value_error_if_no_market(self):
+        with self.assertRaises(ValueError):
+            self.book.add(Bet(10, Odds(3), lambda: True), ("Epsom", "Shergar"))
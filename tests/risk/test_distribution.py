@@ -0,0 +1,140 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.bets import Bet, Double, EachWay, PlaceTerms
+from pybet.risk import ReturnDistribution, return_distribution
+from pybet.risk.distribution import _convolve
+
+
+class TestReturnDistribution(TestCase):
+    def setUp(self):
+        self.dist = ReturnDistribution({-10: 0.5, 0: 0.25, 20: 0.25})
+
+    def test_return_distribution_mean(self):
+        self.assertEqual(self.dist.mean, Decimal(0))
+
+    def test_return_distribution_probability_of_loss(self):
+        self.assertEqual(self.dist.probability_of_loss, 0.5)
+
+    def test_return_distribution_quantile(self):
+        self.assertEqual(self.dist.quantile(0.5), -10)
+        self.assertEqual(self.dist.quantile(0.6), 0)
+        self.assertEqual(self.dist.quantile(1), 20)
+
+    def test_return_distribution_quantile_raises_value_error_if_invalid(self):
+        with self.assertRaises(ValueError):
+            self.dist.quantile(1.5)
+
+    def test_return_distribution_value_at_risk(self):
+        self.assertEqual(self.dist.value_at_risk(0.95), 10)
+
+    def test_return_distribution_value_at_risk_is_zero_if_no_loss(self):
+        self.assertEqual(ReturnDistribution({5: 1}).value_at_risk(), 0)
+
+    def test_return_distribution_raises_value_error_if_empty(self):
+        with self.assertRaises(ValueError):
+            ReturnDistribution({})
+
+    def test_return_distribution_iterates_sorted_outcomes(self):
+        self.assertEqual(len(self.dist), 3)
+        self.assertEqual(list(self.dist), [(-10, 0.5), (0, 0.25), (20, 0.25)])
+
+
+class TestReturnDistributionFunction(TestCase):
+    def setUp(self):
+        self.markets = {
+            "Ascot": Market(
+                {"Frankel": Odds(2), "Nijinsky": Odds(4), "Shergar": Odds(4)}
+            ),
+            "York": Market({"Mill Reef": Odds(2), "Brigadier": Odds(2)}),
+        }
+        self.positions = [
+            (Bet(10, Odds(2), lambda: True), [("Ascot", "Frankel")]),
+            (Bet(10, Odds(4), lambda: True), [("Ascot", "Nijinsky")]),
+            (Bet(10, Odds(2), lambda: True), [("York", "Mill Reef")]),
+            (
+                Double(5, [(Odds(2), lambda: True), (Odds(2), lambda: True)]),
+                [("Ascot", "Frankel"), ("York", "Mill Reef")],
+            ),
+        ]
+
+    def test_return_distribution_exact_for_singles_and_accumulators(self):
+        dist = return_distribution(self.positions, self.markets)
+        # Stakes 35; Frankel & Mill Reef pays 20 + 20 + 20, Frankel only 20,
+        # Nijinsky & Mill Reef 40 + 20, Nijinsky only 40, Shergar & Mill Reef 20
+        self.assertEqual(
+            dict(dist),
+            {-35: 0.125, -15: 0.375, 5: 0.125, 25: 0.375},
+        )
+        self.assertEqual(dist.probability_of_loss, 0.5)
+
+    def test_return_distribution_mean_matches_expected_value(self):
+        dist = return_distribution(self.positions, self.markets)
+        self.assertEqual(dist.mean, 0)
+
+    def test_return_distribution_monte_carlo_approximates_exact(self):
+        dist = return_distribution(
+            self.positions, self.markets, method="monte_carlo", samples=20_000, seed=1
+        )
+        self.assertAlmostEqual(dist.probability_of_loss, 0.5, places=1)
+
+    def test_return_distribution_auto_falls_back_to_monte_carlo(self):
+        dist = return_distribution(self.positions, self.markets, max_outcomes=1, seed=1)
+        self.assertEqual(set(dict(dist)), {-35, -15, 5, 25})
+
+    def test_return_distribution_with_no_bets(self):
+        self.assertEqual(dict(return_distribution([], self.markets)), {0: 1})
+
+    def test_return_distribution_raises_value_error_if_step_invalid(self):
+        with self.assertRaises(ValueError):
+            return_distribution(self.positions, self.markets, step=0)
+
+    def test_return_distribution_raises_value_error_if_each_way(self):
+        bet = EachWay(
+            5, Odds(9), lambda: True, lambda: True, terms=PlaceTerms("1/4", 3)
+        )
+        with self.assertRaises(ValueError):
+            return_distribution([(bet, [("Ascot", "Frankel")])], self.markets)
+
+    def test_return_distribution_raises_value_error_if_sp(self):
+        with self.assertRaises(ValueError):
+            return_distribution(
+                [(Bet(5, "SP", lambda: True), [("Ascot", "Frankel")])], self.markets
+            )
+
+    def test_return_distribution_raises_value_error_if_no_legs(self):
+        with self.assertRaises(ValueError):
+            return_distribution([(Bet(5, Odds(2), lambda: True), [])], self.markets)
+
+    def test_return_distribution_raises_value_error_if_no_market(self):
+        with self.assertRaises(ValueError):
+            return_distribution(
+                [(Bet(5, Odds(2), lambda: True), [("Epsom", "Shergar")])], self.markets
+            )
+
+    def test_return_distribution_raises_value_error_if_place_market(self):
+        self.markets["Ascot"] = self.markets["Ascot"].derive(2)
+        with self.assertRaises(ValueError):
+            return_distribution(self.positions, self.markets)
+
+    def test_return_distribution_uses_fair_probabilities_of_priced_runners(self):
+        market = {"Frankel": 2, "Nijinsky": Odds(3), "Shergar": Odds(6), "Dobbin": None}
+        markets = {"Ascot": Market(market)}  # type: ignore[arg-type]
+        dist = return_distribution(
+            [(Bet(12, Odds(3), lambda: True), [("Ascot", "Nijinsky")])], markets
+        )
+        self.assertEqual(dist.mean, 0)
+        self.assertAlmostEqual(dist.probability_of_loss, 2 / 3)
+
+    def test_convolve_with_fft_matches_direct_convolution(self):
+        a = {i: 1 / 300 for i in range(300)}
+        b = {i * 2: 1 / 300 for i in range(300)}
+        fft = _convolve(a, b)
+        direct: dict[int, float] = {}
+        for x, p in a.items():
+            for y, q in b.items():
+                direct[x + y] = direct.get(x + y, 0.0) + p * q
+        self.assertEqual(set(fft), set(direct))
+        for value, probability in direct.items():
+            self.assertAlmostEqual(fft[value], probability)
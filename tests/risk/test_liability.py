@@ -0,0 +1,116 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.bets import Bet, Double, EachWay, PlaceTerms
+from pybet.risk import LiabilityBook
+
+
+class TestLiabilityBook(TestCase):
+    def setUp(self):
+        self.book = LiabilityBook()
+        self.frankel = Bet(10, Odds(3), lambda: True)
+        self.nijinsky = Bet(10, Odds(5), lambda: True)
+        self.double = Double(5, [(Odds(3), lambda: True), (Odds(2), lambda: True)])
+        self.book.add(self.frankel, "Frankel")
+        self.book.add(self.nijinsky, "Nijinsky")
+        self.book.add(self.double, "Frankel", "Dancing Brave")
+
+    def test_liability_book_tracks_total_stakes(self):
+        self.assertEqual(self.book.stakes, 25)
+        self.assertEqual(len(self.book), 3)
+
+    def test_liability_book_tracks_liability_per_runner(self):
+        self.assertEqual(self.book.liability("Nijinsky"), 50)
+
+    def test_liability_book_tracks_liability_per_combination(self):
+        self.assertEqual(self.book.liability("Dancing Brave", "Frankel"), 30)
+
+    def test_liability_book_pnl_for_single_winner(self):
+        self.assertEqual(self.book.pnl("Frankel"), -5)
+
+    def test_liability_book_pnl_includes_multiples_with_all_legs_winning(self):
+        self.assertEqual(self.book.pnl("Frankel", "Dancing Brave"), -35)
+
+    def test_liability_book_pnl_for_unbacked_runner(self):
+        self.assertEqual(self.book.pnl("Mill Reef"), 25)
+
+    def test_liability_book_worst_case(self):
+        self.assertEqual(
+            self.book.worst_case, (frozenset(["Frankel", "Dancing Brave"]), -35)
+        )
+
+    def test_liability_book_worst_case_of_singles(self):
+        self.book.remove(self.double)
+        self.assertEqual(self.book.worst_case, (frozenset(["Nijinsky"]), -30))
+
+    def test_liability_book_worst_case_raises_value_error_if_empty(self):
+        with self.assertRaises(ValueError):
+            _ = LiabilityBook().worst_case
+
+    def test_liability_book_top_exposures(self):
+        self.assertEqual(
+            self.book.top_exposures(2),
+            [
+                (frozenset(["Nijinsky"]), 50),
+                (frozenset(["Frankel"]), 30),
+            ],
+        )
+
+    def test_liability_book_remove_cancels_liability(self):
+        self.book.remove(self.nijinsky)
+        self.assertEqual(self.book.liability("Nijinsky"), 0)
+        self.assertNotIn("Nijinsky", self.book.runners)
+        self.assertNotIn(self.nijinsky, self.book)
+
+    def test_liability_book_remove_raises_value_error_if_bet_not_in_book(self):
+        with self.assertRaises(ValueError):
+            self.book.remove(Bet(10, Odds(3), lambda: True))
+
+    def test_liability_book_add_raises_value_error_if_bet_already_in_book(self):
+        with self.assertRaises(ValueError):
+            self.book.add(self.frankel, "Frankel")
+
+    def test_liability_book_add_raises_value_error_if_no_selections(self):
+        with self.assertRaises(ValueError):
+            self.book.add(Bet(10, Odds(3), lambda: True))
+
+    def test_liability_book_add_raises_value_error_if_voided(self):
+        bet = Bet(10, Odds(3), lambda: True)
+        bet.void()
+        with self.assertRaises(ValueError):
+            self.book.add(bet, "Frankel")
+
+    def test_liability_book_add_raises_value_error_if_each_way(self):
+        bet = EachWay(
+            5, Odds(9), lambda: True, lambda: True, terms=PlaceTerms("1/4", 3)
+        )
+        with self.assertRaises(ValueError):
+            self.book.add(bet, "Frankel")
+
+    def test_liability_book_add_raises_value_error_if_sp_without_odds(self):
+        with self.assertRaises(ValueError):
+            self.book.add(Bet(10, "SP", lambda: True), "Frankel")
+
+    def test_liability_book_add_accepts_sp_with_odds(self):
+        self.book.add(Bet(10, "SP", lambda: True), "Mill Reef", odds=Odds(4))
+        self.assertEqual(self.book.liability("Mill Reef"), 40)
+
+    def test_liability_book_expected_value(self):
+        race_1 = Market({"Frankel": Odds(2), "Nijinsky": Odds(4), "Mill Reef": Odds(4)})
+        race_2 = Market({"Dancing Brave": Odds(2), "Shergar": Odds(2)})
+        # 25 - (30 * 0.5 + 50 * 0.25 + 30 * 0.5 * 0.5)
+        self.assertEqual(self.book.expected_value(race_1, race_2), Decimal("-10"))
+
+    def test_liability_book_expected_value_in_place_market(self):
+        book = LiabilityBook()
+        book.add(Bet(10, Odds(3), lambda: True), "Frankel")
+        place = Market({"Frankel": Odds(2), "Nijinsky": Odds(2), "Mill Reef": Odds(2)})
+        place.places = 2
+        # 10 - 30 * 2 / 3
+        self.assertEqual(book.expected_value(place), Decimal("-10"))
+
+    def test_liability_book_expected_value_raises_value_error_if_runner_missing(self):
+        race_1 = Market({"Frankel": Odds(2), "Nijinsky": Odds(2)})
+        with self.assertRaises(ValueError):
+            self.book.expected_value(race_1)
@@ -0,0 +1,115 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.bets import Bet
+from pybet.exchange import TICKS, ticks_between
+from pybet.risk import LiabilityBook, Repricer, reprice
+
+
+class TestRepricer(TestCase):
+    def setUp(self):
+        self.market = Market(
+            {"Frankel": Odds(2), "Shergar": Odds(4), "Nijinsky": Odds(4)}
+        )
+        self.liabilities = {"Frankel": 500, "Shergar": 50, "Nijinsky": 50}
+
+    def test_repricer_shortens_runners_with_excess_liability(self):
+        repriced = Repricer(margin=Decimal(0)).reprice(self.market, self.liabilities)
+
+        self.assertLess(repriced["Frankel"], self.market["Frankel"])
+        self.assertGreater(repriced["Shergar"], self.market["Shergar"])
+
+    def test_repricer_reaches_target_margin(self):
+        repriced = Repricer(margin=Decimal(10)).reprice(self.market, self.liabilities)
+
+        self.assertGreaterEqual(repriced.percentage, 110)
+        self.assertLess(repriced.percentage, 111)
+
+    def test_repricer_keeps_market_margin_by_default(self):
+        market = Market(self.market).apply_margin(Decimal(20))
+
+        repriced = Repricer().reprice(market, {})
+
+        self.assertGreaterEqual(repriced.percentage, 120)
+        self.assertLess(repriced.percentage, 122)
+
+    def test_repricer_prices_are_on_the_ladder(self):
+        repriced = Repricer(margin=Decimal(10)).reprice(self.market, self.liabilities)
+
+        self.assertTrue(all(odds in TICKS for odds in repriced.values()))
+
+    def test_repricer_uses_given_ladder(self):
+        ladder = [Odds(x) for x in ("1.5", "2", "3", "4", "5", "6")]
+
+        repriced = Repricer(margin=Decimal(10), ladder=ladder).reprice(
+            self.market, self.liabilities
+        )
+
+        self.assertTrue(all(odds in ladder for odds in repriced.values()))
+
+    def test_repricer_limits_move_per_call(self):
+        repriced = Repricer(margin=Decimal(10), max_ticks=3).reprice(
+            self.market, self.liabilities
+        )
+
+        for runner, odds in repriced.items():
+            self.assertLessEqual(abs(ticks_between(self.market[runner], odds)), 3)
+
+    def test_repricer_with_zero_max_ticks_leaves_prices_unchanged(self):
+        repriced = Repricer(margin=Decimal(10), max_ticks=0).reprice(
+            self.market, self.liabilities
+        )
+
+        self.assertEqual(repriced, self.market)
+
+    def test_repricer_warm_starts_from_previous_solution(self):
+        repricer = Repricer(margin=Decimal(10))
+        repricer.reprice(self.market, self.liabilities)
+        cold = repricer.iterations
+
+        repriced = repricer.reprice(self.market, {**self.liabilities, "Frankel": 520})
+
+        self.assertLess(repricer.iterations, cold)
+        self.assertEqual(
+            repriced,
+            Repricer(margin=Decimal(10)).reprice(
+                self.market, {**self.liabilities, "Frankel": 520}
+            ),
+        )
+
+    def test_repricer_accepts_liabilities_from_liability_book(self):
+        book = LiabilityBook()
+        book.add(Bet(100, Odds(2), lambda: True), "Frankel")
+        book.add(Bet(10, Odds(4), lambda: True), "Shergar")
+        liabilities = {runner: book.liability(runner) for runner in self.market}
+
+        repriced = Repricer(margin=Decimal(0)).reprice(self.market, liabilities)
+
+        self.assertLess(repriced["Frankel"], self.market["Frankel"])
+
+    def test_repricer_keeps_places(self):
+        market = Market(self.market)
+        market.places = 2
+
+        self.assertEqual(Repricer().reprice(market, {}).places, 2)
+
+    def test_repricer_raises_value_error_for_unpriced_runner(self):
+        with self.assertRaises(ValueError):
+            Repricer().reprice(Market({"Frankel": Odds(2), "Shergar": None}), {})
+
+    def test_repricer_raises_value_error_for_empty_ladder(self):
+        with self.assertRaises(ValueError):
+            Repricer(ladder=[])
+
+    def test_repricer_raises_value_error_for_negative_max_ticks(self):
+        with self.assertRaises(ValueError):
+            Repricer(max_ticks=-1)
+
+    def test_reprice_matches_repricer(self):
+        self.assertEqual(
+            reprice(self.market, self.liabilities, margin=Decimal(10), max_ticks=5),
+            Repricer(margin=Decimal(10), max_ticks=5).reprice(
+                self.market, self.liabilities
+            ),
+        )
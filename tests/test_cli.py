@@ -0,0 +1,162 @@
+import io
+import json
+import os
+import runpy
+import sys
+import tempfile
+import warnings
+from contextlib import redirect_stderr
+from unittest import TestCase
+from unittest.mock import patch
+
+from pybet.cli import main
+
+CSV = "race,runner,odds\nA,Frankel,3.0\nA,Nijinsky,2.0\nA,Shergar,6.0\nB,Mill Reef,1.5\nB,Brigadier,2.5\nB,Sea Bird,10\n"
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.input = os.path.join(self.directory.name, "prices.csv")
+        self.output = os.path.join(self.directory.name, "output.csv")
+        with open(self.input, "w") as file:
+            file.write(CSV)
+
+    def run_cli(self, *args, path=None):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            status = main([*args, path or self.input, "-o", self.output])
+        with open(self.output) as file:
+            return status, file.read().splitlines(), stderr.getvalue()
+
+    def test_convert_to_fractional(self):
+        _, lines, _ = self.run_cli("convert", "--to", "fractional")
+        self.assertEqual(lines[1:3], ["A,Frankel,2/1", "A,Nijinsky,1/1"])
+
+    def test_convert_into_new_column(self):
+        _, lines, _ = self.run_cli("convert", "--to", "moneyline", "--into", "us")
+        self.assertEqual(lines[0], "race,runner,odds,us")
+        self.assertEqual(lines[1], "A,Frankel,3.0,+200")
+
+    def test_convert_from_fractional(self):
+        with open(self.input, "w") as file:
+            file.write("runner,odds\nFrankel,9/4\nNijinsky,\n")
+        _, lines, _ = self.run_cli("convert", "--from", "fractional")
+        self.assertEqual(lines[1:], ["Frankel,3.25", "Nijinsky,"])
+
+    def test_convert_into_new_column_when_first_row_blank(self):
+        with open(self.input, "w") as file:
+            file.write("runner,odds\nFrankel,\nNijinsky,9/4\n")
+        status, lines, _ = self.run_cli(
+            "convert", "--from", "fractional", "--into", "decimal"
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            lines, ["runner,odds,decimal", "Frankel,,", "Nijinsky,9/4,3.25"]
+        )
+
+    def test_convert_empty_input(self):
+        with open(self.input, "w"):
+            pass
+        status, lines, _ = self.run_cli("convert")
+        self.assertEqual((status, lines), (0, []))
+
+    def test_convert_between_other_formats(self):
+        with open(self.input, "w") as file:
+            file.write("runner,us,chance,share\nFrankel,+200,0.25,50\n")
+        _, lines, _ = self.run_cli("convert", "--column", "us", "--from", "moneyline")
+        self.assertEqual(lines[1], "Frankel,3.00,0.25,50")
+        _, lines, _ = self.run_cli(
+            "convert",
+            "--column",
+            "chance",
+            "--from",
+            "probability",
+            "--to",
+            "percentage",
+        )
+        self.assertEqual(lines[1], "Frankel,+200,25.0000,50")
+        _, lines, _ = self.run_cli(
+            "convert", "--column", "share", "--from", "percentage"
+        )
+        self.assertEqual(lines[1], "Frankel,+200,0.25,2.00")
+
+    def test_convert_in_parallel_keeps_order(self):
+        _, serial, _ = self.run_cli("convert", "--to", "probability")
+        _, parallel, _ = self.run_cli(
+            "convert", "--to", "probability", "--jobs", "2", "--chunk-size", "1"
+        )
+        self.assertEqual(serial, parallel)
+
+    def test_market_percentage_per_race(self):
+        _, lines, _ = self.run_cli("market")
+        self.assertEqual(lines, ["race,percentage", "A,100.0000", "B,116.6667"])
+
+    def test_market_with_margin(self):
+        _, lines, _ = self.run_cli("market", "--margin", "0")
+        self.assertEqual(lines[0], "race,runner,odds,price")
+        self.assertEqual(lines[4], "B,Mill Reef,1.5,1.75")
+
+    def test_market_derived_for_places(self):
+        _, lines, _ = self.run_cli("market", "--places", "2", "--into", "place")
+        self.assertEqual(lines[1], "A,Frankel,3.0,1.36")
+
+    def test_market_jsonl(self):
+        path = os.path.join(self.directory.name, "prices.jsonl")
+        with open(path, "w") as file:
+            file.writelines(
+                json.dumps({"race": race, "runner": runner, "odds": odds}) + "\n"
+                for race, runner, odds in [("A", "Frankel", 2), ("A", "Shergar", 2)]
+            )
+        _, lines, _ = self.run_cli("market", path=path)
+        self.assertEqual(json.loads(lines[0]), {"race": "A", "percentage": "100.0000"})
+
+    def test_reports_throughput(self):
+        _, _, stderr = self.run_cli("convert")
+        self.assertRegex(stderr, r"pybet: 6 rows in [\d.]+s \([\d,]+ rows/s\)")
+
+    def test_reports_invalid_market(self):
+        status, _, stderr = self.run_cli("market", "--places", "3")
+        self.assertEqual(status, 1)
+        self.assertIn("race A", stderr)
+
+    def test_reports_invalid_odds(self):
+        with open(self.input, "w") as file:
+            file.write("runner,odds\nFrankel,evens\n")
+        status, _, stderr = self.run_cli("convert")
+        self.assertEqual(status, 1)
+        self.assertIn("pybet: error: invalid decimal odds 'evens'", stderr)
+
+    def test_reports_blank_odds_in_market(self):
+        with open(self.input, "w") as file:
+            file.write("race,runner,odds\nA,Frankel,3.0\nA,Nijinsky,\n")
+        status, _, stderr = self.run_cli("market")
+        self.assertEqual(status, 1)
+        self.assertIn("pybet: error: race A: invalid decimal odds ''", stderr)
+
+    def test_reports_missing_columns_from_header(self):
+        status, _, stderr = self.run_cli("market", "--race", "meeting")
+        self.assertEqual(status, 1)
+        self.assertIn("pybet: error: missing column 'meeting'", stderr)
+
+    def test_reports_missing_column_in_later_row(self):
+        path = os.path.join(self.directory.name, "prices.jsonl")
+        with open(path, "w") as file:
+            file.write('{"race": "A", "runner": "Frankel", "odds": 2}\n')
+            file.write('{"runner": "Shergar", "odds": 2}\n')
+        status, _, stderr = self.run_cli("market", path=path)
+        self.assertEqual(status, 1)
+        self.assertIn("pybet: error: missing column 'race'", stderr)
+
+    def test_runs_as_module(self):
+        argv = ["pybet", "convert", self.input, "-o", self.output]
+        with (
+            patch.object(sys, "argv", argv),
+            redirect_stderr(io.StringIO()),
+            warnings.catch_warnings(),
+            self.assertRaises(SystemExit) as exit,
+        ):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            runpy.run_module("pybet.cli", run_name="__main__")
+        self.assertEqual(exit.exception.code, 0)
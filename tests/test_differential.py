@@ -0,0 +1,166 @@
+import io
+import runpy
+import sys
+import warnings
+from contextlib import redirect_stdout
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from pybet import Market, Odds
+from pybet.differential import (
+    VariantReport,
+    _difference,
+    _operations,
+    _settle,
+    _shrink_bet,
+    _shrink_market,
+    check,
+    define,
+    main,
+    register,
+    unregister,
+)
+
+
+class TestDifferential(TestCase):
+    def test_registered_variants_agree_with_references(self):
+        reports = check(cases=300, seed=1)
+        self.assertEqual(
+            {(r.operation, r.variant) for r in reports},
+            {
+                ("Bet.settle", "BetStore"),
+                ("Odds.to_fractional", "compiled fractional set"),
+                ("kelly", "kelly_array"),
+            },
+        )
+        for report in reports:
+            self.assertEqual(report.failures, 0, report)
+            self.assertIsNone(report.counterexample)
+            self.assertGreater(report.speedup, 0)
+
+    def test_check_raises_value_error_if_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            check(["Market.shuffle"])
+
+    def test_register_raises_value_error_if_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            register("Market.shuffle", "fast", lambda: None)
+
+    def test_variant_within_tolerance_passes(self):
+        def rounded(market, places):
+            derived = market.derive(places)
+            return {r: round(float(o), 12) for r, o in derived.items()}
+
+        register("Market.derive", "rounded", rounded, tolerance=1e-9)
+        self.addCleanup(unregister, "Market.derive", "rounded")
+        [report] = check(["Market.derive"], cases=20, seed=1)
+        self.assertEqual(report.failures, 0)
+        self.assertGreater(report.max_error, 0)
+
+    def test_failing_variant_is_shrunk_to_minimal_counterexample(self):
+        def broken(market, places):
+            derived = market.derive(places)
+            if len(market) > 4:
+                derived[next(iter(derived))] = Odds(100)
+            return derived
+
+        register("Market.derive", "broken", broken)
+        self.addCleanup(unregister, "Market.derive", "broken")
+        [report] = check(["Market.derive"], cases=50, seed=1)
+        self.assertGreater(report.failures, 0)
+        market, places = report.counterexample
+        self.assertEqual((len(market), places), (5, 2))
+        self.assertTrue(all(odds == round(odds) for odds in market.values()))
+
+    def test_variant_must_raise_same_exception(self):
+        register("kelly", "raising", lambda *args: 1 / 0)
+        self.addCleanup(unregister, "kelly", "raising")
+        reports = check(["kelly"], cases=5, seed=1)
+        report = next(r for r in reports if r.variant == "raising")
+        self.assertEqual(report.failures, 5)
+
+    def test_failing_bet_variant_is_shrunk(self):
+        def ignores_deductions(stake, odds, won, sp, rf, bog):
+            return _settle(stake, odds, won, sp, 0, bog)
+
+        register("Bet.settle", "ignores deductions", ignores_deductions)
+        self.addCleanup(unregister, "Bet.settle", "ignores deductions")
+        reports = check(["Bet.settle"], cases=100, seed=1)
+        report = next(r for r in reports if r.variant == "ignores deductions")
+        stake, odds, won, _, rf, bog = report.counterexample
+        self.assertEqual((stake, won, bog), (1, True, False))
+        self.assertTrue(odds == "SP" or odds == round(odds))
+        self.assertNotEqual(rf, 0)
+
+    def test_failing_fractional_variant_is_shrunk(self):
+        register("Odds.to_fractional", "first", lambda odds, fractions, _: fractions[0])
+        self.addCleanup(unregister, "Odds.to_fractional", "first")
+        reports = check(["Odds.to_fractional"], cases=20, seed=1)
+        report = next(r for r in reports if r.variant == "first")
+        odds, fractions, compiled = report.counterexample
+        self.assertEqual(len(fractions), 2)
+        self.assertEqual(odds, round(odds, 1))
+        self.assertEqual(compiled.nearest(odds), odds.to_fractional(list(fractions)))
+
+    def test_shrinks_places_of_market(self):
+        market = Market({f"runner {i}": Odds(5) for i in range(5)})
+        self.assertEqual(next(_shrink_market((market, 3))), (market, 2))
+
+    def test_shrinks_best_odds_guaranteed_bet(self):
+        case = (Decimal(1), Odds(2), True, None, 0, True)
+        self.assertEqual(list(_shrink_bet(case)), [(*case[:5], False)])
+
+    def test_main_reports_counterexamples(self):
+        register("kelly", "raising", lambda *args: 1 / 0)
+        self.addCleanup(unregister, "kelly", "raising")
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            status = main(["5", "1"])
+        self.assertEqual(status, 1)
+        self.assertIn("counterexample:", stdout.getvalue())
+
+    def test_main_reports_slower_variants_as_slower(self):
+        reports = [
+            VariantReport("kelly", "fast", 5, 0, 0.0, 4.0, None),
+            VariantReport("kelly", "slow", 5, 0, 0.0, 0.5, None),
+        ]
+        stdout = io.StringIO()
+        with (
+            patch("pybet.differential.check", return_value=reports),
+            redirect_stdout(stdout),
+        ):
+            main(["5", "1"])
+        fast, slow = stdout.getvalue().splitlines()
+        self.assertTrue(fast.endswith("4.00x faster"))
+        self.assertTrue(slow.endswith("2.00x slower"))
+
+    def test_reference_and_variant_get_their_own_copy_of_each_input(self):
+        define("list.pop", list.pop, lambda rng: ([1, 2, 3],), lambda case: iter(()))
+        self.addCleanup(_operations.pop, "list.pop")
+        register("list.pop", "pop", list.pop)
+        [report] = check(["list.pop"], cases=5, seed=1)
+        self.assertEqual(report.failures, 0)
+
+    def test_runs_as_module(self):
+        stdout = io.StringIO()
+        with (
+            patch.object(sys, "argv", ["differential", "20", "1"]),
+            redirect_stdout(stdout),
+            warnings.catch_warnings(),
+            self.assertRaises(SystemExit) as exit,
+        ):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            runpy.run_module("pybet.differential", run_name="__main__")
+        self.assertEqual(exit.exception.code, 0)
+        self.assertIn("kelly_array", stdout.getvalue())
+
+    def test_difference(self):
+        self.assertEqual(_difference(Decimal("2.50"), Decimal("2.50")), 0)
+        self.assertAlmostEqual(_difference(Decimal(100), 101.0), 0.01)
+        self.assertEqual(_difference("5/2", "9/4"), float("inf"))
+        self.assertEqual(_difference(ValueError(), ValueError("open")), 0)
+        self.assertEqual(
+            _difference(Market({"Frankel": Odds(2)}), Market({"Shergar": Odds(2)})),
+            float("inf"),
+        )
@@ -0,0 +1,142 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from pybet import Market, Odds
+from pybet.exchange.ladder import TICKS
+from pybet.staking import dutch, dutch_batch, dutch_opportunities, dutch_to_profit
+
+
+class TestDutch(TestCase):
+    def setUp(self):
+        self.market = Market(
+            {
+                "Frankel": Odds(3),
+                "Nijinsky": Odds(3),
+                "Shergar": Odds(3),
+            }
+        )
+
+    def test_dutch_splits_stake_for_equal_returns(self):
+        market = Market({"Frankel": Odds(2), "Nijinsky": Odds(4), "Shergar": Odds(4)})
+        self.assertEqual(
+            dutch(market, 100),
+            {"Frankel": Decimal("50.00"), "Nijinsky": 25, "Shergar": 25},
+        )
+
+    def test_dutch_corrects_rounding_to_total(self):
+        stakes = dutch(self.market, 100)
+        self.assertEqual(sum(stakes.values()), 100)
+        self.assertEqual(stakes["Frankel"], Decimal("33.34"))
+
+    def test_dutch_rounds_to_increment(self):
+        stakes = dutch(self.market, 100, increment=1)
+        self.assertEqual(list(stakes.values()), [34, 33, 33])
+
+    def test_dutch_backs_selected_runners(self):
+        stakes = dutch(self.market, 100, ["Frankel", "Shergar"])
+        self.assertEqual(stakes, {"Frankel": 50, "Shergar": 50})
+
+    def test_dutch_applies_commission(self):
+        market = Market({"Frankel": Odds(2), "Shergar": Odds(3)})
+        stakes = dutch(market, 100, percentage_commission=50)
+        self.assertEqual(
+            stakes, {"Frankel": Decimal("57.14"), "Shergar": Decimal("42.86")}
+        )
+
+    def test_dutch_rounds_odds_down_to_ladder(self):
+        market = Market({"Frankel": Odds("3.33"), "Shergar": Odds("3.33")})
+        on_ladder = Market({"Frankel": Odds("3.3"), "Shergar": Odds("3.3")})
+        self.assertEqual(
+            dutch_to_profit(market, 10, ladder=TICKS),
+            dutch_to_profit(on_ladder, 10),
+        )
+        self.assertEqual(
+            dutch_batch([market], 10, ladder=TICKS), [{"Frankel": 5, "Shergar": 5}]
+        )
+
+    def test_dutch_raises_value_error_if_shorter_than_ladder(self):
+        market = Market({"Frankel": Odds("1.005"), "Shergar": Odds(100)})
+        with self.assertRaises(ValueError):
+            dutch(market, 10, ladder=TICKS)
+
+    def test_dutch_raises_value_error_if_stake_not_multiple_of_increment(self):
+        with self.assertRaises(ValueError):
+            dutch(self.market, Decimal("100.5"), increment=1)
+
+    def test_dutch_raises_value_error_if_runner_not_priced(self):
+        with self.assertRaises(ValueError):
+            dutch(self.market, 100, ["Frankel", "Mill Reef"])
+
+    def test_dutch_raises_value_error_if_no_runners(self):
+        with self.assertRaises(ValueError):
+            dutch(self.market, 100, [])
+
+    def test_dutch_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            dutch(self.market, 100, percentage_commission=101)
+
+    def test_dutch_batch(self):
+        stakes = dutch_batch([self.market] * 2, 10, lambda m: ["Frankel", "Shergar"])
+        self.assertEqual(stakes, [{"Frankel": 5, "Shergar": 5}] * 2)
+
+
+class TestDutchToProfit(TestCase):
+    def test_dutch_to_profit(self):
+        market = Market({"Frankel": Odds(2), "Nijinsky": Odds(5), "Shergar": Odds(5)})
+        self.assertEqual(
+            dutch_to_profit(market, 10),
+            {"Frankel": 50, "Nijinsky": 20, "Shergar": 20},
+        )
+
+    def test_dutch_to_profit_makes_at_least_target_after_rounding(self):
+        market = Market(
+            {"Frankel": Odds(3.1), "Nijinsky": Odds(3.3), "Shergar": Odds(3.7)}
+        )
+        stakes = dutch_to_profit(market, 7, increment=Decimal("0.5"))
+        total = sum(stakes.values())
+        for runner, odds in market.items():
+            self.assertGreaterEqual(stakes[runner] * Decimal(odds) - total, 7)
+            self.assertEqual(stakes[runner] % Decimal("0.5"), 0)
+
+    def test_dutch_to_profit_raises_value_error_if_book_too_high(self):
+        market = Market({"Frankel": Odds(2), "Shergar": Odds(2)})
+        with self.assertRaises(ValueError):
+            dutch_to_profit(market, 10)
+
+    def test_dutch_to_profit_raises_value_error_if_profit_invalid(self):
+        market = Market({"Frankel": Odds(3), "Shergar": Odds(3)})
+        with self.assertRaises(ValueError):
+            dutch_to_profit(market, 0)
+
+
+class TestDutchOpportunities(TestCase):
+    def test_dutch_opportunities_finds_profitable_markets(self):
+        markets = [
+            Market({"Frankel": Odds(2), "Shergar": Odds(2)}),
+            Market({"Frankel": Odds(2.5), "Shergar": Odds(2.5)}),
+            Market({"Frankel": Odds(2.2), "Shergar": Odds(2.2)}),
+        ]
+        found = dutch_opportunities(markets)
+        self.assertEqual([index for index, _ in found], [1, 2])
+        self.assertAlmostEqual(found[0][1], 0.25)
+
+    def test_dutch_opportunities_applies_min_return_and_selector(self):
+        markets = [
+            Market({"Frankel": Odds(3), "Shergar": Odds(3), "Nijinsky": Odds(3)})
+        ]
+        selector = lambda market: ["Frankel", "Shergar"]
+        self.assertEqual(dutch_opportunities(markets, selector), [(0, 0.5)])
+        self.assertEqual(dutch_opportunities(markets, selector, min_return=0.5), [])
+
+    def test_dutch_opportunities_rounds_odds_down_to_ladder(self):
+        markets = [Market({"Frankel": Odds("2.039"), "Shergar": Odds("1.965")})]
+        self.assertEqual(len(dutch_opportunities(markets)), 1)
+        self.assertEqual(dutch_opportunities(markets, ladder=TICKS), [])
+
+    def test_dutch_opportunities_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            dutch_opportunities([], percentage_commission=101)
+
+    def test_dutch_opportunities_skips_unpriced_runners(self):
+        markets = [Market({"Frankel": Odds(3), "Shergar": None})]
+        self.assertEqual(dutch_opportunities(markets), [])
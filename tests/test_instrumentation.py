@@ -0,0 +1,141 @@
+import importlib
+import logging
+import os
+import random
+import sys
+from unittest import TestCase
+from unittest.mock import patch
+
+import pybet
+import pybet.staking
+from pybet import Market, Odds, instrumentation
+from pybet.instrumentation import (
+    CallbackExporter,
+    LoggingExporter,
+    MemoryExporter,
+    instrument,
+    snapshot,
+)
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        self.market = Market(
+            {"Frankel": Odds(2), "Shergar": Odds(4), "Nijinsky": Odds(4)}
+        )
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_instrumentation_is_disabled_by_default(self):
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertNotIn("__new__", Odds.__dict__)
+        self.market.apply_margin(0)
+        self.assertEqual(snapshot(), {})
+
+    def test_instrumentation_records_calls(self):
+        with instrument():
+            self.market.apply_margin(0)
+            self.market.apply_margin(10)
+            Odds.fractional("9/4")
+            pybet.staking.kelly(Odds(4), Odds(5), 100)
+
+        stats = snapshot()
+        self.assertEqual(stats["Market.apply_margin"].calls, 2)
+        self.assertEqual(stats["Odds.fractional"].calls, 1)
+        self.assertEqual(stats["kelly"].calls, 1)
+        self.assertGreater(stats["Odds"].calls, 0)
+        self.assertGreater(stats["Market.apply_margin"].total_seconds, 0)
+
+    def test_instrumentation_restores_operations_when_disabled(self):
+        derive = Market.derive
+        fractional = Odds.__dict__["fractional"]
+        with instrument():
+            self.assertIsNot(Market.derive, derive)
+        self.assertIs(Market.derive, derive)
+        self.assertIs(Odds.__dict__["fractional"], fractional)
+        self.assertNotIn("__new__", Odds.__dict__)
+
+    def test_instrumentation_keeps_results_and_behaviour(self):
+        with instrument():
+            self.assertEqual(Odds.fractional("9/4"), Odds("3.25"))
+            self.assertIsInstance(Odds(3), Odds)
+            self.assertAlmostEqual(self.market.derive(2)["Frankel"], Odds(1.2))
+
+    def test_instrumentation_records_exceptions(self):
+        with instrument(), self.assertRaises(ValueError):
+            self.market.derive(5)
+        self.assertEqual(snapshot()["Market.derive"].calls, 1)
+
+    def test_instrumentation_records_percentiles(self):
+        with instrument():
+            for _ in range(10):
+                self.market.apply_margin(0)
+        stats = snapshot()["Market.apply_margin"]
+        self.assertLessEqual(stats.p50_seconds, stats.p95_seconds)
+        self.assertLessEqual(stats.p95_seconds, stats.p99_seconds)
+
+    def test_instrumentation_stays_enabled_after_block_if_already_enabled(self):
+        instrumentation.enable()
+        with instrument():
+            pass
+        self.assertTrue(instrumentation.is_enabled())
+
+    def test_instrumentation_exports_on_leaving_block(self):
+        memory = MemoryExporter()
+        received = []
+        with instrument(memory, CallbackExporter(received.append)):
+            self.market.apply_margin(0)
+        self.assertEqual(memory.snapshots[0]["Market.apply_margin"].calls, 1)
+        self.assertEqual(received, memory.snapshots)
+
+    def test_logging_exporter(self):
+        with (
+            self.assertLogs("pybet.instrumentation", logging.INFO) as logs,
+            instrument(LoggingExporter()),
+        ):
+            self.market.apply_margin(0)
+        self.assertTrue(
+            any("Market.apply_margin calls=1" in line for line in logs.output)
+        )
+
+    def test_instrumentation_records_net_blocks(self):
+        with instrument():
+            self.market.derive(2)
+        self.assertIsInstance(snapshot()["Market.derive"].net_blocks, int)
+
+    def test_instrumentation_samples_latencies_once_full(self):
+        with (
+            patch.object(instrumentation, "_SAMPLES", 2),
+            patch.object(instrumentation._random, "randrange", return_value=0),
+            instrument(),
+        ):
+            for _ in range(5):
+                self.market.apply_margin(0)
+        operation = instrumentation._operations["Market.apply_margin"]
+        self.assertEqual(operation.calls, 5)
+        self.assertEqual(len(operation.samples), 2)
+
+    def test_instrumentation_sampling_leaves_global_random_state_alone(self):
+        state = random.getstate()
+        with patch.object(instrumentation, "_SAMPLES", 1), instrument():
+            for _ in range(5):
+                self.market.apply_margin(0)
+        self.assertEqual(random.getstate(), state)
+
+    def test_instrumentation_records_calls_through_defining_module(self):
+        module = sys.modules["pybet.staking.kelly"]
+        kelly = module.kelly
+        with instrument():
+            self.assertIsNot(module.kelly, kelly)
+            module.kelly(Odds(4), Odds(5), 100)
+            pybet.staking.kelly(Odds(4), Odds(5), 100)
+        self.assertIs(module.kelly, kelly)
+        self.assertEqual(snapshot()["kelly"].calls, 2)
+
+    def test_instrumentation_enabled_by_environment_variable(self):
+        with patch.dict(os.environ, {"PYBET_INSTRUMENT": "1"}):
+            importlib.reload(pybet)
+        self.assertTrue(instrumentation.is_enabled())
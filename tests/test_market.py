@@ -1,3 +1,5 @@
+import copy
+import pickle
 from decimal import Decimal
 from unittest import TestCase
 
@@ -274,3 +276,20 @@ class MarketTestCase(TestCase):
         new_market = self.market.without(["beta_boy", "gamma_gal"])
         self.assertEqual(len(new_market), 4)
         self.assertEqual(new_market.percentage, 67)
+
+    def test_market_without_keeps_places(self):
+        self.market.places = 2
+        self.assertEqual(self.market.without(["beta_boy"]).places, 2)
+
+    def test_market_pickle_keeps_runners_odds_and_places(self):
+        self.market["alpha_ace"] = None
+        self.market.places = 3
+        restored = pickle.loads(pickle.dumps(self.market))
+        self.assertIsInstance(restored, Market)
+        self.assertEqual(restored, self.market)
+        self.assertEqual(restored.places, 3)
+        self.assertIsInstance(restored["beta_boy"], Odds)
+
+    def test_market_copy_keeps_places(self):
+        self.market.places = 2
+        self.assertEqual(copy.copy(self.market).places, 2)
@@ -0,0 +1,205 @@
+from decimal import Decimal
+from math import log
+from unittest import TestCase
+from unittest.mock import patch
+
+from pybet import Market, Odds
+from pybet.models import FinishingModel, Henery, Stern, _invert, _update
+
+
+class FinishingModelTestCase(TestCase):
+    def setUp(self):
+        self.runners = [
+            "alpha_ace",
+            "beta_boy",
+            "gamma_gal",
+            "delta_dame",
+            "epsilon_elf",
+            "zeta_zombie",
+        ]
+        self.market = Market(
+            zip(self.runners, [Odds(x) for x in [2, 3, 5, 10, 20, 50]])
+        )
+
+    def assert_markets_almost_equal(self, first, second, places=6):
+        self.assertEqual(list(first), list(second))
+        for runner in first:
+            self.assertAlmostEqual(
+                float(first[runner].to_probability()),
+                float(second[runner].to_probability()),
+                places=places,
+            )
+
+    def test_stern_with_shape_of_one_matches_harville(self):
+        self.assert_markets_almost_equal(
+            self.market.derive(3, model=Stern(1)), self.market.derive(3), places=4
+        )
+
+    def test_models_return_fair_place_markets(self):
+        for model in (Henery(), Stern()):
+            for places in (2, 3, 4):
+                derived = self.market.derive(places, model=model)
+                self.assertAlmostEqual(derived.percentage, 100 * places, places=6)
+                self.assertEqual(derived.places, places)
+
+    def test_models_rate_favourite_lower_for_places_than_harville(self):
+        harville = self.market.derive(3)
+        for model in (Henery(), Stern()):
+            derived = self.market.derive(3, model=model)
+            self.assertGreater(derived["alpha_ace"], harville["alpha_ace"])
+            self.assertLess(derived["zeta_zombie"], harville["zeta_zombie"])
+
+    def test_models_keep_order_of_runners(self):
+        derived = self.market.derive(2, model=Henery())
+
+        self.assertEqual(list(derived), self.runners)
+        self.assertEqual(sorted(derived.values()), list(derived.values()))
+
+    def test_fitted_strengths_reproduce_win_chances(self):
+        model = Henery()
+        probabilities = [0.5, 0.3, 0.15, 0.05]
+
+        chances = model.chances(model.fit(["a", "b", "c", "d"], probabilities), 1)
+
+        for chance, probability in zip(chances, probabilities):
+            self.assertAlmostEqual(chance, probability, places=7)
+
+    def test_fit_is_cached_for_same_prices(self):
+        model = Stern()
+        self.market.derive(2, model=model)
+
+        self.market.derive(2, model=model)
+
+        self.assertEqual(model.iterations, 0)
+
+    def test_fit_starts_from_previous_fit_after_small_price_move(self):
+        model = Henery()
+        self.market.derive(2, model=model)
+        cold = model.iterations
+        moved = Market(self.market)
+        moved["beta_boy"] = Odds("3.1")
+
+        derived = moved.derive(2, model=model)
+
+        self.assertLess(model.iterations, cold)
+        self.assert_markets_almost_equal(derived, moved.derive(2, model=Henery()))
+
+    def test_fit_converges_after_small_price_move_in_large_field(self):
+        market = Market({i: Odds(2 + i) for i in range(20)})
+        moved = Market(market)
+        moved[3] = Odds("5.05")
+        for model in (Henery(), Stern(4)):
+            market.derive(3, model=model)
+            cold = model.iterations
+
+            derived = moved.derive(3, model=model)
+
+            self.assertLess(model.iterations, cold)
+            self.assertAlmostEqual(derived.percentage, 300, places=6)
+            self.assertTrue(all(odds > 1 for odds in derived.values()))
+            fair = Market(moved).apply_margin(Decimal(0))
+            probabilities = [float(fair[r].to_probability()) for r in moved]
+            chances = model.chances(model.fit(list(moved), probabilities), 1)
+            for chance, probability in zip(chances, probabilities):
+                self.assertAlmostEqual(chance / probability, 1, places=5)
+
+    def test_fit_raises_value_error_if_strengths_do_not_converge(self):
+        model = Henery()
+        model.max_iterations = 1
+
+        with self.assertRaises(ValueError):
+            self.market.derive(2, model=model)
+
+    def test_fit_recomputes_response_if_refined_step_fails(self):
+        model = Henery()
+        self.market.derive(2, model=model)
+        moved = Market(self.market)
+        moved["beta_boy"] = Odds("3.1")
+        search = model._search
+        calls = []
+
+        def fail_first(*args):
+            calls.append(args)
+            return None if len(calls) == 1 else search(*args)
+
+        with patch.object(model, "_search", side_effect=fail_first):
+            derived = moved.derive(2, model=model)
+
+        self.assertGreater(len(calls), 1)
+        self.assert_markets_almost_equal(derived, moved.derive(2, model=Henery()))
+
+    def test_fit_raises_value_error_if_step_from_fresh_response_fails(self):
+        model = Henery()
+
+        with (
+            patch.object(model, "_search", return_value=None),
+            self.assertRaises(ValueError),
+        ):
+            self.market.derive(2, model=model)
+
+    def test_fit_caches_response_if_start_already_fits(self):
+        model = Henery()
+
+        self.assertEqual(model.fit(["alpha_ace"], [1.0]), [0.0])
+        self.assertEqual(model.fit(["alpha_ace"], [1.0]), [0.0])
+        self.assertEqual(model.iterations, 0)
+
+    def test_search_gives_up_if_no_step_reduces_errors(self):
+        model = Henery()
+        targets = [log(0.5), log(0.5)]
+        strengths = [0.0, 0.0]
+
+        errors = model._errors(strengths, targets)
+
+        self.assertIsNone(model._search(strengths, [1.0, -1.0], targets, errors))
+
+    def test_invert_raises_value_error_if_singular(self):
+        with self.assertRaises(ValueError):
+            _invert([[1.0, 1.0], [1.0, 1.0]])
+
+    def test_update_skips_step_without_change(self):
+        inverse = [[1.0, 0.0], [0.0, 1.0]]
+
+        _update(inverse, [1.0, 0.0], [0.0, 0.0])
+
+        self.assertEqual(inverse, [[1.0, 0.0], [0.0, 1.0]])
+
+    def test_fit_cache_drops_oldest_fit_when_full(self):
+        model = Stern()
+        model.cache_size = 1
+        self.market.derive(2, model=model)
+        Market(self.market).without(["zeta_zombie"]).derive(2, model=model)
+
+        self.market.derive(2, model=model)
+
+        self.assertGreater(model.iterations, 0)
+
+    def test_finishing_model_must_tabulate_distribution(self):
+        with self.assertRaises(TypeError):
+            FinishingModel()  # type: ignore[abstract]
+
+    def test_derive_with_model_raises_value_error_with_discounts(self):
+        with self.assertRaises(ValueError):
+            self.market.derive(2, discounts=[1, 0.8], model=Henery())
+
+    def test_derive_with_model_raises_value_error_for_invalid_places(self):
+        with self.assertRaises(ValueError):
+            self.market.derive(6, model=Henery())
+
+    def test_derive_with_model_raises_value_error_for_place_market(self):
+        place_market = self.market.derive(2)
+
+        with self.assertRaises(ValueError):
+            place_market.derive(3, model=Stern())
+
+    def test_stern_raises_value_error_for_invalid_shape(self):
+        for shape in (0, 2.5):
+            with self.assertRaises(ValueError):
+                Stern(shape)  # type: ignore[arg-type]
+
+    def test_models_accept_decimal_odds_with_margin(self):
+        market = Market(self.market).apply_margin(Decimal(20))
+
+        self.assert_markets_almost_equal(
+            market.derive(2, model=Stern()), self.market.derive(2, model=Stern())
+        )
@@ -1,10 +1,11 @@
+import pickle
 from decimal import Decimal
 from fractions import Fraction
 from math import inf
 from unittest import TestCase
 
 from pybet import Odds
-from pybet.odds import FractionalOddsSets
+from pybet.odds import FractionalOddsSets, FractionalSet
 
 
 class TestOdds(TestCase):
@@ -266,3 +267,26 @@ class TestOdds(TestCase):
         self.assertAlmostEqual(
             Decimal("3.3333"), Odds.percentage(40).lengthen(10), places=4
         )
+
+    def test_odds_pickle_keeps_full_precision(self):
+        odds = Odds(1 / 3 + 1)
+        restored = pickle.loads(pickle.dumps(odds))
+        self.assertIsInstance(restored, Odds)
+        self.assertEqual(Decimal(restored), Decimal(odds))
+
+
+class TestFractionalSet(TestCase):
+    def test_nearest_matches_to_fractional(self):
+        fractional_set = FractionalSet(FractionalOddsSets.STANDARD)
+        for value in ["1.01", "1.45", "2", "3.3", "4.27", "9.99", "47", "1500"]:
+            odds = Odds(value)
+            self.assertEqual(fractional_set.nearest(odds), odds.to_fractional())
+
+    def test_nearest_prefers_first_of_equally_near_fractions(self):
+        fractional_set = FractionalSet(["7/2", "3/1"])
+        self.assertEqual(fractional_set.nearest(Odds("4.25")), "7/2")
+        self.assertEqual(Odds("4.25").to_fractional(["7/2", "3/1"]), "7/2")
+
+    def test_fractional_set_raises_value_error_if_empty(self):
+        with self.assertRaises(ValueError):
+            FractionalSet([])
@@ -1,7 +1,16 @@
+from decimal import Decimal
 from unittest import TestCase
 
-from pybet import Odds
-from pybet.staking import kelly
+from pybet import Market, Odds
+from pybet.staking import (
+    PortfolioKelly,
+    kelly,
+    kelly_array,
+    portfolio_kelly,
+    simultaneous_kelly,
+    simultaneous_kelly_batch,
+)
+from pybet.staking.portfolio import _linear_solve
 
 
 class TestStaking(TestCase):
@@ -21,3 +30,213 @@ class TestStaking(TestCase):
     def test_kelly_stake_raises_value_error_if_commission_is_greater_than_100(self):
         with self.assertRaises(ValueError):
             kelly(Odds(4), Odds(5), 100, 101)
+
+
+class TestSimultaneousKelly(TestCase):
+    def setUp(self):
+        self.true_market = Market(
+            {"Frankel": Odds(2), "Nijinsky": Odds(4), "Shergar": Odds(4)}
+        )
+        self.market = Market(
+            {"Frankel": Odds(2.2), "Nijinsky": Odds(5), "Shergar": Odds(2.5)}
+        )
+
+    def test_simultaneous_kelly_stakes_runners_above_reserve_rate(self):
+        self.assertEqual(
+            simultaneous_kelly(self.true_market, self.market, 100),
+            {
+                "Frankel": Decimal("17.11"),
+                "Nijinsky": Decimal("10.53"),
+                "Shergar": Decimal("0.00"),
+            },
+        )
+
+    def test_simultaneous_kelly_matches_kelly_for_single_value_runner(self):
+        true_market = Market({"alpha": Odds(4), "beta": Odds(4 / 3)})
+        market = Market({"alpha": Odds(6), "beta": Odds(1.2)})
+        stakes = simultaneous_kelly(true_market, market, 100, 20)
+        self.assertEqual(stakes["alpha"], kelly(Odds(4), Odds(6), 100, 20))
+
+    def test_simultaneous_kelly_stakes_true_probabilities_if_market_overbroke(self):
+        market = Market({"Frankel": Odds(2.2), "Nijinsky": Odds(5), "Shergar": Odds(3)})
+        self.assertEqual(
+            list(simultaneous_kelly(self.true_market, market, 100).values()),
+            [50, 25, 25],
+        )
+
+    def test_simultaneous_kelly_applies_fraction(self):
+        stakes = simultaneous_kelly(
+            self.true_market, self.market, 100, fraction=Decimal("0.5")
+        )
+        self.assertEqual(stakes["Nijinsky"], Decimal("5.26"))
+
+    def test_simultaneous_kelly_stakes_nothing_without_edge(self):
+        stakes = simultaneous_kelly(self.market, self.market, 100)
+        self.assertEqual(sum(stakes.values()), 0)
+
+    def test_simultaneous_kelly_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            simultaneous_kelly(self.true_market, self.market, 100, 101)
+
+    def test_simultaneous_kelly_raises_value_error_if_fraction_invalid(self):
+        with self.assertRaises(ValueError):
+            simultaneous_kelly(self.true_market, self.market, 100, fraction=0)
+
+    def test_simultaneous_kelly_raises_value_error_if_runners_differ(self):
+        with self.assertRaises(ValueError):
+            simultaneous_kelly(self.true_market.without(["Shergar"]), self.market, 100)
+
+    def test_simultaneous_kelly_batch(self):
+        self.assertEqual(
+            simultaneous_kelly_batch([(self.true_market, self.market)] * 2, 100),
+            [simultaneous_kelly(self.true_market, self.market, 100)] * 2,
+        )
+
+
+class TestKellyArray(TestCase):
+    def test_kelly_array_matches_kelly(self):
+        true_odds = [Odds(4), Odds(5), Odds(4), Odds(2.5), Odds(3.1)]
+        market_odds = [Odds(5), Odds(4), Odds(6), Odds(2.9), Odds(3.3)]
+        banks = [100, 100, 100, Decimal("1234.56"), Decimal("77.7")]
+        commissions = [0, 0, 20, 5, 2]
+        self.assertEqual(
+            kelly_array(true_odds, market_odds, banks, commissions),
+            [kelly(*args) for args in zip(true_odds, market_odds, banks, commissions)],
+        )
+
+    def test_kelly_array_matches_kelly_at_half_penny(self):
+        # Full Kelly stake is exactly 0.125, so rounding must match Decimal
+        self.assertEqual(
+            kelly_array([Odds(4)], [Odds(5)], [2]), [kelly(Odds(4), Odds(5), 2)]
+        )
+
+    def test_kelly_array_accepts_floats(self):
+        self.assertEqual(kelly_array([4.0], [5.0], 100.0), [Decimal("6.25")])
+
+    def test_kelly_array_applies_fraction(self):
+        self.assertEqual(
+            kelly_array([Odds(4)], [Odds(5)], 100, fraction=0.5), [Decimal("3.12")]
+        )
+
+    def test_kelly_array_applies_max_stake(self):
+        self.assertEqual(kelly_array([Odds(4)], [Odds(5)], 100, max_stake=5), [5])
+
+    def test_kelly_array_applies_min_stake(self):
+        self.assertEqual(kelly_array([Odds(4)], [Odds(5)], 100, min_stake=10), [0])
+
+    def test_kelly_array_raises_value_error_if_lengths_differ(self):
+        with self.assertRaises(ValueError):
+            kelly_array([Odds(4)], [Odds(5), Odds(5)], 100)
+
+    def test_kelly_array_raises_value_error_if_per_selection_lengths_differ(self):
+        with self.assertRaises(ValueError):
+            kelly_array([Odds(4)], [Odds(5)], [100, 100])
+
+    def test_kelly_array_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            kelly_array([Odds(4)], [Odds(5)], 100, 101)
+
+    def test_kelly_array_raises_value_error_if_fraction_invalid(self):
+        with self.assertRaises(ValueError):
+            kelly_array([Odds(4)], [Odds(5)], 100, fraction=2)
+
+
+class TestPortfolioKelly(TestCase):
+    def setUp(self):
+        self.selections = {
+            "Frankel": (Odds(4), Odds(5)),
+            "Shergar": (Odds(3), Odds(3.5)),
+        }
+
+    def test_portfolio_kelly_matches_kelly_for_single_selection(self):
+        stakes = portfolio_kelly({"Frankel": (Odds(4), Odds(5))}, 100)
+        self.assertEqual({"Frankel": kelly(Odds(4), Odds(5), 100)}, stakes)
+
+    def test_portfolio_kelly_stakes_independent_selections(self):
+        stakes = portfolio_kelly(self.selections, 100)
+        self.assertEqual(
+            {"Frankel": Decimal("6.19"), "Shergar": Decimal("6.58")}, stakes
+        )
+
+    def test_portfolio_kelly_stakes_nothing_without_edge(self):
+        stakes = portfolio_kelly({"Frankel": (Odds(5), Odds(4))}, 100)
+        self.assertEqual({"Frankel": 0}, stakes)
+
+    def test_portfolio_kelly_applies_fraction(self):
+        stakes = portfolio_kelly({"Frankel": (Odds(4), Odds(5))}, 100, fraction=0.4)
+        self.assertEqual({"Frankel": Decimal("2.50")}, stakes)
+
+    def test_portfolio_kelly_never_stakes_more_than_bank(self):
+        selections = {i: (Odds(5), Odds(6)) for i in range(30)}
+        for fraction in (1, 0.5):
+            stakes = portfolio_kelly(selections, 1000, fraction=fraction)
+            self.assertLessEqual(sum(stakes.values()), 1000 * Decimal(fraction))
+
+    def test_portfolio_kelly_stakes_accumulators(self):
+        stakes = portfolio_kelly(
+            self.selections, 100, accumulators=[("Frankel", "Shergar")]
+        )
+        self.assertGreater(stakes["Frankel", "Shergar"], 0)
+        self.assertLess(stakes["Frankel"], Decimal("6.19"))
+
+    def test_portfolio_kelly_samples_many_selections(self):
+        selections = {i: (Odds(4), Odds(5)) for i in range(20)}
+        stakes = portfolio_kelly(selections, 100, seed=1)
+        self.assertEqual(20, len(stakes))
+        self.assertLess(sum(stakes.values()), 100)
+        self.assertTrue(all(0 < stake < Decimal("6.25") for stake in stakes.values()))
+
+    def test_portfolio_kelly_warm_starts_from_last_solution(self):
+        optimiser = PortfolioKelly()
+        optimiser.stakes(self.selections, 100)
+        cold = optimiser.iterations
+        optimiser.stakes(self.selections, 100)
+        self.assertLess(optimiser.iterations, cold)
+
+    def test_portfolio_kelly_warm_starts_after_price_move(self):
+        accumulators = [("Frankel", "Shergar")]
+        optimiser = PortfolioKelly()
+        optimiser.stakes(self.selections, 100, accumulators=accumulators)
+        self.selections["Frankel"] = (Odds(4), Odds("5.1"))
+        optimiser.stakes(self.selections, 100, accumulators=accumulators)
+        cold = PortfolioKelly()
+        cold.stakes(self.selections, 100, accumulators=accumulators)
+        self.assertLess(optimiser.iterations, cold.iterations)
+
+    def test_portfolio_kelly_reuses_samples_for_same_selections(self):
+        selections = {i: (Odds(4), Odds(5)) for i in range(20)}
+        optimiser = PortfolioKelly(samples=2000)
+        first = optimiser.stakes(selections, 100)
+        self.assertEqual(first, optimiser.stakes(selections, 100))
+        selections[0] = (Odds(4), Odds("5.05"))
+        moved = optimiser.stakes(selections, 100)
+        self.assertLessEqual(max(abs(moved[i] - first[i]) for i in range(1, 20)), 0.05)
+
+    def test_portfolio_kelly_stops_when_no_step_improves(self):
+        optimiser = PortfolioKelly(tolerance=0, max_iterations=100)
+        stakes = optimiser.stakes(self.selections, 100)
+        self.assertEqual(
+            {"Frankel": Decimal("6.19"), "Shergar": Decimal("6.58")}, stakes
+        )
+        self.assertLess(optimiser.iterations, 100)
+
+    def test_linear_solve_returns_none_if_singular(self):
+        self.assertIsNone(_linear_solve([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0]))
+
+    def test_portfolio_kelly_raises_value_error_if_commission_invalid(self):
+        with self.assertRaises(ValueError):
+            portfolio_kelly(self.selections, 100, 101)
+
+    def test_portfolio_kelly_raises_value_error_if_fraction_invalid(self):
+        with self.assertRaises(ValueError):
+            portfolio_kelly(self.selections, 100, fraction=0)
+
+    def test_portfolio_kelly_raises_value_error_if_no_selections(self):
+        with self.assertRaises(ValueError):
+            portfolio_kelly({}, 100)
+
+    def test_portfolio_kelly_raises_value_error_if_accumulator_invalid(self):
+        with self.assertRaises(ValueError):
+            portfolio_kelly(
+                self.selections, 100, accumulators=[("Frankel", "Nijinsky")]
+            )